@@ -0,0 +1,71 @@
+# bench_async.py
+"""Event-loop latency while large canvases load, blocking versus aload.
+
+Run with ``python -m benchmarks.bench_async``. A ticker task asks to wake up
+every millisecond and records how late it is; with ``aload`` the lag stays
+around the interpreter's thread switch interval instead of growing with the
+size of the file.
+"""
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from pyjsoncanvas import Canvas
+
+from .common import make_canvas
+
+TICK = 0.001
+
+
+async def ticker(lags, stop) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def measure(load, paths):
+    lags, stop = [], asyncio.Event()
+    task = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    # Hold on to the canvases until the ticker has stopped; freeing them is
+    # not part of loading.
+    canvases = await load(paths)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await task
+    del canvases
+    return elapsed, lags
+
+
+async def blocking(paths):
+    return [Canvas.load(path) for path in paths]
+
+
+async def concurrent(paths):
+    return await asyncio.gather(*(Canvas.aload(path) for path in paths))
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for count in (20_000, 100_000):
+            paths = []
+            for i in range(4):
+                path = os.path.join(directory, f"{count}-{i}.canvas")
+                make_canvas(count, seed=i).export(path)
+                paths.append(path)
+            for name, load in (("Canvas.load", blocking), ("Canvas.aload", concurrent)):
+                elapsed, lags = asyncio.run(measure(load, paths))
+                p99 = statistics.quantiles(lags, n=100, method="inclusive")[-1]
+                print(
+                    f"{count:>7} nodes x4 {name:>13}: {elapsed:.2f}s,"
+                    f" loop lag median {statistics.median(lags) * 1e3:.1f}ms"
+                    f" p99 {p99 * 1e3:.1f}ms max {max(lags) * 1e3:.1f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
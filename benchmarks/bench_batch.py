@@ -0,0 +1,76 @@
+# bench_batch.py
+"""Bulk mutation: one call per object versus add_*/remove_* batches and
+``canvas.batch()``, on a canvas with spatial and group indexes built, and
+removals interleaved with additions inside ``canvas.batch()``.
+
+Run with ``python -m benchmarks.bench_batch``.
+"""
+from pyjsoncanvas import Canvas
+
+from .common import best_of, make_edges, make_nodes
+
+
+def fresh(nodes) -> Canvas:
+    canvas = Canvas(nodes=list(nodes), edges=[])
+    canvas.group_hierarchy
+    return canvas
+
+
+def one_by_one(base, nodes, edges) -> None:
+    canvas = fresh(base)
+    for node in nodes:
+        canvas.add_node(node)
+    for edge in edges:
+        canvas.add_edge(edge)
+    for node in nodes:
+        canvas.remove_node(node.id)
+    canvas.nodes_in_rect(0, 0, 100, 100)
+
+
+def bulk(base, nodes, edges) -> None:
+    canvas = fresh(base)
+    canvas.add_nodes(nodes)
+    canvas.add_edges(edges)
+    canvas.remove_nodes([node.id for node in nodes])
+    canvas.nodes_in_rect(0, 0, 100, 100)
+
+
+def batched(base, nodes, edges) -> None:
+    canvas = fresh(base)
+    with canvas.batch():
+        for node in nodes:
+            canvas.add_node(node)
+        for edge in edges:
+            canvas.add_edge(edge)
+        for node in nodes:
+            canvas.remove_node(node.id)
+    canvas.nodes_in_rect(0, 0, 100, 100)
+
+
+def interleaved(base, nodes, edges) -> None:
+    # Replace nodes one at a time, as an import pipeline would.
+    canvas = fresh(base)
+    with canvas.batch():
+        for old, new in zip(base, nodes):
+            canvas.remove_node(old.id)
+            canvas.add_node(new)
+    canvas.nodes_in_rect(0, 0, 100, 100)
+
+
+def main() -> None:
+    all_nodes = make_nodes(30_000)
+    base, nodes = all_nodes[:20_000], all_nodes[20_000:]
+    edges = make_edges(nodes, len(nodes))
+    setup = best_of(lambda: fresh(base).nodes_in_rect(0, 0, 100, 100))
+    print(f"{'setup':>12}: {setup:.3f}s (included below)")
+    for name, fn in (
+        ("one by one", one_by_one),
+        ("bulk", bulk),
+        ("batch()", batched),
+        ("interleaved", interleaved),
+    ):
+        print(f"{name:>12}: {best_of(lambda: fn(base, nodes, edges)):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
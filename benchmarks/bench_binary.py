@@ -0,0 +1,43 @@
+# bench_binary.py
+"""Size and speed of the binary format against JSON.
+
+Run with ``python -m benchmarks.bench_binary``.
+"""
+import zlib
+
+from pyjsoncanvas import Canvas
+
+from .common import best_of, generate_canvas
+
+
+def main() -> None:
+    canvas = generate_canvas(50_000)
+    json_bytes = canvas.to_json().encode("utf-8")
+    json_str = json_bytes.decode("utf-8")
+    raw = canvas.to_binary()
+    packed = canvas.to_binary(compress=True)
+    print(f"{len(canvas.nodes)} nodes, {len(canvas.edges)} edges")
+    print(f"json            {len(json_bytes) / 2**20:6.2f} MiB")
+    print(f"json + zlib     {len(zlib.compress(json_bytes)) / 2**20:6.2f} MiB")
+    print(f"binary          {len(raw) / 2**20:6.2f} MiB")
+    print(f"binary + zlib   {len(packed) / 2**20:6.2f} MiB")
+    print()
+
+    timings = {
+        "to_json": canvas.to_json,
+        "to_binary": canvas.to_binary,
+        "to_binary(compress)": lambda: canvas.to_binary(compress=True),
+        "from_json": lambda: Canvas.from_json(json_str),
+        "from_binary": lambda: Canvas.from_binary(raw),
+        "from_json, trusted": lambda: Canvas.from_json(json_str, validate=False),
+        "from_binary, trusted": lambda: Canvas.from_binary(raw, validate=False),
+        "from_binary(compressed), trusted": lambda: Canvas.from_binary(
+            packed, validate=False
+        ),
+    }
+    for name, fn in timings.items():
+        print(f"{name:<34} {best_of(fn):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# bench_color.py
+"""Color construction and loading a canvas where every node has a color.
+
+Run with ``python -m benchmarks.bench_color``.
+"""
+import random
+from collections import Counter
+
+from pyjsoncanvas import Canvas, Color
+
+from .common import best_of, make_canvas
+
+
+def main() -> None:
+    rng = random.Random(0)
+    palette = [str(i) for i in range(1, 7)] + [
+        f"#{rng.randrange(1 << 24):06x}" for _ in range(50)
+    ]
+    values = [rng.choice(palette) for _ in range(100_000)]
+    elapsed = best_of(lambda: [Color(value) for value in values])
+    print(f"Color(value): {elapsed / len(values) * 1e9:.0f} ns per call")
+
+    canvas = make_canvas(50_000)
+    for node in canvas.nodes:
+        node.color = Color(rng.choice(palette))
+    json_str = canvas.to_json()
+    elapsed = best_of(lambda: Canvas.from_json(json_str))
+    print(f"from_json, 50k colored nodes: {elapsed:.3f}s")
+
+    elapsed = best_of(lambda: Counter(node.color for node in canvas.nodes))
+    print(f"group 50k nodes by color: {elapsed * 1e3:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# bench_diff.py
+"""Diff and three-way merge of 100k-node canvases with a small edit set.
+
+Run with ``python -m benchmarks.bench_diff``.
+"""
+from pyjsoncanvas import Canvas, diff, merge
+
+from .common import best_of, make_canvas
+
+
+def main() -> None:
+    base = make_canvas(100_000)
+    text = base.to_json()
+    ours = Canvas.from_json(text, validate=False)
+    theirs = Canvas.from_json(text, validate=False)
+    for node in ours.nodes[::100]:
+        node.x += 10
+    for node in theirs.nodes[50::100]:
+        node.text = "edited"
+    for edge in theirs.edges[::1000]:
+        theirs.remove_edge(edge.id)
+
+    elapsed = best_of(lambda: diff(base, ours))
+    changes = diff(base, ours)
+    print(f"diff: {elapsed:.3f}s ({len(changes.modified_nodes)} modified nodes)")
+
+    elapsed = best_of(lambda: diff(base, Canvas.from_json(text, validate=False)), 1)
+    print(f"diff incl. loading the second version: {elapsed:.3f}s")
+
+    elapsed = best_of(lambda: merge(base, ours, theirs), 1)
+    result = merge(base, ours, theirs)
+    print(f"merge: {elapsed:.3f}s ({len(result.conflicts)} conflicts)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# bench_graph.py
+"""Graph algorithms over a 200k-node, 400k-edge canvas.
+
+Run with ``python -m benchmarks.bench_graph``.
+"""
+import time
+
+from .common import make_canvas
+
+
+def main() -> None:
+    canvas = make_canvas(200_000, 400_000)
+    start = time.perf_counter()
+    graph = canvas.graph()
+    print(f"build: {time.perf_counter() - start:.3f}s")
+
+    first = max(graph.node_ids[:100], key=lambda node_id: len(graph.successors(node_id)))
+    last = graph.node_ids[-1]
+    for name, run in (
+        ("bfs", lambda: sum(1 for _ in graph.bfs(first))),
+        ("dfs", lambda: sum(1 for _ in graph.dfs(first))),
+        ("shortest_path", lambda: graph.shortest_path(first, last)),
+        ("connected_components", lambda: len(graph.connected_components())),
+        ("find_cycle", graph.find_cycle),
+    ):
+        start = time.perf_counter()
+        run()
+        print(f"{name}: {time.perf_counter() - start:.3f}s")
+
+    dag = make_canvas(200_000, 0)
+    nodes = dag.nodes
+    dag.add_edges(
+        type(canvas.edges[0])(fromNode=nodes[i].id, toNode=nodes[i * 2 + 1].id)
+        for i in range(len(nodes) // 2)
+    )
+    graph = dag.graph()
+    start = time.perf_counter()
+    graph.topological_sort()
+    print(f"topological_sort: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
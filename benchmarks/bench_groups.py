@@ -0,0 +1,61 @@
+# bench_groups.py
+"""Group containment: bulk build and queries versus a groups x nodes loop.
+
+Run with ``python -m benchmarks.bench_groups``.
+"""
+import random
+import time
+
+from pyjsoncanvas import Canvas, GroupNode
+
+from .common import best_of, make_nodes
+
+
+def naive_descendants(canvas, group):
+    return [
+        node
+        for node in canvas.nodes
+        if node is not group
+        and group.x <= node.x
+        and group.y <= node.y
+        and node.x + node.width <= group.x + group.width
+        and node.y + node.height <= group.y + group.height
+    ]
+
+
+def main() -> None:
+    rng = random.Random(2)
+    nodes = make_nodes(50_000)
+    groups = [
+        GroupNode(
+            x=rng.randint(-10000, 9000),
+            y=rng.randint(-10000, 9000),
+            width=rng.randint(500, 3000),
+            height=rng.randint(500, 3000),
+            label=f"group {i}",
+        )
+        for i in range(2_000)
+    ]
+    canvas = Canvas(nodes=nodes + groups, edges=[])
+
+    start = time.perf_counter()
+    canvas.group_hierarchy
+    print(f"hierarchy build (incl. spatial index): {time.perf_counter() - start:.3f}s")
+
+    sample = groups[:50]
+    naive = best_of(lambda: [naive_descendants(canvas, g) for g in sample], 1)
+    print(f"naive loop over all groups (extrapolated): {naive / len(sample) * len(groups):.1f}s")
+
+    indexed = best_of(lambda: [canvas.group_descendants(g.id) for g in groups])
+    print(f"group_descendants: {indexed / len(groups) * 1e6:.1f} us per group")
+
+    moved = groups[: len(groups) // 10]
+    start = time.perf_counter()
+    for group in moved:
+        group.x += 100
+    elapsed = time.perf_counter() - start
+    print(f"incremental update after a move: {elapsed / len(moved) * 1e6:.0f} us per group")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# bench_import.py
+"""Import time of the package and per-call cost of node/edge validation.
+
+Run with ``python -m benchmarks.bench_import``. Import times are measured in
+fresh interpreters, minus the interpreter's own start-up.
+"""
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+from pyjsoncanvas import Edge, TextNode, validate_edge, validate_node
+
+STATEMENTS = (
+    "pass",
+    "import pyjsoncanvas",
+    "from pyjsoncanvas import Canvas",
+    "from pyjsoncanvas import *",
+)
+
+
+def startup(statement: str, runs: int = 15) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main() -> None:
+    baseline = startup(STATEMENTS[0])
+    for statement in STATEMENTS[1:]:
+        elapsed = startup(statement) - baseline
+        print(f"{statement:<34} {elapsed * 1e3:6.1f}ms")
+
+    node = TextNode(x=0, y=0, width=100, height=100, text="text")
+    edge = Edge(fromNode="a", toNode="b")
+    number = 100_000
+    for name, fn in (
+        ("validate_node", lambda: validate_node(node)),
+        ("validate_edge", lambda: validate_edge(edge)),
+        ("TextNode(...)", lambda: TextNode(x=0, y=0, width=1, height=1, text="")),
+    ):
+        elapsed = min(timeit.repeat(fn, number=number, repeat=5))
+        print(f"{name:<34} {elapsed / number * 1e6:6.2f}us per call")
+
+
+if __name__ == "__main__":
+    main()
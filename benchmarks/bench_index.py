@@ -0,0 +1,37 @@
+# bench_index.py
+"""Bulk construction through add_node/add_edge and id lookups.
+
+Run with ``python -m benchmarks.bench_index``. With hash-indexed lookups the
+per-object cost stays flat as the canvas grows.
+"""
+from pyjsoncanvas import Canvas
+
+from .common import best_of, make_edges, make_nodes
+
+
+def build(nodes, edges) -> Canvas:
+    canvas = Canvas(nodes=[], edges=[])
+    for node in nodes:
+        canvas.add_node(node)
+    for edge in edges:
+        canvas.add_edge(edge)
+    return canvas
+
+
+def main() -> None:
+    print(f"{'nodes':>8} {'build (s)':>10} {'us/object':>10} {'lookup (us)':>12}")
+    for count in (5_000, 10_000, 20_000, 50_000):
+        nodes = make_nodes(count)
+        edges = make_edges(nodes, count)
+        elapsed = best_of(lambda: build(nodes, edges))
+        canvas = build(nodes, edges)
+        ids = [node.id for node in nodes[:: max(1, count // 1000)]]
+        lookup = best_of(lambda: [canvas.get_node(i) for i in ids])
+        print(
+            f"{count:>8} {elapsed:>10.3f} {elapsed / (2 * count) * 1e6:>10.2f}"
+            f" {lookup / len(ids) * 1e6:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# bench_lazy.py
+"""Lazy from_json against building every object up front.
+
+Run with ``python -m benchmarks.bench_lazy``.
+"""
+import random
+
+from pyjsoncanvas import Canvas
+
+from .common import best_of, generate_canvas
+
+
+def main() -> None:
+    canvas = generate_canvas(100_000)
+    json_str = canvas.to_json()
+    node_ids = random.Random(0).sample([node.id for node in canvas.nodes], 10)
+    del canvas
+
+    def read_few(lazy: bool) -> None:
+        loaded = Canvas.from_json(json_str, lazy=lazy)
+        for node_id in node_ids:
+            loaded.get_node(node_id)
+
+    def round_trip(lazy: bool) -> None:
+        Canvas.from_json(json_str, lazy=lazy).to_json()
+
+    def connections(lazy: bool) -> None:
+        loaded = Canvas.from_json(json_str, lazy=lazy)
+        for node_id in node_ids:
+            loaded.get_connections(node_id)
+
+    for name, fn in (
+        ("from_json + 10 get_node", read_few),
+        ("from_json + to_json", round_trip),
+        ("from_json + 10 get_connections", connections),
+    ):
+        eager = best_of(lambda: fn(False))
+        lazy = best_of(lambda: fn(True))
+        print(f"{name:<32} eager {eager:.3f}s  lazy {lazy:.3f}s  x{eager / lazy:.1f}")
+
+
+if __name__ == "__main__":
+    main()
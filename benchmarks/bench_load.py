@@ -0,0 +1,30 @@
+# bench_load.py
+"""Validated versus trusted Canvas.from_json.
+
+Run with ``python -m benchmarks.bench_load``.
+"""
+from pyjsoncanvas import Canvas
+
+from .common import best_of, make_canvas
+
+
+def main() -> None:
+    canvas = make_canvas(20_000)
+    json_str = canvas.to_json()
+    objects = len(canvas.nodes) + len(canvas.edges)
+
+    def trusted_then_validate():
+        Canvas.from_json(json_str, validate=False).validate()
+
+    print(f"{'mode':>22} {'time (s)':>9} {'objects/s':>11}")
+    for name, fn in (
+        ("validate=True", lambda: Canvas.from_json(json_str)),
+        ("validate=False", lambda: Canvas.from_json(json_str, validate=False)),
+        ("trusted + validate()", trusted_then_validate),
+    ):
+        elapsed = best_of(fn)
+        print(f"{name:>22} {elapsed:>9.3f} {objects / elapsed:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# bench_load_many.py
+"""load_many over a directory of canvas files with different pool sizes.
+
+Run with ``python -m benchmarks.bench_load_many``. Scaling depends on the
+number of CPUs available.
+"""
+import os
+import tempfile
+import time
+
+from pyjsoncanvas import load_many
+
+from .common import make_canvas
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(100):
+            path = os.path.join(directory, f"{i}.canvas")
+            make_canvas(1_000, seed=i).export(path)
+            paths.append(path)
+
+        cpus = os.cpu_count() or 1
+        print(f"{len(paths)} files, {cpus} CPUs")
+        baseline = None
+        for workers in sorted({1, 2, 4, cpus}):
+            start = time.perf_counter()
+            loaded = sum(result.ok for result in load_many(paths, workers))
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(
+                f"workers={workers:<3} {elapsed:.3f}s"
+                f" speedup {baseline / elapsed:.2f}x ({loaded} loaded)"
+            )
+
+
+if __name__ == "__main__":
+    main()
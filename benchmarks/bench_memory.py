@@ -0,0 +1,41 @@
+# bench_memory.py
+"""Memory held per node and per edge by a loaded canvas.
+
+Run with ``python -m benchmarks.bench_memory``.
+"""
+import tracemalloc
+
+from pyjsoncanvas import Canvas, CanvasTable, Color
+
+from .common import make_canvas
+
+
+def main() -> None:
+    count = 50_000
+    canvas = make_canvas(count)
+    for i, node in enumerate(canvas.nodes):
+        node.color = Color("1" if i % 2 else "#ff8800")
+    json_str = canvas.to_json()
+    del canvas
+    for validate in (True, False):
+        tracemalloc.start()
+        loaded = Canvas.from_json(json_str, validate=validate)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(
+            f"validate={validate!s:>5}: {size / 2**20:.1f} MiB total,"
+            f" {size / (len(loaded.nodes) + len(loaded.edges)):.0f} bytes per object"
+        )
+        del loaded
+    tracemalloc.start()
+    table = CanvasTable.from_json(json_str)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"CanvasTable: {size / 2**20:.1f} MiB total,"
+        f" {size / (table.node_count + table.edge_count):.0f} bytes per object"
+    )
+
+
+if __name__ == "__main__":
+    main()
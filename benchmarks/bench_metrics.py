@@ -0,0 +1,46 @@
+# bench_metrics.py
+"""Cost of recording metrics on the load and save paths.
+
+Run with ``python -m benchmarks.bench_metrics``. Each operation is timed
+with recording off and on, and the phase breakdown of one recorded round
+is printed at the end.
+"""
+import os
+import tempfile
+
+from pyjsoncanvas import Canvas, collect_metrics
+
+from .common import best_of, generate_canvas
+
+
+def main() -> None:
+    canvas = generate_canvas(50_000)
+    json_str = canvas.to_json()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.canvas")
+        canvas.export(path)
+        operations = {
+            "from_json": lambda: Canvas.from_json(json_str),
+            "to_json": canvas.to_json,
+            "load": lambda: Canvas.load(path),
+            "export": lambda: canvas.export(path),
+            "validate": canvas.validate,
+        }
+        for name, operation in operations.items():
+            off = best_of(operation)
+            with collect_metrics():
+                on = best_of(operation)
+            print(f"{name:<10} off {off:.3f}s  on {on:.3f}s  x{on / off:.3f}")
+
+        with collect_metrics() as metrics:
+            for operation in operations.values():
+                operation()
+    print()
+    for phase, seconds in metrics.seconds.items():
+        print(f"{phase:<10} {seconds:.3f}s in {metrics.calls[phase]} calls")
+    for name, count in metrics.counters.items():
+        print(f"{name:<20} {count:,}")
+
+
+if __name__ == "__main__":
+    main()
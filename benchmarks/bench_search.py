@@ -0,0 +1,48 @@
+# bench_search.py
+"""Text search through the search index against scanning every node.
+
+Run with ``python -m benchmarks.bench_search``.
+"""
+import random
+import time
+
+from pyjsoncanvas import TextNode
+
+from .common import best_of, generate_canvas
+
+WORDS = [f"word{i}" for i in range(2000)]
+
+
+def main() -> None:
+    rng = random.Random(0)
+    canvas = generate_canvas(20_000)
+    for node in canvas.nodes:
+        if isinstance(node, TextNode):
+            node.text = " ".join(rng.choice(WORDS) for _ in range(8))
+
+    start = time.perf_counter()
+    canvas.search_index
+    print(f"build index, {len(canvas.nodes)} nodes: {time.perf_counter() - start:.3f}s")
+    canvas.search("x", "substring")  # Builds the trigram index.
+
+    def scan() -> None:
+        [
+            node
+            for node in canvas.nodes
+            if isinstance(node, TextNode) and "word1234" in node.text.lower()
+        ]
+
+    print(f"{'scan':<28} {best_of(scan) * 1e3:8.3f}ms")
+    for query, match in (
+        ("word1234", "token"),
+        ("word1234 word77", "token"),
+        ("word123", "prefix"),
+        ("rd1234", "substring"),
+        ("d1", "substring"),
+    ):
+        elapsed = best_of(lambda: canvas.search(query, match), repeat=20)
+        print(f"{match + ' ' + repr(query):<28} {elapsed * 1e3:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# bench_serialize.py
+"""Throughput of the CustomEncoder to_json path versus the primitive-dict path.
+
+Run with ``python -m benchmarks.bench_serialize``.
+"""
+from json import dumps
+
+from pyjsoncanvas import Canvas, Color, GroupNode
+from pyjsoncanvas.encoder import CustomEncoder
+
+from .common import best_of, make_canvas
+
+
+def legacy_to_json(canvas: Canvas) -> str:
+    return dumps(
+        {
+            "nodes": [node.to_dict() for node in canvas.nodes],
+            "edges": [edge.to_dict() for edge in canvas.edges],
+        },
+        cls=CustomEncoder,
+    )
+
+
+def main() -> None:
+    canvas = make_canvas(20_000)
+    for i, node in enumerate(canvas.nodes[::4]):
+        node.color = Color(str(i % 6 + 1))
+    for i in range(2_000):
+        canvas.add_node(GroupNode(x=i, y=i, width=10, height=10, label=f"g{i}"))
+    objects = len(canvas.nodes) + len(canvas.edges)
+    print(f"{'path':>10} {'time (s)':>9} {'objects/s':>11} {'size (MiB)':>11}")
+    for name, fn in (
+        ("legacy", lambda: legacy_to_json(canvas)),
+        ("to_json", canvas.to_json),
+    ):
+        elapsed = best_of(fn)
+        size = len(fn())
+        print(f"{name:>10} {elapsed:>9.3f} {objects / elapsed:>11,.0f} {size / 2**20:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
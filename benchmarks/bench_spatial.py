@@ -0,0 +1,57 @@
+# bench_spatial.py
+"""Viewport, hit-test and nearest-node queries on 100k random nodes.
+
+Run with ``python -m benchmarks.bench_spatial``.
+"""
+import random
+import time
+
+from pyjsoncanvas import Canvas
+
+from .common import best_of, make_nodes
+
+
+def scan_rect(canvas, x, y, width, height):
+    return [
+        node
+        for node in canvas.nodes
+        if node.x <= x + width
+        and x <= node.x + node.width
+        and node.y <= y + height
+        and y <= node.y + node.height
+    ]
+
+
+def main() -> None:
+    canvas = Canvas(nodes=make_nodes(100_000), edges=[])
+    start = time.perf_counter()
+    canvas.spatial_index
+    print(f"index build: {time.perf_counter() - start:.3f}s")
+
+    rng = random.Random(1)
+    points = [(rng.uniform(-10000, 10000), rng.uniform(-10000, 10000)) for _ in range(200)]
+    print(f"{'query':>22} {'indexed (us)':>13} {'scan (us)':>10}")
+    for name, indexed, scan in (
+        (
+            "nodes_in_rect 1920x1080",
+            lambda: [canvas.nodes_in_rect(x, y, 1920, 1080) for x, y in points],
+            lambda: [scan_rect(canvas, x, y, 1920, 1080) for x, y in points[:10]],
+        ),
+        (
+            "nodes_at_point",
+            lambda: [canvas.nodes_at_point(x, y) for x, y in points],
+            lambda: [scan_rect(canvas, x, y, 0, 0) for x, y in points[:10]],
+        ),
+        (
+            "nearest_nodes k=10",
+            lambda: [canvas.nearest_nodes(x, y, 10) for x, y in points],
+            None,
+        ),
+    ):
+        per_query = best_of(indexed) / len(points) * 1e6
+        scanned = f"{best_of(scan) / 10 * 1e6:>10.0f}" if scan else f"{'-':>10}"
+        print(f"{name:>22} {per_query:>13.1f} {scanned}")
+
+
+if __name__ == "__main__":
+    main()
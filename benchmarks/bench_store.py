@@ -0,0 +1,67 @@
+# bench_store.py
+"""Opening a canvas store and looking up a few objects, against loading the
+whole canvas.
+
+Run with ``python -m benchmarks.bench_store``.
+"""
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from pyjsoncanvas import Canvas, CanvasStore
+
+from .common import best_of, generate_canvas
+
+
+def main() -> None:
+    canvas = generate_canvas(200_000)
+    node_ids = random.Random(0).sample([node.id for node in canvas.nodes], 1000)
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "bench.canvas")
+        store_path = os.path.join(directory, "bench.pjcs")
+        canvas.export(json_path)
+        start = time.perf_counter()
+        CanvasStore.write(canvas, store_path)
+        print(f"write store: {time.perf_counter() - start:.2f}s")
+        print(
+            f"{len(canvas.nodes)} nodes: json {os.path.getsize(json_path) / 2**20:.1f} MiB,"
+            f" store {os.path.getsize(store_path) / 2**20:.1f} MiB"
+        )
+        del canvas
+
+        def lookups(source) -> None:
+            for node_id in node_ids:
+                source.get_node(node_id)
+                source.get_connections(node_id)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        loaded = Canvas.load(json_path, validate=False)
+        opened = time.perf_counter() - start
+        lookup = best_of(lambda: lookups(loaded))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f"Canvas.load:  open {opened:.3f}s, 1000 lookups {lookup * 1e3:.1f}ms,"
+            f" peak {peak / 2**20:.1f} MiB"
+        )
+        del loaded
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        store = CanvasStore(store_path)
+        opened = time.perf_counter() - start
+        lookup = best_of(lambda: lookups(store))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        store.close()
+        print(
+            f"CanvasStore:  open {opened * 1e3:.3f}ms, 1000 lookups {lookup * 1e3:.1f}ms,"
+            f" peak {peak / 2**20:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# bench_stream.py
+"""Peak memory of the whole-document and streaming load/export paths.
+
+Run with ``python -m benchmarks.bench_stream``.
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+from pyjsoncanvas import Canvas
+
+from .common import make_canvas
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main() -> None:
+    canvas = make_canvas(50_000)
+    fd, path = tempfile.mkstemp(suffix=".canvas")
+    os.close(fd)
+    try:
+        canvas.export(path)
+        size = os.path.getsize(path)
+        print(f"file size: {size / 2**20:.1f} MiB")
+
+        def from_json():
+            with open(path) as f:
+                return Canvas.from_json(f.read())
+
+        for name, fn in (
+            ("from_json", from_json),
+            ("load", lambda: Canvas.load(path)),
+            ("iterload", lambda: sum(1 for _ in Canvas.iterload(path))),
+        ):
+            _, elapsed, peak = measure(fn)
+            print(f"{name:>10}: {elapsed:.2f}s peak {peak / 2**20:.1f} MiB")
+
+        def to_json_write():
+            with open(path, "w") as f:
+                f.write(canvas.to_json())
+
+        for name, fn in (
+            ("to_json", to_json_write),
+            ("export", lambda: canvas.export(path)),
+        ):
+            _, elapsed, peak = measure(fn)
+            print(f"{name:>10}: {elapsed:.2f}s peak {peak / 2**20:.1f} MiB")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
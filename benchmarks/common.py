@@ -0,0 +1,135 @@
+# common.py
+import random
+import time
+from typing import Callable, Dict, List
+
+from pyjsoncanvas import (
+    Canvas,
+    Color,
+    Edge,
+    EdgesFromEndValue,
+    EdgesFromSideValue,
+    EdgesToEndValue,
+    EdgesToSideValue,
+    FileNode,
+    GroupNode,
+    LinkNode,
+    TextNode,
+)
+
+
+def make_nodes(count: int, seed: int = 0) -> List[TextNode]:
+    rng = random.Random(seed)
+    return [
+        TextNode(
+            x=rng.randint(-10000, 10000),
+            y=rng.randint(-10000, 10000),
+            width=rng.randint(50, 400),
+            height=rng.randint(50, 400),
+            text=f"node {i}",
+            id=f"{i:016x}",
+        )
+        for i in range(count)
+    ]
+
+
+def make_edges(nodes: List[TextNode], count: int, seed: int = 0) -> List[Edge]:
+    rng = random.Random(seed)
+    return [
+        Edge(
+            fromNode=rng.choice(nodes).id,
+            toNode=rng.choice(nodes).id,
+            id=f"e{i:015x}",
+        )
+        for i in range(count)
+    ]
+
+
+def make_canvas(node_count: int, edge_count: int = None, seed: int = 0) -> Canvas:
+    nodes = make_nodes(node_count, seed)
+    edges = make_edges(nodes, node_count if edge_count is None else edge_count, seed)
+    return Canvas(nodes=nodes, edges=edges)
+
+
+def best_of(fn: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+DEFAULT_TYPE_MIX = {"text": 0.6, "file": 0.2, "link": 0.1, "group": 0.1}
+
+
+def generate_canvas(
+    node_count: int,
+    type_mix: Dict[str, float] = None,
+    edge_density: float = 1.0,
+    group_depth: int = 1,
+    seed: int = 0,
+) -> Canvas:
+    """A random canvas with ``node_count`` nodes of the given type mix.
+
+    ``edge_density`` is the number of edges per node. Groups are stacked
+    ``group_depth`` deep, each level nested inside the previous one, and
+    other nodes are scattered so that some of them fall inside groups.
+    Edges get random sides, ends, labels and colors.
+    """
+    rng = random.Random(seed)
+    mix = type_mix or DEFAULT_TYPE_MIX
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=node_count)
+    colors = [None, None, Color("1"), Color("4"), Color("#ff8800")]
+    depth = max(group_depth, 1)
+    nodes = []
+    groups = 0
+    for i, kind in enumerate(kinds):
+        common = {"id": f"{i:016x}", "color": rng.choice(colors)}
+        if kind == "group":
+            level = groups % depth
+            if level == 0:
+                cx, cy = rng.randint(-10000, 10000), rng.randint(-10000, 10000)
+            size = 400 * (depth - level)
+            nodes.append(
+                GroupNode(
+                    x=cx - size,
+                    y=cy - size,
+                    width=2 * size,
+                    height=2 * size,
+                    label=f"group {i}",
+                    **common,
+                )
+            )
+            groups += 1
+            continue
+        geometry = {
+            "x": rng.randint(-10000, 10000),
+            "y": rng.randint(-10000, 10000),
+            "width": rng.randint(50, 400),
+            "height": rng.randint(50, 400),
+        }
+        if kind == "file":
+            nodes.append(FileNode(file=f"notes/{i}.md", **geometry, **common))
+        elif kind == "link":
+            nodes.append(LinkNode(url=f"https://example.com/{i}", **geometry, **common))
+        else:
+            nodes.append(TextNode(text=f"node {i}", **geometry, **common))
+
+    sides = [None, *EdgesFromSideValue]
+    to_sides = [None, *EdgesToSideValue]
+    edges = [
+        Edge(
+            id=f"e{i:015x}",
+            fromNode=rng.choice(nodes).id,
+            toNode=rng.choice(nodes).id,
+            fromSide=rng.choice(sides),
+            toSide=rng.choice(to_sides),
+            fromEnd=rng.choice([None, EdgesFromEndValue.ARROW]),
+            toEnd=rng.choice([None, EdgesToEndValue.NONE]),
+            label=rng.choice([None, f"edge {i}"]),
+            color=rng.choice(colors),
+        )
+        for i in range(int(node_count * edge_density))
+    ]
+    return Canvas(nodes=nodes, edges=edges)
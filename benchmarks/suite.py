@@ -0,0 +1,235 @@
+# suite.py
+"""Benchmark suite over the core Canvas API.
+
+Run with ``python -m benchmarks.suite``. Every operation runs on the same
+synthetic canvas (see ``common.generate_canvas``; the options below set its
+size and shape) and is reported as the best time of ``--repeat`` runs,
+objects processed per second and the peak memory allocated while it runs.
+
+Save the results with ``--save baseline.json`` and check a later run
+against them with ``--compare baseline.json``: operations that got slower or
+used more memory than ``--tolerance`` allows are flagged and the exit status
+is 1. Only compare runs made with the same options on the same machine.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from pyjsoncanvas import Canvas
+
+from .common import generate_canvas
+
+# An operation returns (setup, run, objects): setup() builds fresh state
+# outside the timing, run(state) is measured and objects is how many nodes
+# and edges one run processes.
+Operation = Tuple[Callable[[], Any], Callable[[Any], Any], int]
+
+
+def operations(canvas: Canvas, directory: str) -> Dict[str, Operation]:
+    json_str = canvas.to_json()
+    binary = canvas.to_binary()
+    nodes, edges = canvas.nodes, canvas.edges
+    total = len(nodes) + len(edges)
+    node_ids = [node.id for node in nodes]
+    removed = node_ids[:: max(1, len(node_ids) // 1000)]
+    export_path = os.path.join(directory, "export.canvas")
+    load_path = os.path.join(directory, "load.canvas")
+    canvas.export(load_path)
+
+    def build(_):
+        built = Canvas(nodes=[], edges=[])
+        for node in nodes:
+            built.add_node(node)
+        for edge in edges:
+            built.add_edge(edge)
+
+    def remove(state):
+        for node_id in removed:
+            state.remove_node(node_id)
+
+    def fresh():
+        return Canvas.from_json(json_str, validate=False)
+
+    def nothing():
+        return None
+
+    return {
+        "from_json": (nothing, lambda _: Canvas.from_json(json_str), total),
+        "from_json_trusted": (
+            nothing,
+            lambda _: Canvas.from_json(json_str, validate=False),
+            total,
+        ),
+        "to_json": (nothing, lambda _: canvas.to_json(), total),
+        "from_binary": (nothing, lambda _: Canvas.from_binary(binary), total),
+        "to_binary": (nothing, lambda _: canvas.to_binary(), total),
+        "export": (nothing, lambda _: canvas.export(export_path), total),
+        "load": (nothing, lambda _: Canvas.load(load_path), total),
+        "validate": (nothing, lambda _: canvas.validate(), total),
+        "add_node_add_edge": (nothing, build, total),
+        "remove_node": (fresh, remove, len(removed)),
+        "get_connections": (
+            nothing,
+            lambda _: [canvas.get_connections(node_id) for node_id in node_ids],
+            len(node_ids),
+        ),
+        "get_adjacent_nodes": (
+            nothing,
+            lambda _: [canvas.get_adjacent_nodes(node_id) for node_id in node_ids],
+            len(node_ids),
+        ),
+    }
+
+
+def measure(operation: Operation, repeat: int, min_time: float) -> Dict[str, float]:
+    setup, run, objects = operation
+    best = float("inf")
+    spent = 0.0
+    runs = 0
+    # Like timeit, time with the garbage collector off and keep the best
+    # run; short operations are repeated until min_time has been spent.
+    while runs < repeat or spent < min_time:
+        state = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run(state)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = min(best, elapsed)
+        spent += elapsed
+        runs += 1
+        del state
+    # Memory is traced in a separate run since tracing slows everything down.
+    state = setup()
+    tracemalloc.start()
+    run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": best, "per_second": objects / best, "peak_bytes": peak}
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key, label in (("seconds", "time"), ("peak_bytes", "memory")):
+            ratio = result[key] / base[key] if base[key] else 1.0
+            if ratio > 1 + tolerance:
+                regressions.append(f"{name}: {label} x{ratio:.2f}")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=20_000)
+    parser.add_argument("--edge-density", type=float, default=1.0)
+    parser.add_argument("--group-depth", type=int, default=2)
+    parser.add_argument(
+        "--type-mix",
+        default="text=0.6,file=0.2,link=0.1,group=0.1",
+        help="comma-separated type=weight pairs",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.5,
+        help="keep repeating each operation until this many seconds are spent",
+    )
+    parser.add_argument("--only", nargs="*", help="run only these operations")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against a saved JSON file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed slowdown or memory growth, as a fraction",
+    )
+    args = parser.parse_args(argv)
+
+    config = {
+        "nodes": args.nodes,
+        "edge_density": args.edge_density,
+        "group_depth": args.group_depth,
+        "type_mix": {
+            kind: float(weight)
+            for kind, weight in (pair.split("=") for pair in args.type_mix.split(","))
+        },
+        "seed": args.seed,
+    }
+    canvas = generate_canvas(
+        config["nodes"],
+        config["type_mix"],
+        config["edge_density"],
+        config["group_depth"],
+        config["seed"],
+    )
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            saved = json.load(f)
+        if saved["config"] != config:
+            print("warning: the baseline was recorded with different options")
+        baseline = saved["results"]
+
+    print(
+        f"{len(canvas.nodes)} nodes, {len(canvas.edges)} edges,"
+        f" Python {platform.python_version()}"
+    )
+    header = f"{'operation':<20} {'time (s)':>9} {'objects/s':>12} {'peak MiB':>9}"
+    print(header + ("  vs baseline" if baseline else ""))
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, operation in operations(canvas, directory).items():
+            if args.only and name not in args.only:
+                continue
+            result = results[name] = measure(operation, args.repeat, args.min_time)
+            line = (
+                f"{name:<20} {result['seconds']:>9.4f} {result['per_second']:>12,.0f}"
+                f" {result['peak_bytes'] / 2**20:>9.1f}"
+            )
+            if baseline and name in baseline:
+                line += (
+                    f"  time x{result['seconds'] / baseline[name]['seconds']:.2f},"
+                    f" memory x{result['peak_bytes'] / max(baseline[name]['peak_bytes'], 1):.2f}"
+                )
+            print(line)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "config": config,
+                    "python": platform.python_version(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,118 @@
 # __init__.py
-from .validate import validate_node, validate_edge
-from .models import (
-    GenericNode,
-    LinkNode,
-    GroupNode,
-    FileNode,
-    TextNode,
-    NodeType,
-    GroupNodeBackgroundStyle,
-    Edge,
-    EdgesFromEndValue,
-    EdgesFromSideValue,
-    EdgesToSideValue,
-    EdgesToEndValue,
-    Color,
-)
-from .exceptions import (
-    InvalidNodeTypeError,
-    InvalidEdgeAttributeError,
-    OrphanEdgeError,
-    CanvasValidationError,
-    NodeIDConflictError,
-    EdgeIDConflictError,
-    NodeNotFoundError,
-    EdgeNotFoundError,
-    InvalidJsonError,
-    InvalidNodeAttributeError,
-    InvalidEdgeConnectionError,
-)
-from .jsoncanvas import Canvas
+# Public names are loaded from their submodules on first access, so
+# importing the package stays cheap for tools that only need a few of them.
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    ".validate": ("validate_node", "validate_edge", "ValidationIssue"),
+    ".models": (
+        "GenericNode",
+        "LinkNode",
+        "GroupNode",
+        "FileNode",
+        "TextNode",
+        "NodeType",
+        "GroupNodeBackgroundStyle",
+        "Edge",
+        "EdgesFromEndValue",
+        "EdgesFromSideValue",
+        "EdgesToSideValue",
+        "EdgesToEndValue",
+        "Color",
+    ),
+    ".exceptions": (
+        "InvalidNodeTypeError",
+        "InvalidEdgeAttributeError",
+        "OrphanEdgeError",
+        "CanvasValidationError",
+        "NodeIDConflictError",
+        "EdgeIDConflictError",
+        "NodeNotFoundError",
+        "EdgeNotFoundError",
+        "InvalidJsonError",
+        "InvalidNodeAttributeError",
+        "InvalidEdgeConnectionError",
+        "GraphCycleError",
+        "InvalidBinaryError",
+    ),
+    ".jsoncanvas": ("Canvas",),
+    ".table": ("CanvasTable",),
+    ".store": ("CanvasStore",),
+    ".compare": (
+        "diff",
+        "merge",
+        "CanvasDiff",
+        "ObjectChange",
+        "MergeConflict",
+        "MergeResult",
+    ),
+    ".graph": ("CanvasGraph",),
+    ".parallel": ("load_many", "LoadResult"),
+    ".metrics": ("Metrics", "enable_metrics", "disable_metrics", "collect_metrics"),
+}
+
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .validate import validate_node, validate_edge, ValidationIssue
+    from .models import (
+        GenericNode,
+        LinkNode,
+        GroupNode,
+        FileNode,
+        TextNode,
+        NodeType,
+        GroupNodeBackgroundStyle,
+        Edge,
+        EdgesFromEndValue,
+        EdgesFromSideValue,
+        EdgesToSideValue,
+        EdgesToEndValue,
+        Color,
+    )
+    from .exceptions import (
+        InvalidNodeTypeError,
+        InvalidEdgeAttributeError,
+        OrphanEdgeError,
+        CanvasValidationError,
+        NodeIDConflictError,
+        EdgeIDConflictError,
+        NodeNotFoundError,
+        EdgeNotFoundError,
+        InvalidJsonError,
+        InvalidNodeAttributeError,
+        InvalidEdgeConnectionError,
+        GraphCycleError,
+        InvalidBinaryError,
+    )
+    from .jsoncanvas import Canvas
+    from .table import CanvasTable
+    from .store import CanvasStore
+    from .compare import (
+        diff,
+        merge,
+        CanvasDiff,
+        ObjectChange,
+        MergeConflict,
+        MergeResult,
+    )
+    from .graph import CanvasGraph
+    from .parallel import load_many, LoadResult
+    from .metrics import Metrics, enable_metrics, disable_metrics, collect_metrics
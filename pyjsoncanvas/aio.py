@@ -0,0 +1,44 @@
+# aio.py
+import asyncio
+import weakref
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Callable, Optional
+
+# Blocking loads and exports allowed to run at once per event loop. More
+# callers wait their turn instead of piling work onto the executor. Parsing
+# holds the GIL, so extra threads mostly overlap file I/O while making the
+# event loop wait longer for its turn.
+DEFAULT_MAX_CONCURRENCY = 2
+
+_max_concurrency = DEFAULT_MAX_CONCURRENCY
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def set_max_concurrency(limit: int) -> None:
+    """Change how many loads and exports may run at once per event loop."""
+    global _max_concurrency
+    if limit < 1:
+        raise ValueError("The concurrency limit must be at least 1.")
+    _max_concurrency = limit
+    _semaphores.clear()
+
+
+def _semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(_max_concurrency)
+    return semaphore
+
+
+async def run_blocking(
+    fn: Callable[..., Any], *args: Any, executor: Optional[Executor] = None
+) -> Any:
+    """Run ``fn(*args)`` in ``executor`` (the loop's default thread pool if
+    None) once a concurrency slot is free, without blocking the loop."""
+    async with _semaphore():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(fn, *args))
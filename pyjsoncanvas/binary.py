@@ -0,0 +1,362 @@
+# binary.py
+"""A compact binary encoding of canvases.
+
+Layout: the magic bytes ``PJCB``, a version byte, a flags byte and the
+body, compressed with zlib when ``FLAG_ZLIB`` is set. The body is a fixed
+sequence of blocks, each a typecode byte, a little-endian 64-bit item count
+and the items of an ``array`` of that typecode, little-endian:
+
+- the string table, as the character length of every string followed by
+  all strings concatenated in UTF-8. String references elsewhere are
+  positions in this table plus one; 0 stands for an unset value;
+- one column per node attribute: type, id, x, y, width, height, color,
+  the main string (text, file, url or label by type), the second string
+  (subpath or background) and backgroundStyle;
+- one column per edge attribute: id, fromNode, toNode, fromSide, fromEnd,
+  toSide, toEnd, color and label.
+
+Enum columns hold the position of the member in its enum plus one, again
+with 0 for unset. Geometry columns use the narrowest integer typecode that
+fits their values. Every ID is stored once, however many edges refer to it,
+and decoding turns whole columns back into arrays in one step.
+"""
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+from struct import Struct, error as StructError
+from typing import List, Optional, Tuple
+
+from .exceptions import (
+    CanvasValidationError,
+    InvalidBinaryError,
+    InvalidNodeAttributeError,
+)
+from .models import (
+    Edge,
+    EdgesFromEndValue,
+    EdgesFromSideValue,
+    EdgesToEndValue,
+    EdgesToSideValue,
+    FileNode,
+    GenericNode,
+    GroupNode,
+    GroupNodeBackgroundStyle,
+    LinkNode,
+    NodeType,
+    TextNode,
+    _trusted_color,
+)
+
+MAGIC = b"PJCB"
+VERSION = 1
+FLAG_ZLIB = 1
+
+_HEADER = Struct("<4sBB")
+_BLOCK = Struct("<cQ")
+_SWAP = sys.byteorder == "big"
+
+# Position 0 of every enum column means unset.
+_NODE_TYPES = (None, *NodeType)
+_NODE_CLASSES = (None, TextNode, FileNode, LinkNode, GroupNode)
+_FROM_SIDES = (None, *EdgesFromSideValue)
+_FROM_ENDS = (None, *EdgesFromEndValue)
+_TO_SIDES = (None, *EdgesToSideValue)
+_TO_ENDS = (None, *EdgesToEndValue)
+_BACKGROUND_STYLES = (None, *GroupNodeBackgroundStyle)
+
+_TEXT, _FILE, _LINK, _GROUP = 1, 2, 3, 4
+
+
+def _codes(members: tuple) -> dict:
+    return {member: code for code, member in enumerate(members)}
+
+
+_NODE_TYPE_CODES = _codes(_NODE_TYPES)
+_FROM_SIDE_CODES = _codes(_FROM_SIDES)
+_FROM_END_CODES = _codes(_FROM_ENDS)
+_TO_SIDE_CODES = _codes(_TO_SIDES)
+_TO_END_CODES = _codes(_TO_ENDS)
+_BACKGROUND_STYLE_CODES = _codes(_BACKGROUND_STYLES)
+
+
+def _narrow(values: array) -> array:
+    if not values:
+        return values
+    low, high = min(values), max(values)
+    for typecode in ("b", "h", "i"):
+        bits = array(typecode).itemsize * 8
+        if -(1 << (bits - 1)) <= low and high < 1 << (bits - 1):
+            return array(typecode, values)
+    return values
+
+
+def _block(out: List[bytes], column: array) -> None:
+    out.append(_BLOCK.pack(column.typecode.encode(), len(column)))
+    if _SWAP and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+    out.append(column.tobytes())
+
+
+def encode(
+    nodes: List[GenericNode], edges: List[Edge], compress: bool = False
+) -> bytes:
+    """Encode nodes and edges. Node geometry must be integers that fit in
+    64 bits, as ``Canvas.validate`` requires."""
+    # Insertion order of the dict is the string table; None is position 0.
+    strings = {None: 0}
+    ref = strings.setdefault
+
+    types = array("B")
+    ids = array("I")
+    geometry = (array("q"), array("q"), array("q"), array("q"))
+    xs, ys, widths, heights = geometry
+    colors = array("I")
+    mains = array("I")
+    seconds = array("I")
+    styles = array("B")
+    for node in nodes:
+        code = _NODE_TYPE_CODES[node.type]
+        types.append(code)
+        ids.append(ref(node.id, len(strings)))
+        try:
+            xs.append(node.x)
+            ys.append(node.y)
+            widths.append(node.width)
+            heights.append(node.height)
+        except (TypeError, OverflowError) as e:
+            raise InvalidNodeAttributeError(
+                f"Node {node.id} has geometry that is not a 64-bit integer."
+            ) from e
+        color = node.color
+        colors.append(0 if color is None else ref(color.color, len(strings)))
+        if code == _TEXT:
+            mains.append(ref(node.text, len(strings)))
+            seconds.append(0)
+            styles.append(0)
+        elif code == _FILE:
+            mains.append(ref(node.file, len(strings)))
+            seconds.append(ref(node.subpath, len(strings)))
+            styles.append(0)
+        elif code == _LINK:
+            mains.append(ref(node.url, len(strings)))
+            seconds.append(0)
+            styles.append(0)
+        else:
+            mains.append(ref(node.label, len(strings)))
+            seconds.append(ref(node.background, len(strings)))
+            styles.append(_BACKGROUND_STYLE_CODES[node.backgroundStyle])
+
+    edge_ids = array("I")
+    sources = array("I")
+    targets = array("I")
+    ends = (array("B"), array("B"), array("B"), array("B"))
+    from_sides, from_ends, to_sides, to_ends = ends
+    edge_colors = array("I")
+    labels = array("I")
+    for edge in edges:
+        edge_ids.append(ref(edge.id, len(strings)))
+        sources.append(ref(edge.fromNode, len(strings)))
+        targets.append(ref(edge.toNode, len(strings)))
+        from_sides.append(_FROM_SIDE_CODES[edge.fromSide])
+        from_ends.append(_FROM_END_CODES[edge.fromEnd])
+        to_sides.append(_TO_SIDE_CODES[edge.toSide])
+        to_ends.append(_TO_END_CODES[edge.toEnd])
+        color = edge.color
+        edge_colors.append(0 if color is None else ref(color.color, len(strings)))
+        labels.append(ref(edge.label, len(strings)))
+
+    table = list(strings)[1:]
+    out = []
+    _block(out, array("I", map(len, table)))
+    try:
+        blob = "".join(table).encode("utf-8", "surrogatepass")
+    except TypeError as e:
+        raise CanvasValidationError(
+            "Only canvases with string IDs, texts and labels can be encoded."
+        ) from e
+    out.append(_BLOCK.pack(b"B", len(blob)))
+    out.append(blob)
+    for column in (types, ids, *map(_narrow, geometry), colors, mains, seconds, styles):
+        _block(out, column)
+    for column in (edge_ids, sources, targets, *ends, edge_colors, labels):
+        _block(out, column)
+    body = b"".join(out)
+    flags = 0
+    if compress:
+        body = zlib.compress(body)
+        flags |= FLAG_ZLIB
+    return _HEADER.pack(MAGIC, VERSION, flags) + body
+
+
+class _Blocks:
+    def __init__(self, body: bytes):
+        self.view = memoryview(body)
+        self.pos = 0
+
+    def raw(self, typecode: Optional[str] = None) -> Tuple[str, memoryview]:
+        try:
+            code, count = _BLOCK.unpack_from(self.view, self.pos)
+            code = code.decode("ascii")
+            size = count * array(code).itemsize
+        except (StructError, UnicodeDecodeError, ValueError) as e:
+            raise InvalidBinaryError("Truncated or corrupt binary canvas.") from e
+        if typecode is not None and code != typecode:
+            raise InvalidBinaryError("Truncated or corrupt binary canvas.")
+        start = self.pos + _BLOCK.size
+        self.pos = start + size
+        if self.pos > len(self.view):
+            raise InvalidBinaryError("Truncated or corrupt binary canvas.")
+        return code, self.view[start : self.pos]
+
+    def column(self, typecode: Optional[str] = None, count: int = -1) -> array:
+        code, data = self.raw(typecode)
+        column = array(code)
+        column.frombytes(data)
+        if _SWAP and column.itemsize > 1:
+            column.byteswap()
+        if count >= 0 and len(column) != count:
+            raise InvalidBinaryError("Truncated or corrupt binary canvas.")
+        return column
+
+
+def _body(data: bytes) -> bytes:
+    if len(data) < _HEADER.size:
+        raise InvalidBinaryError("Not a binary canvas.")
+    magic, version, flags = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise InvalidBinaryError("Not a binary canvas.")
+    if version != VERSION:
+        raise InvalidBinaryError(f"Unsupported binary canvas version {version}.")
+    body = memoryview(data)[_HEADER.size :]
+    if flags & FLAG_ZLIB:
+        try:
+            return zlib.decompress(body)
+        except zlib.error as e:
+            raise InvalidBinaryError("Corrupt compressed binary canvas.") from e
+    return body
+
+
+def read_strings(data: bytes) -> Tuple[_Blocks, List[Optional[str]]]:
+    """Check the header and decode the string table; the node and edge
+    columns are left for ``build_objects``."""
+    blocks = _Blocks(_body(data))
+    lengths = blocks.column("I")
+    _, blob = blocks.raw("B")
+    try:
+        text = str(blob, "utf-8", "surrogatepass")
+    except UnicodeDecodeError as e:
+        raise InvalidBinaryError("Corrupt string table in binary canvas.") from e
+    ends = list(accumulate(lengths))
+    if (ends[-1] if ends else 0) != len(text):
+        raise InvalidBinaryError("Corrupt string table in binary canvas.")
+    table: List[Optional[str]] = [None]
+    table += [text[start:end] for start, end in zip([0] + ends, ends)]
+    return blocks, table
+
+
+def decode(data: bytes) -> Tuple[List[GenericNode], List[Edge]]:
+    """Decode ``encode`` output into nodes and edges without validating
+    them, the way ``from_json`` builds trusted input."""
+    blocks, table = read_strings(data)
+    return build_objects(blocks, table)
+
+
+def build_objects(
+    blocks: _Blocks, table: List[Optional[str]]
+) -> Tuple[List[GenericNode], List[Edge]]:
+    try:
+        return _build(blocks, table)
+    except (IndexError, KeyError, TypeError) as e:
+        raise InvalidBinaryError("Corrupt binary canvas.") from e
+
+
+def _build(
+    blocks: _Blocks, table: List[Optional[str]]
+) -> Tuple[List[GenericNode], List[Edge]]:
+    types = blocks.column("B")
+    count = len(types)
+    ids = blocks.column("I", count)
+    xs, ys, widths, heights = (blocks.column(None, count) for _ in range(4))
+    if not {xs.typecode, ys.typecode, widths.typecode, heights.typecode} <= set(
+        "bhiq"
+    ):
+        raise InvalidBinaryError("Corrupt geometry in binary canvas.")
+    colors = blocks.column("I", count)
+    mains = blocks.column("I", count)
+    seconds = blocks.column("I", count)
+    styles = blocks.column("B", count)
+
+    intern = sys.intern
+    for i in ids:
+        table[i] = intern(table[i])
+    color_objects = {0: None}
+    for i in set(colors):
+        if i:
+            color_objects[i] = _trusted_color(table[i])
+
+    new = object.__new__
+    node_types = _NODE_TYPES
+    classes = _NODE_CLASSES
+    styles_by_code = _BACKGROUND_STYLES
+    nodes = []
+    append = nodes.append
+    for code, i, x, y, width, height, color, main, second, style in zip(
+        types, ids, xs, ys, widths, heights, colors, mains, seconds, styles
+    ):
+        node = new(classes[code])
+        node.type = node_types[code]
+        node.x = x
+        node.y = y
+        node.width = width
+        node.height = height
+        node.color = color_objects[color]
+        node.id = table[i]
+        if code == _TEXT:
+            node.text = table[main]
+        elif code == _FILE:
+            node.file = table[main]
+            node.subpath = table[second]
+        elif code == _LINK:
+            node.url = table[main]
+        else:
+            node.label = table[main]
+            node.background = table[second]
+            node.backgroundStyle = styles_by_code[style]
+        append(node)
+
+    edge_ids = blocks.column("I")
+    count = len(edge_ids)
+    sources = blocks.column("I", count)
+    targets = blocks.column("I", count)
+    from_sides = blocks.column("B", count)
+    from_ends = blocks.column("B", count)
+    to_sides = blocks.column("B", count)
+    to_ends = blocks.column("B", count)
+    edge_colors = blocks.column("I", count)
+    labels = blocks.column("I", count)
+    for i in set(edge_colors):
+        if i not in color_objects:
+            color_objects[i] = _trusted_color(table[i])
+
+    edges = []
+    append = edges.append
+    for i, source, target, from_side, from_end, to_side, to_end, color, label in zip(
+        edge_ids, sources, targets, from_sides, from_ends, to_sides, to_ends,
+        edge_colors, labels,
+    ):
+        edge = new(Edge)
+        edge.fromNode = table[source]
+        edge.toNode = table[target]
+        edge.fromSide = _FROM_SIDES[from_side]
+        edge.fromEnd = _FROM_ENDS[from_end]
+        edge.toSide = _TO_SIDES[to_side]
+        edge.toEnd = _TO_ENDS[to_end]
+        edge.color = color_objects[color]
+        edge.label = table[label]
+        edge.id = table[i]
+        append(edge)
+    if blocks.pos != len(blocks.view):
+        raise InvalidBinaryError("Trailing data after binary canvas.")
+    return nodes, edges
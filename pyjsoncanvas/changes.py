@@ -0,0 +1,116 @@
+# changes.py
+from typing import Any, Dict, List, Tuple
+
+from .exceptions import InvalidJsonError
+from .models import edge_from_dict, field_from_json, node_from_dict
+
+Patch = List[Dict[str, Any]]
+
+# Order in which patch operations are emitted and must be applied. Removals
+# come first and edges go before the nodes they hang off; updates precede
+# additions so that an object renamed away from an id frees it in time.
+OPS = (
+    "remove_edge",
+    "remove_node",
+    "update_node",
+    "add_node",
+    "update_edge",
+    "add_edge",
+)
+
+
+class _Entry:
+    __slots__ = ("kind", "obj", "added", "original_id", "fields")
+
+    def __init__(self, kind: str, obj: Any, added: bool, original_id: str):
+        self.kind = kind
+        self.obj = obj
+        self.added = added
+        self.original_id = original_id
+        self.fields: Dict[str, None] = {}
+
+
+class ChangeLog:
+    """Net changes to a canvas since tracking started or was last cleared.
+
+    Changes are folded per object as they happen: updating an added object
+    keeps a single add, removing an added object cancels it out, and
+    repeated updates of one field record it once. Live objects are keyed by
+    identity so renames fold in too. Values are read from the objects when
+    the patch is made, so a patch always carries their latest state.
+    """
+
+    def __init__(self):
+        self._live: Dict[int, _Entry] = {}
+        self._removed: Dict[Tuple[str, str], None] = {}
+
+    def __len__(self) -> int:
+        return len(self._live) + len(self._removed)
+
+    def clear(self) -> None:
+        self._live.clear()
+        self._removed.clear()
+
+    def added(self, kind: str, obj: Any) -> None:
+        self._live[id(obj)] = _Entry(kind, obj, True, obj.id)
+
+    def removed(self, kind: str, obj: Any) -> None:
+        entry = self._live.pop(id(obj), None)
+        if entry is None:
+            self._removed[(kind, obj.id)] = None
+        elif not entry.added:
+            self._removed[(kind, entry.original_id)] = None
+
+    def updated(self, kind: str, obj: Any, field: str, old_value: Any) -> None:
+        entry = self._live.get(id(obj))
+        if entry is None:
+            original_id = old_value if field == "id" else obj.id
+            entry = self._live[id(obj)] = _Entry(kind, obj, False, original_id)
+        if not entry.added:
+            entry.fields[field] = None
+
+    def make_patch(self) -> Patch:
+        """The recorded changes as a JSON-serializable list of operations."""
+        ops: Dict[str, Patch] = {op: [] for op in OPS}
+        for kind, obj_id in self._removed:
+            ops[f"remove_{kind}"].append({"op": f"remove_{kind}", "id": obj_id})
+        for entry in self._live.values():
+            data = entry.obj.to_json_dict()
+            if entry.added:
+                ops[f"add_{entry.kind}"].append(
+                    {"op": f"add_{entry.kind}", "value": data}
+                )
+            else:
+                ops[f"update_{entry.kind}"].append(
+                    {
+                        "op": f"update_{entry.kind}",
+                        "id": entry.original_id,
+                        "fields": {field: data.get(field) for field in entry.fields},
+                    }
+                )
+        return [op for name in OPS for op in ops[name]]
+
+
+def apply_patch(canvas, patch: Patch, validate: bool = True) -> None:
+    """Apply operations produced by ``ChangeLog.make_patch`` to ``canvas``."""
+    for op in patch:
+        name = op.get("op")
+        if name == "remove_edge":
+            canvas.remove_edge(op["id"])
+        elif name == "remove_node":
+            # Edges removed along with the node were recorded on their own.
+            canvas._drop_node(op["id"])
+        elif name == "add_node":
+            canvas.add_node(node_from_dict(op["value"], validate))
+        elif name == "add_edge":
+            canvas.add_edge(edge_from_dict(op["value"], validate))
+        elif name in ("update_node", "update_edge"):
+            obj = (
+                canvas.get_node(op["id"])
+                if name == "update_node"
+                else canvas.get_edge(op["id"])
+            )
+            for field, value in op["fields"].items():
+                setattr(obj, field, field_from_json(field, value))
+        else:
+            raise InvalidJsonError(f"Unknown patch operation {name!r}.")
@@ -0,0 +1,299 @@
+# compare.py
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .changes import OPS, Patch
+from .jsoncanvas import Canvas
+from .models import Edge, GenericNode, model_class
+
+# JSON field values before and after, None when the field is unset.
+FieldChanges = Dict[str, Tuple[Any, Any]]
+
+
+@dataclass
+class ObjectChange:
+    id: str
+    fields: FieldChanges
+
+
+@dataclass
+class CanvasDiff:
+    added_nodes: List[GenericNode] = field(default_factory=list)
+    removed_nodes: List[GenericNode] = field(default_factory=list)
+    modified_nodes: List[ObjectChange] = field(default_factory=list)
+    added_edges: List[Edge] = field(default_factory=list)
+    removed_edges: List[Edge] = field(default_factory=list)
+    modified_edges: List[ObjectChange] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return any(
+            (
+                self.added_nodes,
+                self.removed_nodes,
+                self.modified_nodes,
+                self.added_edges,
+                self.removed_edges,
+                self.modified_edges,
+            )
+        )
+
+    def to_patch(self) -> Patch:
+        """The difference as a patch for ``Canvas.apply_patch``, turning the
+        first canvas into the second."""
+        return (
+            [{"op": "remove_edge", "id": edge.id} for edge in self.removed_edges]
+            + [{"op": "remove_node", "id": node.id} for node in self.removed_nodes]
+            + [_update_op("update_node", change) for change in self.modified_nodes]
+            + [{"op": "add_node", "value": n.to_json_dict()} for n in self.added_nodes]
+            + [_update_op("update_edge", change) for change in self.modified_edges]
+            + [{"op": "add_edge", "value": e.to_json_dict()} for e in self.added_edges]
+        )
+
+
+@dataclass
+class MergeConflict:
+    """A change made on both sides of a merge.
+
+    ``field`` is None when the object as a whole conflicts: removed on one
+    side and modified on the other, or added on both sides with different
+    content. ``base``, ``ours`` and ``theirs`` then hold the JSON dicts of
+    the object, None where it is absent.
+    """
+
+    kind: str
+    id: str
+    field: Optional[str]
+    base: Any
+    ours: Any
+    theirs: Any
+
+
+@dataclass
+class MergeResult:
+    canvas: Canvas
+    conflicts: List[MergeConflict]
+
+
+def _update_op(op: str, change: ObjectChange) -> Dict[str, Any]:
+    fields = {name: new for name, (old, new) in change.fields.items()}
+    return {"op": op, "id": change.id, "fields": fields}
+
+
+def _field_changes(old: Dict[str, Any], new: Dict[str, Any]) -> FieldChanges:
+    changes = {
+        name: (value, new.get(name))
+        for name, value in old.items()
+        if new.get(name) != value
+    }
+    for name, value in new.items():
+        if name not in old:
+            changes[name] = (None, value)
+    return changes
+
+
+_field_getters: Dict[type, Callable[[Any], tuple]] = {}
+
+
+def _field_getter(cls: type) -> Callable[[Any], tuple]:
+    getter = _field_getters.get(cls)
+    if getter is None:
+        getter = _field_getters[cls] = attrgetter(*(f.name for f in fields(cls)))
+    return getter
+
+
+def _diff_objects(old_index, new_index, added, removed, modified) -> None:
+    for obj_id, old in old_index.items():
+        new = new_index.get(obj_id)
+        if new is None:
+            removed.append(old)
+        elif new is not old:
+            # Compare the raw attributes first and only build JSON dicts for
+            # the few objects that look different.
+            cls = model_class(old)
+            getter = _field_getter(cls)
+            if model_class(new) is cls and getter(old) == getter(new):
+                continue
+            old_data = old.to_json_dict()
+            new_data = new.to_json_dict()
+            if old_data != new_data:
+                modified.append(
+                    ObjectChange(obj_id, _field_changes(old_data, new_data))
+                )
+    added.extend(new for obj_id, new in new_index.items() if obj_id not in old_index)
+
+
+def diff(canvas_a, canvas_b) -> CanvasDiff:
+    """Nodes and edges added, removed and modified going from ``canvas_a`` to
+    ``canvas_b``, matched by id and compared field by field."""
+    result = CanvasDiff()
+    _diff_objects(
+        canvas_a._node_index,
+        canvas_b._node_index,
+        result.added_nodes,
+        result.removed_nodes,
+        result.modified_nodes,
+    )
+    _diff_objects(
+        canvas_a._edge_index,
+        canvas_b._edge_index,
+        result.added_edges,
+        result.removed_edges,
+        result.modified_edges,
+    )
+    return result
+
+
+def _merge_objects(kind, indexes, ours, theirs, ops, conflicts) -> None:
+    """Add the changes ``theirs`` made to ``ops``, unless ``ours`` made a
+    conflicting change to the same object."""
+    base_index, ours_index, theirs_index = indexes
+    ours_removed = {obj.id for obj in getattr(ours, f"removed_{kind}s")}
+    ours_added = {obj.id: obj for obj in getattr(ours, f"added_{kind}s")}
+    ours_modified = {c.id: c.fields for c in getattr(ours, f"modified_{kind}s")}
+
+    for obj in getattr(theirs, f"removed_{kind}s"):
+        if obj.id in ours_modified:
+            conflicts.append(
+                MergeConflict(
+                    kind,
+                    obj.id,
+                    None,
+                    obj.to_json_dict(),
+                    ours_index[obj.id].to_json_dict(),
+                    None,
+                )
+            )
+        elif obj.id not in ours_removed:
+            ops[f"remove_{kind}"].append({"op": f"remove_{kind}", "id": obj.id})
+
+    for obj in getattr(theirs, f"added_{kind}s"):
+        value = obj.to_json_dict()
+        ours_obj = ours_added.get(obj.id)
+        if ours_obj is None:
+            ops[f"add_{kind}"].append({"op": f"add_{kind}", "value": value})
+        elif ours_obj.to_json_dict() != value:
+            conflicts.append(
+                MergeConflict(kind, obj.id, None, None, ours_obj.to_json_dict(), value)
+            )
+
+    for change in getattr(theirs, f"modified_{kind}s"):
+        if change.id in ours_removed:
+            conflicts.append(
+                MergeConflict(
+                    kind,
+                    change.id,
+                    None,
+                    base_index[change.id].to_json_dict(),
+                    None,
+                    theirs_index[change.id].to_json_dict(),
+                )
+            )
+            continue
+        ours_fields = ours_modified.get(change.id, {})
+        changed = {}
+        for name, (old, new) in change.fields.items():
+            if name not in ours_fields:
+                changed[name] = new
+            elif ours_fields[name][1] != new:
+                conflicts.append(
+                    MergeConflict(kind, change.id, name, old, ours_fields[name][1], new)
+                )
+        if changed:
+            ops[f"update_{kind}"].append(
+                {"op": f"update_{kind}", "id": change.id, "fields": changed}
+            )
+
+
+def _keep_edges_attached(indexes, ops, conflicts) -> None:
+    """Drop operations taken from ``theirs`` that would leave an edge of
+    the merged canvas pointing at a missing node, as conflicts."""
+    base_nodes, base_edges, ours_nodes, ours_edges = indexes
+    # Nodes that exist in the merged canvas unless theirs removes them; an
+    # edge taken from theirs never points at a node theirs removed.
+    available = set(ours_nodes)
+    available.update(op["value"]["id"] for op in ops["add_node"])
+    added = []
+    for op in ops["add_edge"]:
+        value = op["value"]
+        if value["fromNode"] in available and value["toNode"] in available:
+            added.append(op)
+        else:
+            conflicts.append(
+                MergeConflict("edge", value["id"], None, None, None, value)
+            )
+    ops["add_edge"] = added
+    updated = []
+    for op in ops["update_edge"]:
+        fields = op["fields"]
+        for name in ("fromNode", "toNode"):
+            if name in fields and fields[name] not in available:
+                conflicts.append(
+                    MergeConflict(
+                        "edge",
+                        op["id"],
+                        name,
+                        getattr(base_edges[op["id"]], name),
+                        getattr(ours_edges[op["id"]], name),
+                        fields.pop(name),
+                    )
+                )
+        if fields:
+            updated.append(op)
+    ops["update_edge"] = updated
+
+    # Theirs may remove a node that ours attached an edge to.
+    removed_edges = {op["id"] for op in ops["remove_edge"]}
+    endpoints = {op["id"]: op["fields"] for op in updated}
+    attached = set()
+    for edge in ours_edges.values():
+        if edge.id not in removed_edges:
+            fields = endpoints.get(edge.id, {})
+            attached.add(fields.get("fromNode", edge.fromNode))
+            attached.add(fields.get("toNode", edge.toNode))
+    removed = []
+    for op in ops["remove_node"]:
+        if op["id"] in attached:
+            conflicts.append(
+                MergeConflict(
+                    "node",
+                    op["id"],
+                    None,
+                    base_nodes[op["id"]].to_json_dict(),
+                    ours_nodes[op["id"]].to_json_dict(),
+                    None,
+                )
+            )
+        else:
+            removed.append(op)
+    ops["remove_node"] = removed
+
+
+def merge(base, ours, theirs) -> MergeResult:
+    """Three-way merge of two canvases derived from ``base``.
+
+    Changes made on only one side are taken over. Fields changed on both
+    sides to different values, objects removed on one side and modified on
+    the other and objects added on both sides with different content are
+    reported as conflicts and resolved in favour of ``ours``. So are
+    changes from ``theirs`` that would leave an edge without its nodes: a
+    node removed while ``ours`` still has edges attached to it, and an edge
+    added or re-pointed to a node that ``ours`` removed.
+    """
+    ours_diff = diff(base, ours)
+    theirs_diff = diff(base, theirs)
+    ops: Dict[str, Patch] = {op: [] for op in OPS}
+    conflicts: List[MergeConflict] = []
+    node_indexes = (base._node_index, ours._node_index, theirs._node_index)
+    edge_indexes = (base._edge_index, ours._edge_index, theirs._edge_index)
+    _merge_objects("node", node_indexes, ours_diff, theirs_diff, ops, conflicts)
+    _merge_objects("edge", edge_indexes, ours_diff, theirs_diff, ops, conflicts)
+    _keep_edges_attached(
+        (base._node_index, base._edge_index, ours._node_index, ours._edge_index),
+        ops,
+        conflicts,
+    )
+
+    canvas = Canvas.from_json(ours.to_json(), validate=False)
+    canvas.apply_patch([op for name in OPS for op in ops[name]], validate=False)
+    return MergeResult(canvas, conflicts)
@@ -123,3 +123,15 @@ class CanvasValidationError(JsonCanvasException):
     """Raised when the canvas does not pass validation checks."""
 
     pass
+
+
+class GraphCycleError(JsonCanvasException):
+    """Raised when an operation needs acyclic edges but they form a cycle."""
+
+    pass
+
+
+class InvalidBinaryError(JsonCanvasException):
+    """Raised when binary canvas data is corrupt or of an unknown version."""
+
+    pass
@@ -0,0 +1,236 @@
+# graph.py
+from array import array
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
+
+from .exceptions import GraphCycleError, NodeNotFoundError
+from .models import Edge, EdgesFromEndValue, EdgesToEndValue
+
+# Compressed adjacency: the arcs leaving node i are at positions
+# offsets[i]:offsets[i + 1] of targets (neighbor positions) and edges
+# (positions in CanvasGraph.edge_ids).
+Adjacency = Tuple[array, array, array]
+
+
+def edge_directions(edge: Edge) -> Tuple[bool, bool]:
+    """Whether an edge leads from ``fromNode`` to ``toNode`` and back.
+
+    An arrow at an end points into the node at that end. Per the JSON
+    Canvas spec ``toEnd`` defaults to an arrow and ``fromEnd`` to none.
+    """
+    return (
+        edge.toEnd is not EdgesToEndValue.NONE,
+        edge.fromEnd is EdgesFromEndValue.ARROW,
+    )
+
+
+def _compress(count: int, sources: List[int], targets: List[int], edges: List[int]) -> Adjacency:
+    offsets = array("q", bytes(8 * (count + 1)))
+    for source in sources:
+        offsets[source + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+    fill = offsets[:-1]
+    sorted_targets = array("q", bytes(8 * len(sources)))
+    sorted_edges = array("q", bytes(8 * len(sources)))
+    for source, target, edge in zip(sources, targets, edges):
+        position = fill[source]
+        sorted_targets[position] = target
+        sorted_edges[position] = edge
+        fill[source] = position + 1
+    return offsets, sorted_targets, sorted_edges
+
+
+class CanvasGraph:
+    """The edges of a canvas as a graph over its nodes.
+
+    This is a snapshot: node IDs are mapped to positions once and the arcs
+    are stored in compressed arrays, so traversals touch no node or edge
+    objects. Build a new graph after changing the canvas.
+
+    When ``directed`` is true, arrows decide which way an edge can be
+    followed: an edge with an arrow at one end leads towards that end, one
+    with arrows at both ends leads both ways, and one without arrows only
+    connects its nodes for ``connected_components``. When ``directed`` is
+    false every edge leads both ways. Edges with a missing endpoint are
+    left out.
+    """
+
+    def __init__(self, canvas, directed: bool = True):
+        self.directed = directed
+        self.node_ids: List[str] = list(canvas._node_index)
+        self._positions = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.edge_ids: List[str] = []
+        positions = self._positions
+        ends_a, ends_b = [], []
+        sources, targets, edges = [], [], []
+        for edge in canvas._edge_index.values():
+            a = positions.get(edge.fromNode)
+            b = positions.get(edge.toNode)
+            if a is None or b is None:
+                continue
+            e = len(self.edge_ids)
+            self.edge_ids.append(edge.id)
+            ends_a.append(a)
+            ends_b.append(b)
+            forward, backward = edge_directions(edge) if directed else (True, True)
+            if forward:
+                sources.append(a)
+                targets.append(b)
+                edges.append(e)
+            if backward:
+                sources.append(b)
+                targets.append(a)
+                edges.append(e)
+        self._ends = (array("q", ends_a), array("q", ends_b))
+        self._arcs: Adjacency = _compress(len(self.node_ids), sources, targets, edges)
+
+    def _position(self, node_id: str) -> int:
+        try:
+            return self._positions[node_id]
+        except KeyError:
+            raise NodeNotFoundError(f"Node with id {node_id} does not exist.") from None
+
+    def successors(self, node_id: str) -> List[str]:
+        """IDs of the nodes one edge away from the given node, following
+        the direction of the edges."""
+        offsets, targets, _ = self._arcs
+        i = self._position(node_id)
+        return [self.node_ids[j] for j in targets[offsets[i] : offsets[i + 1]]]
+
+    def bfs(self, start: str) -> Iterator[str]:
+        """IDs of the nodes reachable from ``start`` in breadth-first order."""
+        offsets, targets, _ = self._arcs
+        i = self._position(start)
+        seen = bytearray(len(self.node_ids))
+        seen[i] = 1
+        queue = deque((i,))
+        while queue:
+            i = queue.popleft()
+            yield self.node_ids[i]
+            for j in targets[offsets[i] : offsets[i + 1]]:
+                if not seen[j]:
+                    seen[j] = 1
+                    queue.append(j)
+
+    def dfs(self, start: str) -> Iterator[str]:
+        """IDs of the nodes reachable from ``start`` in depth-first preorder."""
+        offsets, targets, _ = self._arcs
+        i = self._position(start)
+        seen = bytearray(len(self.node_ids))
+        seen[i] = 1
+        yield self.node_ids[i]
+        path, cursors = [i], [offsets[i]]
+        while path:
+            i, k = path[-1], cursors[-1]
+            if k == offsets[i + 1]:
+                path.pop()
+                cursors.pop()
+                continue
+            cursors[-1] = k + 1
+            j = targets[k]
+            if not seen[j]:
+                seen[j] = 1
+                yield self.node_ids[j]
+                path.append(j)
+                cursors.append(offsets[j])
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """Node IDs along a path with the fewest edges from ``source`` to
+        ``target``, both included, or None if ``target`` is unreachable."""
+        offsets, targets, _ = self._arcs
+        start, goal = self._position(source), self._position(target)
+        parents = array("q", [-1]) * len(self.node_ids)
+        parents[start] = start
+        queue = deque((start,))
+        while queue and parents[goal] < 0:
+            i = queue.popleft()
+            for j in targets[offsets[i] : offsets[i + 1]]:
+                if parents[j] < 0:
+                    parents[j] = i
+                    queue.append(j)
+        if parents[goal] < 0:
+            return None
+        path = [goal]
+        while path[-1] != start:
+            path.append(parents[path[-1]])
+        return [self.node_ids[i] for i in reversed(path)]
+
+    def connected_components(self) -> List[List[str]]:
+        """Groups of node IDs linked by edges in either direction, including
+        edges without arrows. Isolated nodes form their own component."""
+        parents = array("q", range(len(self.node_ids)))
+
+        def root(i: int) -> int:
+            while parents[i] != i:
+                parents[i] = i = parents[parents[i]]
+            return i
+
+        for a, b in zip(*self._ends):
+            a, b = root(a), root(b)
+            if a != b:
+                parents[max(a, b)] = min(a, b)
+        components = {}
+        for i, node_id in enumerate(self.node_ids):
+            components.setdefault(root(i), []).append(node_id)
+        return list(components.values())
+
+    def find_cycle(self) -> Optional[List[str]]:
+        """Node IDs along a cycle, without repeating the first one, or None.
+
+        In an undirected graph a single edge is not a cycle, but two edges
+        between the same nodes are.
+        """
+        offsets, targets, edges = self._arcs
+        # 0: not visited yet, 1: on the current path, 2: done.
+        state = bytearray(len(self.node_ids))
+        for root in range(len(self.node_ids)):
+            if state[root]:
+                continue
+            state[root] = 1
+            path, cursors, entries = [root], [offsets[root]], [-1]
+            while path:
+                i, k = path[-1], cursors[-1]
+                if k == offsets[i + 1]:
+                    state[i] = 2
+                    path.pop()
+                    cursors.pop()
+                    entries.pop()
+                    continue
+                cursors[-1] = k + 1
+                if not self.directed and edges[k] == entries[-1]:
+                    continue
+                j = targets[k]
+                if state[j] == 1:
+                    return [self.node_ids[n] for n in path[path.index(j) :]]
+                if not state[j]:
+                    state[j] = 1
+                    path.append(j)
+                    cursors.append(offsets[j])
+                    entries.append(edges[k])
+        return None
+
+    def has_cycle(self) -> bool:
+        return self.find_cycle() is not None
+
+    def topological_sort(self) -> List[str]:
+        """Node IDs ordered so that every edge leads to a later node.
+
+        Raises GraphCycleError if the directed edges form a cycle.
+        """
+        offsets, targets, _ = self._arcs
+        indegree = array("q", bytes(8 * len(self.node_ids)))
+        for j in targets:
+            indegree[j] += 1
+        queue = deque(i for i, degree in enumerate(indegree) if not degree)
+        order = []
+        while queue:
+            i = queue.popleft()
+            order.append(self.node_ids[i])
+            for j in targets[offsets[i] : offsets[i + 1]]:
+                indegree[j] -= 1
+                if not indegree[j]:
+                    queue.append(j)
+        if len(order) < len(self.node_ids):
+            raise GraphCycleError("The edges of the canvas form a cycle.")
+        return order
@@ -0,0 +1,154 @@
+# groups.py
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import GenericNode, GroupNode
+from .spatial import SpatialIndex
+
+
+def _box(node: GenericNode) -> Tuple[int, int, int, int]:
+    return (node.x, node.y, node.x + node.width, node.y + node.height)
+
+
+def _encloses(group: GroupNode, node: GenericNode) -> bool:
+    """Whether ``node``, already known to lie inside ``group``'s bounds,
+    belongs to it.
+
+    Two groups with identical bounds cannot both contain each other: the one
+    with the larger id is treated as the outer group.
+    """
+    if node is group:
+        return False
+    if isinstance(node, GroupNode) and _box(node) == _box(group):
+        return group.id > node.id
+    return True
+
+
+def _rank(group: GroupNode) -> Tuple[int, str]:
+    # Innermost enclosing group first: smallest area, then smallest id.
+    return (group.width * group.height, group.id)
+
+
+class GroupHierarchy:
+    """Which nodes lie inside which groups, kept up to date incrementally.
+
+    Containment is geometric: a node belongs to every group whose bounds
+    fully enclose it. Its parent is the innermost of those groups, which
+    gives the tree returned by ``children``; ``descendants`` returns every
+    node inside a group regardless of how overlapping groups nest.
+
+    Candidates come from the spatial index, so building costs roughly the
+    number of (group, node) overlaps rather than groups times nodes, and an
+    update only touches the groups around the node that changed.
+    """
+
+    def __init__(self, spatial: SpatialIndex, nodes: Iterable[GenericNode] = ()):
+        self._spatial = spatial
+        self._contents: Dict[str, Dict[str, GenericNode]] = {}
+        self._containers: Dict[str, Dict[str, GroupNode]] = {}
+        self._parents: Dict[str, GroupNode] = {}
+        self._children: Dict[str, Dict[str, GenericNode]] = {}
+        nodes = list(nodes)
+        for node in nodes:
+            if isinstance(node, GroupNode):
+                self._fill_group(node)
+        for node in nodes:
+            self._reparent(node)
+
+    def _link(self, group: GroupNode, node: GenericNode) -> None:
+        self._contents.setdefault(group.id, {})[node.id] = node
+        self._containers.setdefault(node.id, {})[group.id] = group
+
+    def _unlink(self, group_id: str, node_id: str) -> None:
+        for index, key, other in (
+            (self._contents, group_id, node_id),
+            (self._containers, node_id, group_id),
+        ):
+            members = index.get(key)
+            if members is not None:
+                members.pop(other, None)
+                if not members:
+                    del index[key]
+
+    def _fill_group(self, group: GroupNode) -> None:
+        contents = self._contents.setdefault(group.id, {})
+        containers = self._containers
+        for node in self._spatial.query_within(*_box(group)):
+            if _encloses(group, node):
+                contents[node.id] = node
+                node_containers = containers.get(node.id)
+                if node_containers is None:
+                    node_containers = containers[node.id] = {}
+                node_containers[group.id] = group
+        if not contents:
+            del self._contents[group.id]
+
+    def _reparent(self, node: GenericNode) -> None:
+        old_parent = self._parents.pop(node.id, None)
+        if old_parent is not None:
+            self._unlink_child(old_parent.id, node.id)
+        containers = self._containers.get(node.id)
+        if containers:
+            parent = min(containers.values(), key=_rank)
+            self._parents[node.id] = parent
+            self._children.setdefault(parent.id, {})[node.id] = node
+
+    def _unlink_child(self, parent_id: str, node_id: str) -> None:
+        children = self._children.get(parent_id)
+        if children is not None:
+            children.pop(node_id, None)
+            if not children:
+                del self._children[parent_id]
+
+    def add(self, node: GenericNode) -> None:
+        """Place a node that is already in the spatial index."""
+        x0, y0, x1, y1 = _box(node)
+        for candidate in self._spatial.query_rect(x0, y0, x1, y1):
+            if (
+                isinstance(candidate, GroupNode)
+                and candidate.x <= x0
+                and candidate.y <= y0
+                and x1 <= candidate.x + candidate.width
+                and y1 <= candidate.y + candidate.height
+                and _encloses(candidate, node)
+            ):
+                self._link(candidate, node)
+        if isinstance(node, GroupNode):
+            self._fill_group(node)
+            rank = _rank(node)
+            for member in self._contents.get(node.id, {}).values():
+                parent = self._parents.get(member.id)
+                if parent is None or rank < _rank(parent):
+                    self._reparent(member)
+        self._reparent(node)
+
+    def remove(self, node_id: str) -> None:
+        for group_id in list(self._containers.get(node_id, ())):
+            self._unlink(group_id, node_id)
+        parent = self._parents.pop(node_id, None)
+        if parent is not None:
+            self._unlink_child(parent.id, node_id)
+        members = list(self._contents.get(node_id, {}).values())
+        for member in members:
+            self._unlink(node_id, member.id)
+        orphans = self._children.pop(node_id, {})
+        for member in orphans.values():
+            self._parents.pop(member.id, None)
+            self._reparent(member)
+
+    def update(self, node: GenericNode, old_id: Optional[str] = None) -> None:
+        """Re-place a node after it moved, was resized or changed id."""
+        self.remove(node.id if old_id is None else old_id)
+        self.add(node)
+
+    def parent(self, node_id: str) -> Optional[GroupNode]:
+        return self._parents.get(node_id)
+
+    def children(self, group_id: str) -> List[GenericNode]:
+        return list(self._children.get(group_id, {}).values())
+
+    def descendants(self, group_id: str) -> List[GenericNode]:
+        return list(self._contents.get(group_id, {}).values())
+
+    def enclosing_groups(self, node_id: str) -> List[GroupNode]:
+        """Every group enclosing the node, innermost first."""
+        return sorted(self._containers.get(node_id, {}).values(), key=_rank)
@@ -1,15 +1,36 @@
 # jsoncanvas.py
+import os
+import sys
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import partial
+from time import perf_counter
 from .models import (
     Edge,
-    NodeType,
     GenericNode,
     TextNode,
     FileNode,
     LinkNode,
     GroupNode,
+    edge_from_dict,
+    node_from_dict,
+    ObserverRef,
+    observe_all,
+    unobserve_all,
+)
+from typing import (
+    Callable,
+    List,
+    Dict,
+    Any,
+    IO,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
 )
-from typing import List, Dict, Any, Tuple
 from .exceptions import (
     InvalidNodeTypeError,
     InvalidEdgeAttributeError,
@@ -22,9 +43,81 @@ from .exceptions import (
     InvalidJsonError,
 )
 from json import dumps, loads, JSONDecodeError
-from .encoder import CustomEncoder
+# Metrics are checked on every load, export and validation; the module is
+# small and only needs contextlib, which is imported here anyway. The other
+# feature modules are imported by the methods that use them.
+from . import metrics as _metrics
+
+from .validate import (
+    ValidationIssue,
+    edge_issues,
+    node_issues,
+    validate_node,
+    validate_edge,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from .changes import Patch
+    from .graph import CanvasGraph
+    from .groups import GroupHierarchy
+    from .search import SearchIndex
+    from .spatial import SpatialIndex
+    from .stream import Source
+
+_GEOMETRY_FIELDS = frozenset(("x", "y", "width", "height"))
+# Fields the ID index and the adjacency are keyed by.
+_LINK_FIELDS = frozenset(("id", "fromNode", "toNode"))
+
+
+def _observed_build(
+    build: Callable[[Dict[str, Any]], Any], observer: ObserverRef, data: Dict[str, Any]
+) -> Any:
+    # The builder of a lazy canvas's lists: registers the canvas on each
+    # object as it is built.
+    obj = build(data)
+    if observer() is not None:
+        obj.add_observer(observer)
+    return obj
+
 
-from .validate import validate_node, validate_edge
+def _is_lazy(objects: Any) -> bool:
+    # Lazy lists only exist once the lazy module has been imported, so
+    # there is no need to import it just to check.
+    lazy = sys.modules.get(f"{__package__}.lazy")
+    return lazy is not None and isinstance(objects, lazy.LazyList)
+
+
+def _json_dicts(objects: Iterable[Any]) -> Iterable[Dict[str, Any]]:
+    if _is_lazy(objects):
+        return objects.json_dicts()
+    return (obj.to_json_dict() for obj in objects)
+
+
+@contextmanager
+def _replacing(file_path: str, mode: str, **kwargs: Any) -> Iterator[IO]:
+    """Open a temporary file next to ``file_path`` and move it into place
+    once the block completes; on failure it is removed instead."""
+    directory, name = os.path.split(os.path.abspath(file_path))
+    tmp_path = os.path.join(directory, f".{name}.{os.urandom(4).hex()}.tmp")
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+# Problems that Canvas.validate reports wrapped in CanvasValidationError.
+_CANVAS_ERRORS = (
+    InvalidNodeTypeError,
+    InvalidEdgeAttributeError,
+    OrphanEdgeError,
+    NodeIDConflictError,
+    EdgeIDConflictError,
+)
 
 
 @dataclass
@@ -32,125 +125,766 @@ class Canvas:
     nodes: List[GenericNode]
     edges: List[Edge]
 
+    # Derived state, created on demand.
+    _spatial = None
+    _groups = None
+    _search = None
+    _changes = None
+    # Removed nodes and edges still held by the underlying lists, keyed by
+    # id(); they are filtered out when the list is next read.
+    _stale_nodes = None
+    _stale_edges = None
+    # Nodes and edges added inside a batch() block, pending validation.
+    _batch = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Keep the indexes in sync whenever the node or edge list is replaced.
+        # In-place changes should go through add_*/remove_* so the indexes follow.
+        if name in ("nodes", "edges"):
+            self._assign(name, value, record=True)
+        else:
+            object.__setattr__(self, name, value)
+
+    def _assign(self, name: str, value: List[Any], record: bool) -> None:
+        kind = name[:-1]
+        lazy = _is_lazy(value)
+        # Observe every member, so the indexes follow direct assignments to
+        # IDs, edge endpoints, geometry and text.
+        observer = self.__dict__.get("_observer")
+        if observer is None:
+            observer = ObserverRef(self, set(_LINK_FIELDS))
+            object.__setattr__(self, "_observer", observer)
+        changes = self._changes if record else None
+        old_list = self.__dict__.get(f"_{kind}_list")
+        if old_list is not None:
+            if changes is not None:
+                for obj in self.__dict__[f"_{kind}_index"].values():
+                    changes.removed(kind, obj)
+            unobserve_all(
+                old_list.built() if _is_lazy(old_list) else old_list,
+                observer,
+            )
+        if lazy:
+            # Objects are observed as they are built.
+            value.build = partial(_observed_build, value.build, observer)
+            observe_all(value.built(), observer)
+        else:
+            observe_all(value, observer)
+        if changes is not None:
+            for obj in value:
+                changes.added(kind, obj)
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, f"_{kind}_list", value)
+        object.__setattr__(self, f"_stale_{name}", None)
+        if name == "nodes":
+            if lazy:
+                index = value.index_by_id()
+            else:
+                index = {node.id: node for node in value}
+            object.__setattr__(self, "_node_index", index)
+            object.__setattr__(self, "_nodes_unique", len(index) == len(value))
+            object.__setattr__(self, "_spatial", None)
+            object.__setattr__(self, "_groups", None)
+            object.__setattr__(self, "_search", None)
+        else:
+            object.__setattr__(self, "_search", None)
+            if lazy:
+                index = value.index_by_id()
+            else:
+                index = {edge.id: edge for edge in value}
+            object.__setattr__(self, "_edge_index", index)
+            object.__setattr__(self, "_edges_unique", len(index) == len(value))
+            if lazy:
+                # Linked on first use (see __getattr__), which builds every edge.
+                self.__dict__.pop("_outgoing", None)
+                self.__dict__.pop("_incoming", None)
+                return
+            object.__setattr__(self, "_outgoing", {})
+            object.__setattr__(self, "_incoming", {})
+            for edge in index.values():
+                self._link_edge(edge)
+
+    def __getattr__(self, name: str) -> Any:
+        # Removals leave the objects in the underlying list and hide the
+        # node/edge list; filter them out the next time it is read.
+        if name in ("nodes", "edges") and f"_{name[:-1]}_list" in self.__dict__:
+            return self._compact(name)
+        if name in ("_outgoing", "_incoming") and "_edge_index" in self.__dict__:
+            # The adjacency of a lazy canvas, built on first use.
+            object.__setattr__(self, "_outgoing", {})
+            object.__setattr__(self, "_incoming", {})
+            for edge in self._edge_index.values():
+                self._link_edge(edge)
+            return self.__dict__[name]
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Indexes and observer registrations are rebuilt on unpickling.
+        return {"nodes": self.nodes, "edges": self.edges}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.nodes = state["nodes"]
+        self.edges = state["edges"]
+
+    def _follow(self, names: Optional[Iterable[str]]) -> None:
+        # Have members report assignments to ``names`` too, or to every
+        # field if None. Fields are never unfollowed: a stray report only
+        # costs a lookup.
+        fields = self._observer.fields
+        if names is None:
+            self._observer.fields = None
+        elif fields is not None:
+            fields.update(names)
+
+    def _object_changed(self, obj: Any, name: str, old_value: Any) -> None:
+        kind = "edge" if isinstance(obj, Edge) else "node"
+        index = self._edge_index if kind == "edge" else self._node_index
+        old_id = old_value if name == "id" else obj.id
+        if index.get(old_id) is not obj:
+            return
+        if name == "id":
+            del index[old_id]
+            if obj.id in index:
+                # Two objects now share the ID, as when a document with
+                # duplicate IDs is loaded: the one renamed wins the index and
+                # validate() reports the conflict.
+                object.__setattr__(self, f"_{kind}s_unique", False)
+            index[obj.id] = obj
+        if self._changes is not None:
+            self._changes.updated(kind, obj, name, old_value)
+        if self._search is not None and (
+            name == "id" or name in self._search.field_names
+        ):
+            self._search.update(kind, obj, old_id)
+        if kind == "edge":
+            if name in ("id", "fromNode", "toNode"):
+                self._unlink_adjacency(
+                    old_id,
+                    old_value if name == "fromNode" else obj.fromNode,
+                    old_value if name == "toNode" else obj.toNode,
+                )
+                self._link_edge(obj)
+            return
+        if name != "id" and name not in _GEOMETRY_FIELDS:
+            return
+        if self._spatial is not None:
+            self._spatial.remove(old_id)
+            self._spatial.insert(obj)
+        if self._groups is not None:
+            self._groups.update(obj, old_id)
+
+    def _link_edge(self, edge: Edge) -> None:
+        self._outgoing.setdefault(edge.fromNode, {})[edge.id] = edge
+        self._incoming.setdefault(edge.toNode, {})[edge.id] = edge
+
+    def _unlink_adjacency(self, edge_id: str, from_node: str, to_node: str) -> None:
+        for adjacency, node_id in (
+            (self._outgoing, from_node),
+            (self._incoming, to_node),
+        ):
+            edges = adjacency.get(node_id)
+            if edges is not None and edges.pop(edge_id, None) is not None:
+                if not edges:
+                    del adjacency[node_id]
+
+    def _unlink_edge(self, edge: Edge) -> None:
+        if self._edge_index.get(edge.id) is edge:
+            del self._edge_index[edge.id]
+        self._unlink_adjacency(edge.id, edge.fromNode, edge.toNode)
+        if self._search is not None:
+            self._search.remove("edge", edge.id)
+        edge.remove_observer(self._observer)
+        if self._changes is not None:
+            self._changes.removed("edge", edge)
+
+    def _compact(self, name: str) -> List[Any]:
+        objects = self.__dict__[f"_{name[:-1]}_list"]
+        stale = self.__dict__.get(f"_stale_{name}")
+        if stale:
+            if _is_lazy(objects):
+                objects = objects.without(stale)
+            else:
+                objects = [obj for obj in objects if id(obj) not in stale]
+            object.__setattr__(self, f"_{name[:-1]}_list", objects)
+            object.__setattr__(self, f"_stale_{name}", None)
+        object.__setattr__(self, name, objects)
+        return objects
+
+    def _forget(self, name: str, removed: Iterable[Any]) -> None:
+        # Called after removed objects have left the index. Rather than
+        # filtering the list on every removal, mark them stale and hide the
+        # list until it is read, until half of it is stale outside a batch,
+        # or until the batch ends.
+        if not self.__dict__[f"_{name}_unique"]:
+            removed_ids = {obj.id for obj in removed}
+            objects = [obj for obj in getattr(self, name) if obj.id not in removed_ids]
+            self._assign(name, objects, record=False)
+            return
+        stale = self.__dict__.get(f"_stale_{name}")
+        if stale is None:
+            stale = {}
+            object.__setattr__(self, f"_stale_{name}", stale)
+        for obj in removed:
+            stale[id(obj)] = obj
+        self.__dict__.pop(name, None)
+        if self._batch is None and len(stale) > len(
+            self.__dict__[f"_{name[:-1]}_list"]
+        ) // 2:
+            self._compact(name)
+
+    def _append(self, name: str, added: List[Any]) -> None:
+        stale = self.__dict__.get(f"_stale_{name}")
+        if stale and any(id(obj) in stale for obj in added):
+            # A removed object coming back; drop its old entry first.
+            self._compact(name)
+        self.__dict__[f"_{name[:-1]}_list"].extend(added)
+
     def to_json(self) -> str:
-        return dumps(
+        metrics = _metrics.active
+        start = perf_counter() if metrics is not None else 0.0
+        nodes, edges = self.nodes, self.edges
+        json_str = dumps(
             {
-                "nodes": [node.to_dict() for node in self.nodes],
-                "edges": [edge.to_dict() for edge in self.edges],
-            },
-            cls=CustomEncoder,
+                "nodes": list(_json_dicts(nodes)),
+                "edges": list(_json_dicts(edges)),
+            }
         )
+        if metrics is not None:
+            metrics.record("encode", start, objects_encoded=len(nodes) + len(edges))
+        return json_str
 
     @staticmethod
-    def from_json(json_str: str) -> "Canvas":
+    def from_json(
+        json_str: str, validate: bool = True, lazy: bool = False
+    ) -> "Canvas":
+        """Create a canvas from a JSON string.
+
+        Pass ``validate=False`` for trusted input to skip per-object checks;
+        ``Canvas.validate()`` can then check the whole canvas in one pass.
+
+        With ``lazy=True`` nodes and edges are kept as parsed dicts and each
+        is built (and validated) the first time it is read. ``to_json`` and
+        ``export`` write the dicts of objects never read unchanged.
+        """
+        metrics = _metrics.active
         try:
+            start = perf_counter() if metrics is not None else 0.0
             canvas_dict = loads(json_str)
-            nodes = []
-            edges = []
-            for node in canvas_dict["nodes"]:
-                # if node.type == NodeType.TEXT:
-                if node["type"] == NodeType.TEXT.value:
-                    nodes.append(TextNode(**node))
-                # elif node.type == NodeType.FILE:
-                elif node["type"] == NodeType.FILE.value:
-                    nodes.append(FileNode(**node))
-                # elif node.type == NodeType.LINK:
-                elif node["type"] == NodeType.LINK.value:
-                    nodes.append(LinkNode(**node))
-                # elif node.type == NodeType.GROUP:
-                elif node["type"] == NodeType.GROUP.value:
-                    nodes.append(GroupNode(**node))
-                else:
-                    raise InvalidNodeTypeError(
-                        f"Invalid or unsupported node type.The node {node['id']} has an invalid or unsupported type {node['type']}."
-                    )
-            for edge in canvas_dict["edges"]:
-                edges.append(Edge(**edge))
-            return Canvas(nodes=nodes, edges=edges)
+            if metrics is not None:
+                start = metrics.record("parse", start)
+            if lazy:
+                from .lazy import LazyList
+
+                nodes = LazyList.from_dicts(
+                    canvas_dict["nodes"], partial(node_from_dict, validate=validate)
+                )
+                edges = LazyList.from_dicts(
+                    canvas_dict["edges"], partial(edge_from_dict, validate=validate)
+                )
+            else:
+                nodes = [
+                    node_from_dict(node, validate) for node in canvas_dict["nodes"]
+                ]
+                edges = [
+                    edge_from_dict(edge, validate) for edge in canvas_dict["edges"]
+                ]
+            canvas = Canvas(nodes=nodes, edges=edges)
+            if metrics is not None:
+                count = 0 if lazy else len(nodes) + len(edges)
+                metrics.record(
+                    "construct",
+                    start,
+                    objects_constructed=count,
+                    validations=count if validate else 0,
+                )
+            return canvas
         except JSONDecodeError as e:
             raise InvalidJsonError("Invalid or malformed JSON.") from e
 
-    def export(self, file_path: str) -> None:
-        with open(file_path, "w") as f:
-            f.write(self.to_json())
+    @staticmethod
+    def load(
+        source: "Source", chunk_size: Optional[int] = None, validate: bool = True
+    ) -> "Canvas":
+        """Load a canvas from a path or file object without reading it whole.
+
+        The file is read ``chunk_size`` characters at a time, by default
+        ``stream.CHUNK_SIZE``.
+        """
+        from .stream import CHUNK_SIZE, iterload
+
+        nodes = []
+        edges = []
+        for obj in iterload(source, chunk_size or CHUNK_SIZE, validate):
+            if isinstance(obj, Edge):
+                edges.append(obj)
+            else:
+                nodes.append(obj)
+        metrics = _metrics.active
+        if metrics is None:
+            return Canvas(nodes=nodes, edges=edges)
+        start = perf_counter()
+        canvas = Canvas(nodes=nodes, edges=edges)
+        metrics.record("construct", start)
+        return canvas
+
+    @staticmethod
+    async def aload(
+        source: "Source",
+        chunk_size: Optional[int] = None,
+        validate: bool = True,
+        executor: Optional["Executor"] = None,
+    ) -> "Canvas":
+        """Like ``load``, but reads and parses in ``executor`` (the event
+        loop's default thread pool if None) so the loop stays responsive."""
+        # Imported here: asyncio is costly to import and only needed here.
+        from .aio import run_blocking
+
+        return await run_blocking(
+            Canvas.load, source, chunk_size, validate, executor=executor
+        )
+
+    @staticmethod
+    def iterload(
+        source: "Source", chunk_size: Optional[int] = None, validate: bool = True
+    ) -> Iterator[Union[GenericNode, Edge]]:
+        """Lazily yield the nodes and edges of a canvas file in document order."""
+        from .stream import CHUNK_SIZE, iterload
+
+        return iterload(source, chunk_size or CHUNK_SIZE, validate)
+
+    def export(
+        self, file_path: str, indent: Optional[int] = None, compact: bool = False
+    ) -> None:
+        """Write the canvas to ``file_path`` incrementally.
+
+        The document is written to a temporary file next to ``file_path`` and
+        moved into place only once it is complete, so a failed export never
+        leaves a truncated canvas behind.
+        """
+        from .stream import dump
+
+        with _replacing(file_path, "x", encoding="utf-8") as f:
+            dump(self.nodes, self.edges, f, indent=indent, compact=compact)
+
+    async def aexport(
+        self,
+        file_path: str,
+        indent: Optional[int] = None,
+        compact: bool = False,
+        executor: Optional["Executor"] = None,
+    ) -> None:
+        """Like ``export``, but encodes and writes in ``executor`` (the event
+        loop's default thread pool if None). Leave the canvas unchanged until
+        the export has finished."""
+        from .aio import run_blocking
+
+        await run_blocking(self.export, file_path, indent, compact, executor=executor)
+
+    def to_binary(self, compress: bool = False) -> bytes:
+        """Encode the canvas in the compact binary format of ``binary.py``,
+        compressed with zlib if ``compress`` is set.
+
+        ``Canvas.from_binary`` restores a canvas with the same ``to_json``.
+        """
+        from . import binary
+
+        metrics = _metrics.active
+        start = perf_counter() if metrics is not None else 0.0
+        nodes, edges = self.nodes, self.edges
+        data = binary.encode(nodes, edges, compress)
+        if metrics is not None:
+            metrics.record("encode", start, objects_encoded=len(nodes) + len(edges))
+        return data
+
+    @staticmethod
+    def from_binary(data: bytes, validate: bool = True) -> "Canvas":
+        """Create a canvas from ``to_binary`` output.
 
-    def validate(self) -> bool:
+        Objects are built straight from the binary columns without per-object
+        checks; with ``validate=True`` the canvas is checked once afterwards
+        with ``validate()``. Corrupt data raises InvalidBinaryError.
+        """
+        from . import binary
+
+        metrics = _metrics.active
+        if metrics is None:
+            canvas = Canvas(*binary.decode(data))
+        else:
+            start = perf_counter()
+            blocks, table = binary.read_strings(data)
+            start = metrics.record("parse", start)
+            nodes, edges = binary.build_objects(blocks, table)
+            canvas = Canvas(nodes=nodes, edges=edges)
+            metrics.record(
+                "construct", start, objects_constructed=len(nodes) + len(edges)
+            )
+        if validate:
+            canvas.validate()
+        return canvas
+
+    def export_binary(self, file_path: str, compress: bool = False) -> None:
+        """Write ``to_binary`` output to ``file_path``, replacing it only
+        once the write is complete, like ``export``."""
+        data = self.to_binary(compress)
+        metrics = _metrics.active
+        start = perf_counter() if metrics is not None else 0.0
+        with _replacing(file_path, "xb") as f:
+            f.write(data)
+        if metrics is not None:
+            metrics.record("write", start, bytes_written=len(data))
+
+    @staticmethod
+    def load_binary(source: "Source", validate: bool = True) -> "Canvas":
+        """Load a canvas written by ``export_binary`` from a path or a binary
+        file object."""
+        metrics = _metrics.active
+        start = perf_counter() if metrics is not None else 0.0
+        if hasattr(source, "read"):
+            data = source.read()
+        else:
+            with open(source, "rb") as f:
+                data = f.read()
+        if metrics is not None:
+            metrics.record("read", start, bytes_read=len(data))
+        return Canvas.from_binary(data, validate)
+
+    def validate(self, collect: bool = False) -> Union[bool, List[ValidationIssue]]:
+        """Validate every node and edge, checking IDs and edge endpoints.
+
+        By default the first problem is raised. With ``collect=True`` every
+        problem is returned as a list of ``ValidationIssue`` instead, which
+        is empty for a valid canvas.
+        """
+        metrics = _metrics.active
+        if metrics is None:
+            return self._validate(collect)
+        start = perf_counter()
         try:
-            if not all(
-                isinstance(node, (TextNode, FileNode, LinkNode, GroupNode))
-                and validate_node(node)
-                for node in self.nodes
-            ):
-                raise InvalidNodeTypeError("Invalid or unsupported node type found.")
-            if not all(isinstance(edge, Edge) for edge in self.edges):
-                raise InvalidEdgeAttributeError(
-                    "Invalid or missing edge attribute found."
+            return self._validate(collect)
+        finally:
+            metrics.record(
+                "validate", start, validations=len(self.nodes) + len(self.edges)
+            )
+
+    def _validate(self, collect: bool) -> Union[bool, List[ValidationIssue]]:
+        issues = self.validation_issues()
+        if collect:
+            return list(issues)
+        for issue in issues:
+            if issue.error in _CANVAS_ERRORS:
+                raise CanvasValidationError(
+                    "Canvas validation failed."
+                ) from issue.exception()
+            raise issue.exception()
+        return True
+
+    def validation_issues(self) -> Iterator[ValidationIssue]:
+        node_ids = set()
+        for node in self.nodes:
+            if not isinstance(node, (TextNode, FileNode, LinkNode, GroupNode)):
+                yield ValidationIssue(
+                    InvalidNodeTypeError,
+                    getattr(node, "id", None),
+                    "type",
+                    "Invalid or unsupported node type found.",
                 )
-            for edge in self.edges:
-                validate_edge(edge)
-                if edge.fromNode not in [
-                    node.id for node in self.nodes
-                ] or edge.toNode not in [node.id for node in self.nodes]:
-                    raise OrphanEdgeError("Edge is orphan.")
-            return True
-        except (InvalidNodeTypeError, InvalidEdgeAttributeError, OrphanEdgeError) as e:
-            raise CanvasValidationError("Canvas validation failed.") from e
+                continue
+            yield from node_issues(node)
+            if not isinstance(node.id, str):
+                continue
+            if node.id in node_ids:
+                yield ValidationIssue(
+                    NodeIDConflictError,
+                    node.id,
+                    "id",
+                    f"Node with id {node.id} appears more than once.",
+                )
+            node_ids.add(node.id)
+
+        edge_ids = set()
+        for edge in self.edges:
+            yield from edge_issues(edge)
+            if not isinstance(edge, Edge):
+                continue
+            for field in ("fromNode", "toNode"):
+                if isinstance(getattr(edge, field), str) and getattr(
+                    edge, field
+                ) not in node_ids:
+                    yield ValidationIssue(
+                        OrphanEdgeError, edge.id, field, "Edge is orphan."
+                    )
+            if not isinstance(edge.id, str):
+                continue
+            if edge.id in edge_ids:
+                yield ValidationIssue(
+                    EdgeIDConflictError,
+                    edge.id,
+                    "id",
+                    f"Edge with id {edge.id} appears more than once.",
+                )
+            edge_ids.add(edge.id)
 
     def get_node(self, node_id: str) -> GenericNode:
-        for node in self.nodes:
-            if node.id == node_id:
-                return node
+        """The node with ``node_id``, looked up in the ID index. The index
+        follows assignments to ``node.id``; ``rename_node`` also re-points
+        the edges attached to the node."""
+        try:
+            return self._node_index[node_id]
+        except KeyError:
+            raise NodeNotFoundError("Node with id does not exist") from None
+
+    def get_edge(self, edge_id: str) -> Edge:
+        """The edge with ``edge_id``; see ``get_node``."""
+        try:
+            return self._edge_index[edge_id]
+        except KeyError:
+            raise EdgeNotFoundError("Edge with id does not exist") from None
+
+    def rename_node(self, node_id: str, new_id: str) -> None:
+        """Change a node's ID and point the edges attached to it at the new
+        ID, keeping the indexes current."""
+        node = self.get_node(node_id)
+        if new_id == node_id:
+            return
+        if new_id in self._node_index:
+            raise NodeIDConflictError("Node with id already exists")
+        edges = self.get_connections(node_id)
+        node.id = new_id
+        for edge in edges:
+            if edge.fromNode == node_id:
+                edge.fromNode = new_id
+            if edge.toNode == node_id:
+                edge.toNode = new_id
+
+    def rename_edge(self, edge_id: str, new_id: str) -> None:
+        """Change an edge's ID, keeping the indexes current."""
+        edge = self.get_edge(edge_id)
+        if new_id == edge_id:
+            return
+        if new_id in self._edge_index:
+            raise EdgeIDConflictError("Edge with id already exists")
+        edge.id = new_id
+
+    @contextmanager
+    def batch(self) -> Iterator["Canvas"]:
+        """Group many mutations together.
+
+        Inside the block, added nodes and edges are validated only when the
+        block exits, and the spatial index and group hierarchy are dropped
+        rather than updated, to be rebuilt in one pass on the next query.
+        Removed objects are filtered out of the node and edge lists once,
+        on exit, unless the lists are read inside the block. ID conflicts
+        are still checked immediately. If validation fails on exit, the
+        error is raised with the batch's changes left in place.
+        """
+        if self._batch is not None:
+            yield self
+            return
+        pending = ([], [])
+        object.__setattr__(self, "_batch", pending)
+        try:
+            yield self
+        finally:
+            object.__setattr__(self, "_batch", None)
+            for name in ("nodes", "edges"):
+                if self.__dict__.get(f"_stale_{name}"):
+                    self._compact(name)
+        nodes, edges = pending
+        for node in nodes:
+            if self._node_index.get(node.id) is node:
+                validate_node(node)
+        for edge in edges:
+            if self._edge_index.get(edge.id) is edge:
+                validate_edge(edge)
+
+    def _node_added(self, node: GenericNode) -> None:
+        if self._batch is not None:
+            self._batch[0].append(node)
+            self._drop_derived()
         else:
-            raise NodeNotFoundError("Node with id does not exist")
+            if self._spatial is not None:
+                self._spatial.insert(node)
+            if self._groups is not None:
+                self._groups.add(node)
+            if self._search is not None:
+                self._search.add("node", node)
+        node.add_observer(self._observer)
+        if self._changes is not None:
+            self._changes.added("node", node)
 
-    def get_edge(self, edge_id: str) -> GenericNode:
-        for edge in self.edges:
-            if edge.id == edge_id:
-                return edge
+    def _node_removed(self, node: GenericNode) -> None:
+        if self._batch is not None:
+            self._drop_derived()
         else:
-            raise EdgeNotFoundError("Edge with id does not exist")
+            if self._groups is not None:
+                self._groups.remove(node.id)
+            if self._spatial is not None:
+                self._spatial.remove(node.id)
+            if self._search is not None:
+                self._search.remove("node", node.id)
+        node.remove_observer(self._observer)
+        if self._changes is not None:
+            self._changes.removed("node", node)
+
+    def _edge_added(self, edge: Edge) -> None:
+        if self._batch is not None:
+            self._batch[1].append(edge)
+            object.__setattr__(self, "_search", None)
+        elif self._search is not None:
+            self._search.add("edge", edge)
+        self._link_edge(edge)
+        edge.add_observer(self._observer)
+        if self._changes is not None:
+            self._changes.added("edge", edge)
+
+    def _drop_derived(self) -> None:
+        object.__setattr__(self, "_spatial", None)
+        object.__setattr__(self, "_groups", None)
+        object.__setattr__(self, "_search", None)
 
     def add_node(self, node: GenericNode) -> None:
-        validate_node(node)
-        if node.id in [n.id for n in self.nodes]:
+        if self._batch is None:
+            validate_node(node)
+        if node.id in self._node_index:
             raise NodeIDConflictError("Node with id already exists")
-        self.nodes.append(node)
+        self._append("nodes", [node])
+        self._node_index[node.id] = node
+        self._node_added(node)
+
+    def add_nodes(self, nodes: Iterable[GenericNode]) -> None:
+        """Add several nodes. Nothing is added if any of them is invalid or
+        has an ID that is already taken."""
+        nodes = list(nodes)
+        if self._batch is None:
+            for node in nodes:
+                validate_node(node)
+        new_ids = {node.id for node in nodes}
+        if len(new_ids) != len(nodes) or not new_ids.isdisjoint(self._node_index):
+            raise NodeIDConflictError("Node with id already exists")
+        self._append("nodes", nodes)
+        self._node_index.update((node.id, node) for node in nodes)
+        if len(nodes) < 2:
+            for node in nodes:
+                self._node_added(node)
+            return
+        # Register the whole list in one pass; rebuilding the derived indexes
+        # on the next query beats inserting node by node.
+        if self._batch is not None:
+            self._batch[0].extend(nodes)
+        self._drop_derived()
+        observe_all(nodes, self._observer)
+        if self._changes is not None:
+            for node in nodes:
+                self._changes.added("node", node)
 
     def add_edge(self, edge: Edge) -> None:
-        validate_edge(edge)
-        if edge.id in [e.id for e in self.edges]:
+        if self._batch is None:
+            validate_edge(edge)
+        if edge.id in self._edge_index:
+            raise EdgeIDConflictError("Edge with id already exists")
+        self._append("edges", [edge])
+        self._edge_index[edge.id] = edge
+        self._edge_added(edge)
+
+    def add_edges(self, edges: Iterable[Edge]) -> None:
+        """Add several edges. Nothing is added if any of them is invalid or
+        has an ID that is already taken."""
+        edges = list(edges)
+        if self._batch is None:
+            for edge in edges:
+                validate_edge(edge)
+        new_ids = {edge.id for edge in edges}
+        if len(new_ids) != len(edges) or not new_ids.isdisjoint(self._edge_index):
             raise EdgeIDConflictError("Edge with id already exists")
-        self.edges.append(edge)
+        self._append("edges", edges)
+        self._edge_index.update((edge.id, edge) for edge in edges)
+        if len(edges) < 2:
+            for edge in edges:
+                self._edge_added(edge)
+            return
+        if self._batch is not None:
+            self._batch[1].extend(edges)
+        object.__setattr__(self, "_search", None)
+        # A lazy canvas links its edges from the index on first use, which
+        # now includes these.
+        if "_outgoing" in self.__dict__:
+            outgoing, incoming = self._outgoing, self._incoming
+            for edge in edges:
+                outgoing.setdefault(edge.fromNode, {})[edge.id] = edge
+                incoming.setdefault(edge.toNode, {})[edge.id] = edge
+        observe_all(edges, self._observer)
+        if self._changes is not None:
+            for edge in edges:
+                self._changes.added("edge", edge)
 
     def remove_node(self, node_id: str) -> bool:
-        node_exists = False
-        nodes = self.nodes
-        self.nodes = [node for node in self.nodes if node.id != node_id]
-        if len(self.nodes) != len(nodes):
-            node_exists = True
-        self.edges = [
-            edge
-            for edge in self.edges
-            if edge.fromNode != node_id and edge.toNode != node_id
-        ]
-        if not node_exists:
+        incident = {edge.id: edge for edge in self.get_connections(node_id)}
+        for edge in incident.values():
+            self._unlink_edge(edge)
+        if incident:
+            self._forget("edges", incident.values())
+        self._drop_node(node_id)
+        return True
+
+    def remove_nodes(self, node_ids: Iterable[str]) -> None:
+        """Remove several nodes and the edges attached to them. Nothing is
+        removed if any of the nodes does not exist."""
+        node_ids = dict.fromkeys(node_ids)
+        for node_id in node_ids:
+            if node_id not in self._node_index:
+                raise NodeNotFoundError(f"Node with id {node_id} does not exist.")
+        incident = {
+            edge.id: edge
+            for node_id in node_ids
+            for edge in self.get_connections(node_id)
+        }
+        for edge in incident.values():
+            self._unlink_edge(edge)
+        if incident:
+            self._forget("edges", incident.values())
+        if self._batch is None and len(node_ids) > 1:
+            self._drop_derived()
+        removed = [self._node_index.pop(node_id) for node_id in node_ids]
+        for node in removed:
+            self._node_removed(node)
+        if removed:
+            self._forget("nodes", removed)
+
+    def _drop_node(self, node_id: str) -> None:
+        # Removes a node alone; edges still pointing at it are left dangling.
+        node = self._node_index.pop(node_id, None)
+        if node is None:
             raise NodeNotFoundError(f"Node with id {node_id} does not exist.")
-        return node_exists
+        self._node_removed(node)
+        self._forget("nodes", [node])
 
     def remove_edge(self, edge_id: str) -> None:
-        edge_exists = False
-        edges = self.edges
-        self.edges = [edge for edge in self.edges if edge.id != edge_id]
-        if len(self.edges) != len(edges):
-            edge_exists = True
-        if not edge_exists:
+        edge = self._edge_index.get(edge_id)
+        if edge is None:
             raise EdgeNotFoundError(f"Edge with id {edge_id} does not exist.")
+        self._unlink_edge(edge)
+        self._forget("edges", [edge])
+
+    def remove_edges(self, edge_ids: Iterable[str]) -> None:
+        """Remove several edges. Nothing is removed if any of them does not
+        exist."""
+        edge_ids = dict.fromkeys(edge_ids)
+        for edge_id in edge_ids:
+            if edge_id not in self._edge_index:
+                raise EdgeNotFoundError(f"Edge with id {edge_id} does not exist.")
+        removed = [self._edge_index[edge_id] for edge_id in edge_ids]
+        for edge in removed:
+            self._unlink_edge(edge)
+        if removed:
+            self._forget("edges", removed)
 
     def get_connections(self, node_id: str) -> List[Edge]:
-        return [
-            edge
-            for edge in self.edges
-            if edge.fromNode == node_id or edge.toNode == node_id
+        outgoing = self._outgoing.get(node_id, {})
+        incoming = self._incoming.get(node_id, {})
+        return list(outgoing.values()) + [
+            edge for edge_id, edge in incoming.items() if edge_id not in outgoing
         ]
 
     def get_edge_nodes(self, edge_id: str) -> Tuple[GenericNode, GenericNode]:
@@ -160,10 +894,128 @@ class Canvas:
     def get_adjacent_nodes(self, node_id: str) -> List[GenericNode]:
         return [
             self.get_node(edge.fromNode)
-            for edge in self.edges
-            if edge.toNode == node_id
+            for edge in self._incoming.get(node_id, {}).values()
         ] + [
             self.get_node(edge.toNode)
-            for edge in self.edges
-            if edge.fromNode == node_id
+            for edge in self._outgoing.get(node_id, {}).values()
         ]
+
+    def graph(self, directed: bool = True) -> "CanvasGraph":
+        """A snapshot of the edges as a graph for traversals, shortest paths,
+        components, cycle detection and topological sorting."""
+        from .graph import CanvasGraph
+
+        return CanvasGraph(self, directed)
+
+    @property
+    def spatial_index(self) -> "SpatialIndex":
+        """Grid index over node geometry, built on first use.
+
+        Once built it follows add_node/remove_node and changes to node
+        positions and sizes.
+        """
+        if self._spatial is None:
+            from .spatial import SpatialIndex
+
+            self._follow(_GEOMETRY_FIELDS)
+            object.__setattr__(self, "_spatial", SpatialIndex(self._node_index.values()))
+        return self._spatial
+
+    def nodes_in_rect(
+        self, x: float, y: float, width: float, height: float
+    ) -> List[GenericNode]:
+        """Nodes overlapping or touching the given rectangle, in no particular order."""
+        return self.spatial_index.query_rect(x, y, x + width, y + height)
+
+    def nodes_at_point(self, x: float, y: float) -> List[GenericNode]:
+        """Nodes whose bounds contain the point, in no particular order."""
+        return self.spatial_index.query_point(x, y)
+
+    def nearest_nodes(self, x: float, y: float, count: int = 1) -> List[GenericNode]:
+        """The ``count`` nodes nearest to the point, measured to each node's edge."""
+        return self.spatial_index.nearest(x, y, count)
+
+    @property
+    def group_hierarchy(self) -> "GroupHierarchy":
+        """Which nodes sit inside which groups, built on first use and kept
+        up to date as nodes are added, removed, moved or resized."""
+        if self._groups is None:
+            from .groups import GroupHierarchy
+
+            object.__setattr__(
+                self,
+                "_groups",
+                GroupHierarchy(self.spatial_index, self._node_index.values()),
+            )
+        return self._groups
+
+    def parent_group(self, node_id: str) -> Optional[GroupNode]:
+        """The innermost group enclosing the node, or None."""
+        self.get_node(node_id)
+        return self.group_hierarchy.parent(node_id)
+
+    def group_children(self, group_id: str) -> List[GenericNode]:
+        """Nodes whose innermost enclosing group is the given group."""
+        self.get_node(group_id)
+        return self.group_hierarchy.children(group_id)
+
+    def group_descendants(self, group_id: str) -> List[GenericNode]:
+        """Every node lying entirely inside the given group."""
+        self.get_node(group_id)
+        return self.group_hierarchy.descendants(group_id)
+
+    def enclosing_groups(self, node_id: str) -> List[GroupNode]:
+        """Every group enclosing the node, innermost first."""
+        self.get_node(node_id)
+        return self.group_hierarchy.enclosing_groups(node_id)
+
+    @property
+    def search_index(self) -> "SearchIndex":
+        """Inverted index over node and edge text, built on first use and
+        kept up to date as nodes and edges are added, removed or edited."""
+        if self._search is None:
+            from .search import SearchIndex
+
+            self._follow(SearchIndex.field_names)
+            object.__setattr__(
+                self,
+                "_search",
+                SearchIndex(self._node_index.values(), self._edge_index.values()),
+            )
+        return self._search
+
+    def search(
+        self, query: str, match: str = "token"
+    ) -> List[Union[GenericNode, Edge]]:
+        """Nodes and edges whose text, label, file path or URL matches
+        ``query``; ``match`` is ``"token"``, ``"prefix"`` or ``"substring"``.
+        See ``SearchIndex.search``."""
+        return self.search_index.search(query, match)
+
+    def track_changes(self) -> None:
+        """Start recording node and edge changes for ``make_patch``."""
+        if self._changes is None:
+            from .changes import ChangeLog
+
+            self._follow(None)
+            object.__setattr__(self, "_changes", ChangeLog())
+
+    def make_patch(self, clear: bool = False) -> "Patch":
+        """Net changes since tracking started (or was last cleared) as a
+        compact, JSON-serializable list of operations for ``apply_patch``."""
+        if self._changes is None:
+            return []
+        patch = self._changes.make_patch()
+        if clear:
+            self._changes.clear()
+        return patch
+
+    def clear_changes(self) -> None:
+        if self._changes is not None:
+            self._changes.clear()
+
+    def apply_patch(self, patch: "Patch", validate: bool = True) -> None:
+        """Apply a patch made by ``make_patch`` on another canvas."""
+        from .changes import apply_patch
+
+        apply_patch(self, patch, validate)
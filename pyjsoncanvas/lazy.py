@@ -0,0 +1,201 @@
+# lazy.py
+from collections.abc import MutableMapping, MutableSequence
+from typing import Any, Callable, Container, Dict, Iterable, Iterator, List
+
+# Builds a node or edge from its parsed JSON dict.
+Builder = Callable[[Dict[str, Any]], Any]
+
+
+class _Raw:
+    """A node or edge still held as its parsed JSON dict. The list and the
+    index of a lazy canvas share these, so whichever builds the object
+    first, both end up with the same one."""
+
+    __slots__ = ("data", "obj")
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.obj = None
+
+
+def _resolve(entry: Any, build: Builder) -> Any:
+    if type(entry) is not _Raw:
+        return entry
+    obj = entry.obj
+    if obj is None:
+        obj = entry.obj = build(entry.data)
+        entry.data = None
+    return obj
+
+
+def _built(entries: Iterable[Any]) -> Iterator[Any]:
+    for entry in entries:
+        if type(entry) is _Raw:
+            entry = entry.obj
+            if entry is None:
+                continue
+        yield entry
+
+
+class LazyList(MutableSequence):
+    """A list of nodes or edges that builds each object from its parsed JSON
+    dict the first time it is read, and keeps it."""
+
+    def __init__(self, entries: List[Any], build: Builder):
+        self._entries = entries
+        self.build = build
+
+    @classmethod
+    def from_dicts(cls, dicts: Iterable[Any], build: Builder) -> "LazyList":
+        # Entries without a string ID could not be indexed without building
+        # them, so they are built right away.
+        return cls(
+            [
+                _Raw(data)
+                if type(data) is dict and type(data.get("id")) is str
+                else build(data)
+                for data in dicts
+            ],
+            build,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, i):
+        entries = self._entries
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(entries)))]
+        entry = entries[i]
+        if type(entry) is not _Raw:
+            return entry
+        obj = entries[i] = _resolve(entry, self.build)
+        return obj
+
+    def __setitem__(self, i, value) -> None:
+        self._entries[i] = value
+
+    def __delitem__(self, i) -> None:
+        del self._entries[i]
+
+    def insert(self, i: int, value: Any) -> None:
+        self._entries.insert(i, value)
+
+    def append(self, value: Any) -> None:
+        self._entries.append(value)
+
+    def extend(self, values: Iterable[Any]) -> None:
+        self._entries.extend(values)
+
+    def __iter__(self) -> Iterator[Any]:
+        entries, build = self._entries, self.build
+        i = 0
+        while i < len(entries):
+            entry = entries[i]
+            if type(entry) is _Raw:
+                entry = entries[i] = _resolve(entry, build)
+            yield entry
+            i += 1
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, LazyList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def pending(self) -> int:
+        """How many entries have not been built yet."""
+        return sum(
+            1 for entry in self._entries if type(entry) is _Raw and entry.obj is None
+        )
+
+    def built(self) -> Iterator[Any]:
+        """The objects built so far, without building the others."""
+        return _built(self._entries)
+
+    def json_dicts(self) -> Iterator[Dict[str, Any]]:
+        """The JSON dict of every entry; entries never built are passed
+        through as they were parsed."""
+        for entry in self._entries:
+            if type(entry) is _Raw:
+                if entry.obj is None:
+                    yield entry.data
+                    continue
+                entry = entry.obj
+            yield entry.to_json_dict()
+
+    def without(self, removed: Container[int]) -> "LazyList":
+        """A copy without the entries whose objects' ``id()`` is in
+        ``removed``. Removed entries have always been built."""
+        return LazyList(
+            [
+                entry
+                for entry in self._entries
+                if id(entry.obj if type(entry) is _Raw else entry) not in removed
+            ],
+            self.build,
+        )
+
+    def index_by_id(self) -> "LazyIndex":
+        """An ID index sharing this list's entries; later duplicates win, as
+        in the index of a regular canvas."""
+        return LazyIndex(
+            {
+                (entry.obj.id if entry.obj is not None else entry.data["id"])
+                if type(entry) is _Raw
+                else entry.id: entry
+                for entry in self._entries
+            },
+            self.build,
+        )
+
+
+class LazyIndex(MutableMapping):
+    """The ID index of a LazyList. Membership tests and key iteration use
+    the IDs alone; reading a value builds that object."""
+
+    def __init__(self, entries: Dict[str, Any], build: Builder):
+        self._entries = entries
+        self.build = build
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self._entries[key]
+        if type(entry) is not _Raw:
+            return entry
+        obj = self._entries[key] = _resolve(entry, self.build)
+        return obj
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._entries:
+            return self[key]
+        return default
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._entries[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def built(self) -> Iterator[Any]:
+        """The objects built so far, without building the others."""
+        return _built(self._entries.values())
+
+
+def json_dicts(objects: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    if isinstance(objects, LazyList):
+        return objects.json_dicts()
+    return (obj.to_json_dict() for obj in objects)
@@ -0,0 +1,103 @@
+# metrics.py
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Dict, Iterator, Optional
+
+# Called as callback(phase, seconds, counts) each time a phase is recorded.
+PhaseCallback = Callable[[str, float, Dict[str, int]], None]
+
+PHASES = ("read", "parse", "construct", "validate", "encode", "write")
+COUNTERS = (
+    "objects_constructed",
+    "validations",
+    "objects_encoded",
+    "bytes_read",
+    "bytes_written",
+)
+
+
+class Metrics:
+    """Time spent per phase and running counters for canvas I/O.
+
+    Phases are ``read`` and ``write`` (file I/O), ``parse`` (JSON text to
+    dicts), ``construct`` (dicts to nodes, edges and the canvas, including
+    per-object checks when loading with ``validate=True``), ``validate``
+    (``Canvas.validate``) and ``encode`` (objects to JSON text). ``seconds``
+    and ``calls`` are keyed by phase, ``counters`` by the names in
+    ``COUNTERS``; byte counts are UTF-8 encoded sizes.
+    """
+
+    def __init__(self, callback: Optional[PhaseCallback] = None):
+        self.callback = callback
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+
+    def add(self, phase: str, seconds: float, **counts: int) -> None:
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        counters = self.counters
+        for name, count in counts.items():
+            counters[name] = counters.get(name, 0) + count
+        if self.callback is not None:
+            self.callback(phase, seconds, counts)
+
+    def record(self, phase: str, start: float, **counts: int) -> float:
+        """Add the time since ``start`` to ``phase`` and return the current
+        time, so consecutive phases can be chained."""
+        end = perf_counter()
+        self.add(phase, end - start, **counts)
+        return end
+
+    def reset(self) -> None:
+        self.seconds.clear()
+        self.calls.clear()
+        self.counters.clear()
+
+    def as_dict(self) -> Dict[str, Dict]:
+        return {
+            "seconds": dict(self.seconds),
+            "calls": dict(self.calls),
+            "counters": dict(self.counters),
+        }
+
+    def __repr__(self) -> str:
+        phases = ", ".join(f"{phase}={s:.4f}s" for phase, s in self.seconds.items())
+        counters = ", ".join(f"{name}={n}" for name, n in self.counters.items())
+        return f"Metrics({phases}; {counters})"
+
+
+# The Metrics being recorded into, or None. Instrumented code reads this
+# once per call and skips all bookkeeping when it is None.
+active: Optional[Metrics] = None
+
+
+def enable_metrics(callback: Optional[PhaseCallback] = None) -> Metrics:
+    """Start recording into a new Metrics object and return it.
+
+    Recording is process-wide: loads and exports on any thread, including
+    ``aload``/``aexport``, add to the same object. Work done in the worker
+    processes of ``load_many`` is not recorded.
+    """
+    global active
+    active = Metrics(callback)
+    return active
+
+
+def disable_metrics() -> Optional[Metrics]:
+    """Stop recording and return what was recorded, if anything."""
+    global active
+    metrics, active = active, None
+    return metrics
+
+
+@contextmanager
+def collect_metrics(callback: Optional[PhaseCallback] = None) -> Iterator[Metrics]:
+    """Record metrics for the duration of a ``with`` block."""
+    global active
+    previous = active
+    metrics = active = Metrics(callback)
+    try:
+        yield metrics
+    finally:
+        active = previous
@@ -1,11 +1,18 @@
 # models.py
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional, Set
 from dataclasses import dataclass
 from enum import Enum
-from .exceptions import InvalidColorValueError
-import uuid
+from .exceptions import InvalidColorValueError, InvalidNodeTypeError
+import os
+import sys
+import weakref
 from dataclasses import field
-from . import validate_node, validate_edge
+
+
+def _new_id() -> str:
+    """A random 16-digit hex ID for objects created without one."""
+    # As random as uuid4().hex[:16], without importing uuid and platform.
+    return os.urandom(8).hex()
 
 
 class ColorPreset(Enum):
@@ -22,25 +29,84 @@ class PresetOrHex(Enum):
     HEX = 2
 
 
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+_PRESET_NUMBERS = frozenset(preset.value for preset in ColorPreset)
+
+
 def validate_hex_code(hexcode):
-    return len(hexcode) == 6 and all(
-        c.isdigit() or c.lower() in "abcdef" for c in hexcode
-    )
+    return len(hexcode) == 6 and _HEX_DIGITS.issuperset(hexcode)
+
+
+def _make_color(color: str, preset_or_hex: PresetOrHex) -> "Color":
+    instance = object.__new__(Color)
+    object.__setattr__(instance, "color", color)
+    object.__setattr__(instance, "preset_or_hex", preset_or_hex)
+    return instance
 
 
 class Color:
-    def __init__(self, color: str):
+    """A preset number or ``#rrggbb`` hex color.
+
+    Colors are immutable and interned: ``Color(value)`` returns the same
+    instance for the same string, so they repeat cheaply across a canvas.
+    As there is only ever one instance per value, the default identity
+    comparison and hash already compare by value, at C speed.
+    """
+
+    __slots__ = ("color", "preset_or_hex")
+
+    def __new__(cls, color: str) -> "Color":
+        interned = _interned_colors.get(color)
+        if interned is not None:
+            return interned
         if color.startswith("#"):
             if not validate_hex_code(color[1:]):
                 raise InvalidColorValueError("Invalid hex code.")
+            preset_or_hex = PresetOrHex.HEX
         # check if the color is one of the integer values of the ColorPreset enum
         elif color.isdigit():
-            if int(color) not in [color.value for color in ColorPreset]:
+            if int(color) not in _PRESET_NUMBERS:
                 raise InvalidColorValueError("Invalid color preset.")
+            preset_or_hex = PresetOrHex.PRESET
         else:
             raise InvalidColorValueError("Invalid color value.")
-        self.color = color
-        self.preset_or_hex = PresetOrHex.PRESET if color.isdigit() else PresetOrHex.HEX
+        interned = _interned_colors[color] = _make_color(color, preset_or_hex)
+        return interned
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Color objects are immutable.")
+
+    def __repr__(self) -> str:
+        return f"Color({self.color!r})"
+
+    def __reduce__(self):
+        return _trusted_color, (self.color,)
+
+
+# Colors repeat heavily across a canvas; every Color built from the same
+# string is the same object. The presets are created up front. Invalid
+# values let through by trusted loading are interned separately so that
+# Color() keeps rejecting them.
+_interned_colors: Dict[str, Color] = {}
+_unchecked_colors: Dict[str, Color] = {}
+for _preset in ColorPreset:
+    Color(str(_preset.value))
+
+
+def intern_color(color: str) -> Color:
+    return Color(color)
+
+
+def color_error(color: Color) -> Optional[str]:
+    """The message ``Color()`` rejects the value of ``color`` with, or None
+    if it is valid. Trusted loading wraps invalid values unchecked."""
+    if _interned_colors.get(color.color) is color:
+        return None
+    try:
+        Color(color.color)
+    except InvalidColorValueError as e:
+        return str(e)
+    return None
 
 
 class NodeType(Enum):
@@ -80,8 +146,179 @@ class GroupNodeBackgroundStyle(Enum):
     REPEAT = "repeat"
 
 
-@dataclass
-class Edge:
+class ObserverRef(weakref.ref):
+    """A weak reference to an observer, with the names of the fields it
+    follows (None for every field). Assignments to other fields are not
+    reported to it. ``fields`` may change while the reference is
+    registered; all objects holding it see the change."""
+
+    __slots__ = ("fields",)
+
+    def __new__(cls, observer: Any, fields: Optional[Set[str]]) -> "ObserverRef":
+        return super().__new__(cls, observer, _observer_collected)
+
+    def __init__(self, observer: Any, fields: Optional[Set[str]]):
+        super().__init__(observer, _observer_collected)
+        self.fields = fields
+
+
+def _observer_collected(ref: ObserverRef) -> None:
+    # Route the next assignment on each object through the full hook, which
+    # drops the dead reference.
+    ref.fields = None
+
+
+class Observable:
+    """Base for model objects that can report attribute changes.
+
+    Observers (the canvases holding the object) are registered with
+    ``add_observer`` through an ``ObserverRef`` and get
+    ``_object_changed(obj, name, old_value)`` after assignments to the
+    fields they follow. While an object has observers its class is swapped
+    for a subclass with the same slots that adds the change hook (see
+    ``_observed_class``), so assignment and construction cost nothing extra
+    for all other objects.
+    """
+
+    __slots__ = ("_observers",)
+
+    def add_observer(self, ref: ObserverRef) -> None:
+        observers = getattr(self, "_observers", ())
+        if any(other is ref for other in observers):
+            return
+        _set_observer_slot(self, observers + (ref,))
+        cls = type(self)
+        if cls not in _base_classes:
+            _set_class(self, _observed_class(cls))
+
+    def remove_observer(self, ref: ObserverRef) -> None:
+        observers = getattr(self, "_observers", ())
+        _set_observers(
+            self,
+            tuple(
+                other
+                for other in observers
+                if other is not ref and other() is not None
+            ),
+        )
+
+
+def observe_all(objects: Iterable[Observable], ref: ObserverRef) -> None:
+    """``add_observer`` on many objects, as when they join a canvas."""
+    single = (ref,)
+    observed_classes, set_observers, set_class = (
+        _observed_classes,
+        _set_observer_slot,
+        _set_class,
+    )
+    for obj in objects:
+        observed = observed_classes.get(type(obj))
+        if observed is None:
+            obj.add_observer(ref)
+        else:
+            # A model class instance has no observers; every one of them
+            # can share the same one-element tuple.
+            set_observers(obj, single)
+            set_class(obj, observed)
+
+
+def unobserve_all(objects: Iterable[Observable], ref: ObserverRef) -> None:
+    """``remove_observer`` on many objects."""
+    for obj in objects:
+        observers = getattr(obj, "_observers", ())
+        if len(observers) == 1 and observers[0] is ref:
+            _set_observers(obj, ())
+        elif observers:
+            obj.remove_observer(ref)
+
+
+def _set_observers(obj: Observable, observers: tuple) -> None:
+    _set_observer_slot(obj, observers)
+    if not observers:
+        base = _base_classes.get(type(obj))
+        if base is not None:
+            _set_class(obj, base)
+
+
+def _notifying_setattr(self, name: str, value: Any) -> None:
+    observers = getattr(self, "_observers", ())
+    for ref in observers:
+        fields = ref.fields
+        if fields is None or name in fields:
+            break
+    else:
+        # No observer follows this field.
+        _object_setattr(self, name, value)
+        if not observers:
+            # Created as an instance of the observed class; drop the hook.
+            _set_observers(self, ())
+        return
+    old_value = getattr(self, name, None)
+    _object_setattr(self, name, value)
+    unused = False
+    for ref in observers:
+        observer = ref()
+        if observer is None:
+            unused = True
+        elif ref.fields is None or name in ref.fields:
+            observer._object_changed(self, name, old_value)
+    if unused:
+        # An observer was garbage collected; drop the hook if unused.
+        _set_observers(self, tuple(ref for ref in observers if ref() is not None))
+
+
+def _reduce_as_base(self, protocol: int):
+    # Copies and pickles of an observed object are plain model objects.
+    state, slots = self.__getstate__()
+    slots = {name: value for name, value in slots.items() if name != "_observers"}
+    return (object.__new__, (_base_class(self),), (state, slots))
+
+
+# Model class -> its observed subclass, and back.
+_observed_classes: Dict[type, type] = {}
+_base_classes: Dict[type, type] = {}
+# Set through the descriptors directly: object.__setattr__ is several times
+# slower on these classes, and observe_all runs for every canvas member.
+_CLASS_SLOT = object.__dict__["__class__"]
+_set_class = _CLASS_SLOT.__set__
+_set_observer_slot = Observable.__dict__["_observers"].__set__
+_object_setattr = object.__setattr__
+
+
+def _base_class(obj: Any) -> type:
+    return _base_classes[type(obj)]
+
+
+def _observed_class(cls: type) -> type:
+    observed = _observed_classes.get(cls)
+    if observed is None:
+        observed = type(
+            cls.__name__,
+            (cls,),
+            {
+                "__slots__": (),
+                "__module__": cls.__module__,
+                "__qualname__": cls.__qualname__,
+                # Compare, print and copy like the model class: dataclass
+                # __eq__ and __repr__ go by obj.__class__.
+                "__class__": property(_base_class, _CLASS_SLOT.__set__),
+                "__setattr__": _notifying_setattr,
+                "__reduce_ex__": _reduce_as_base,
+            },
+        )
+        _observed_classes[cls] = observed
+        _base_classes[observed] = cls
+    return observed
+
+
+def model_class(obj: Any) -> type:
+    """The class of ``obj``, seen through the observed subclass."""
+    cls = type(obj)
+    return _base_classes.get(cls, cls)
+
+
+@dataclass(slots=True)
+class Edge(Observable):
     fromNode: str
     toNode: str
     fromSide: EdgesFromSideValue = None
@@ -90,7 +327,7 @@ class Edge:
     toEnd: EdgesToEndValue = None
     color: Color = None
     label: str = None
-    id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    id: str = field(default_factory=_new_id)
 
     def __post_init__(self):
         if isinstance(self.fromSide, str):
@@ -102,8 +339,12 @@ class Edge:
         if isinstance(self.toEnd, str):
             self.toEnd = EdgesToEndValue(self.toEnd)
         if isinstance(self.color, str):
-            self.color = Color(self.color)
-        validate_edge(self)
+            self.color = intern_color(self.color)
+        if isinstance(self.fromNode, str):
+            self.fromNode = sys.intern(self.fromNode)
+        if isinstance(self.toNode, str):
+            self.toNode = sys.intern(self.toNode)
+        _validate.validate_edge(self)
 
     def __eq__(self, other):
         if not isinstance(other, Edge):
@@ -123,20 +364,40 @@ class Edge:
             "label": self.label,
         }
 
-
-@dataclass
-class GenericNode:
+    def to_json_dict(self) -> Dict[str, Any]:
+        """Like to_dict, but with plain JSON values and unset fields omitted."""
+        data = {"id": self.id, "fromNode": self.fromNode}
+        if self.fromSide is not None:
+            data["fromSide"] = self.fromSide.value
+        if self.fromEnd is not None:
+            data["fromEnd"] = self.fromEnd.value
+        data["toNode"] = self.toNode
+        if self.toSide is not None:
+            data["toSide"] = self.toSide.value
+        if self.toEnd is not None:
+            data["toEnd"] = self.toEnd.value
+        if self.color is not None:
+            data["color"] = self.color.color
+        if self.label is not None:
+            data["label"] = self.label
+        return data
+
+
+@dataclass(slots=True)
+class GenericNode(Observable):
     type: NodeType
     x: int
     y: int
     width: int
     height: int
     color: Color = None
-    id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    id: str = field(default_factory=_new_id)
 
     def __post_init__(self):
         if isinstance(self.color, str):
-            self.color = Color(self.color)
+            self.color = intern_color(self.color)
+        if isinstance(self.id, str):
+            self.id = sys.intern(self.id)
 
     def __eq__(self, other):
         if not isinstance(other, GenericNode):
@@ -154,54 +415,85 @@ class GenericNode:
             "color": self.color,
         }
 
+    def to_json_dict(self) -> Dict[str, Any]:
+        """Like to_dict, but with plain JSON values and unset fields omitted."""
+        data = {
+            "type": self.type.value,
+            "id": self.id,
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+        }
+        if self.color is not None:
+            data["color"] = self.color.color
+        return data
+
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class TextNode(GenericNode):
     text: str = field(default="", init=True)
     type: NodeType = NodeType.TEXT
 
     def __post_init__(self):
-        super().__post_init__()
+        GenericNode.__post_init__(self)
         if isinstance(self.type, str):
             self.type = NodeType("text")
-        validate_node(self)
+        _validate.validate_node(self)
 
     def to_dict(self) -> Dict[str, Any]:
-        return super().to_dict() | {"text": self.text}
+        return GenericNode.to_dict(self) | {"text": self.text}
 
+    def to_json_dict(self) -> Dict[str, Any]:
+        data = GenericNode.to_json_dict(self)
+        data["text"] = self.text
+        return data
 
-@dataclass(kw_only=True)
+
+@dataclass(kw_only=True, slots=True)
 class FileNode(GenericNode):
     file: str
     type: NodeType = NodeType.FILE
     subpath: str = None
 
     def __post_init__(self):
-        super().__post_init__()
+        GenericNode.__post_init__(self)
         if isinstance(self.type, str):
             self.type = NodeType("file")
-        validate_node(self)
+        _validate.validate_node(self)
 
     def to_dict(self) -> Dict[str, Any]:
-        return super().to_dict() | {"file": self.file, "subpath": self.subpath}
+        return GenericNode.to_dict(self) | {"file": self.file, "subpath": self.subpath}
+
+    def to_json_dict(self) -> Dict[str, Any]:
+        data = GenericNode.to_json_dict(self)
+        data["file"] = self.file
+        if self.subpath is not None:
+            data["subpath"] = self.subpath
+        return data
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class LinkNode(GenericNode):
     url: str
     type: NodeType = NodeType.LINK
 
     def __post_init__(self):
-        super().__post_init__()
+        GenericNode.__post_init__(self)
         if isinstance(self.type, str):
             self.type = NodeType("link")
-        validate_node(self)
+        _validate.validate_node(self)
 
     def to_dict(self) -> Dict[str, Any]:
-        return super().to_dict() | {"url": self.url}
+        return GenericNode.to_dict(self) | {"url": self.url}
 
+    def to_json_dict(self) -> Dict[str, Any]:
+        data = GenericNode.to_json_dict(self)
+        data["url"] = self.url
+        return data
 
-@dataclass(kw_only=True)
+
+@dataclass(kw_only=True, slots=True)
 class GroupNode(GenericNode):
     type: NodeType = NodeType.GROUP
     label: str = None
@@ -209,16 +501,175 @@ class GroupNode(GenericNode):
     backgroundStyle: GroupNodeBackgroundStyle = None
 
     def __post_init__(self):
-        super().__post_init__()
+        GenericNode.__post_init__(self)
         if isinstance(self.type, str):
             self.type = NodeType("group")
         if isinstance(self.backgroundStyle, str):
             self.backgroundStyle = GroupNodeBackgroundStyle(self.backgroundStyle)
-        validate_node(self)
+        _validate.validate_node(self)
 
     def to_dict(self) -> Dict[str, Any]:
-        return super().to_dict() | {
+        return GenericNode.to_dict(self) | {
             "label": self.label,
             "background": self.background,
             "backgroundStyle": self.backgroundStyle,
         }
+
+    def to_json_dict(self) -> Dict[str, Any]:
+        data = GenericNode.to_json_dict(self)
+        if self.label is not None:
+            data["label"] = self.label
+        if self.background is not None:
+            data["background"] = self.background
+        if self.backgroundStyle is not None:
+            data["backgroundStyle"] = self.backgroundStyle.value
+        return data
+
+
+NODE_CLASSES = {
+    NodeType.TEXT.value: TextNode,
+    NodeType.FILE.value: FileNode,
+    NodeType.LINK.value: LinkNode,
+    NodeType.GROUP.value: GroupNode,
+}
+
+# Trusted construction: documents known to be valid are turned into model
+# objects without running __init__/__post_init__ or the validators. Enum
+# members are looked up by value and colors are not re-checked.
+
+
+def _members(enum):
+    return {member.value: member for member in enum}
+
+
+_FROM_SIDES = _members(EdgesFromSideValue)
+_FROM_ENDS = _members(EdgesFromEndValue)
+_TO_SIDES = _members(EdgesToSideValue)
+_TO_ENDS = _members(EdgesToEndValue)
+_BACKGROUND_STYLES = _members(GroupNodeBackgroundStyle)
+
+
+def _trusted_color(value):
+    if value is None or isinstance(value, Color):
+        return value
+    color = _interned_colors.get(value)
+    if color is None:
+        try:
+            color = Color(value)
+        except InvalidColorValueError:
+            color = _unchecked_colors.get(value)
+            if color is None:
+                color = _unchecked_colors[value] = _make_color(
+                    value, PresetOrHex.PRESET if value.isdigit() else PresetOrHex.HEX
+                )
+    return color
+
+
+def _trusted_node(node_class, node_type, data):
+    node = node_class.__new__(node_class)
+    node.type = node_type
+    node.x = data["x"]
+    node.y = data["y"]
+    node.width = data["width"]
+    node.height = data["height"]
+    node.color = _trusted_color(data.get("color"))
+    node.id = sys.intern(data["id"]) if "id" in data else _new_id()
+    return node
+
+
+def _trusted_text_node(data):
+    node = _trusted_node(TextNode, NodeType.TEXT, data)
+    node.text = data.get("text", "")
+    return node
+
+
+def _trusted_file_node(data):
+    node = _trusted_node(FileNode, NodeType.FILE, data)
+    node.file = data["file"]
+    node.subpath = data.get("subpath")
+    return node
+
+
+def _trusted_link_node(data):
+    node = _trusted_node(LinkNode, NodeType.LINK, data)
+    node.url = data["url"]
+    return node
+
+
+def _trusted_group_node(data):
+    node = _trusted_node(GroupNode, NodeType.GROUP, data)
+    node.label = data.get("label")
+    node.background = data.get("background")
+    style = data.get("backgroundStyle")
+    node.backgroundStyle = _BACKGROUND_STYLES[style] if style is not None else None
+    return node
+
+
+TRUSTED_NODE_BUILDERS = {
+    NodeType.TEXT.value: _trusted_text_node,
+    NodeType.FILE.value: _trusted_file_node,
+    NodeType.LINK.value: _trusted_link_node,
+    NodeType.GROUP.value: _trusted_group_node,
+}
+
+
+def _trusted_edge(data):
+    edge = Edge.__new__(Edge)
+    edge.fromNode = sys.intern(data["fromNode"])
+    edge.toNode = sys.intern(data["toNode"])
+    value = data.get("fromSide")
+    edge.fromSide = _FROM_SIDES[value] if value is not None else None
+    value = data.get("fromEnd")
+    edge.fromEnd = _FROM_ENDS[value] if value is not None else None
+    value = data.get("toSide")
+    edge.toSide = _TO_SIDES[value] if value is not None else None
+    value = data.get("toEnd")
+    edge.toEnd = _TO_ENDS[value] if value is not None else None
+    edge.color = _trusted_color(data.get("color"))
+    edge.label = data.get("label")
+    edge.id = data["id"] if "id" in data else _new_id()
+    return edge
+
+
+def node_from_dict(node: Dict[str, Any], validate: bool = True) -> GenericNode:
+    """Build the node class matching ``node["type"]``.
+
+    With ``validate=False`` the node is assumed to be well formed and is
+    built without per-object validation; run ``Canvas.validate()`` once
+    afterwards if needed.
+    """
+    builders = NODE_CLASSES if validate else TRUSTED_NODE_BUILDERS
+    build = builders.get(node["type"])
+    if build is None:
+        raise InvalidNodeTypeError(
+            f"Invalid or unsupported node type.The node {node['id']} has an invalid or unsupported type {node['type']}."
+        )
+    return build(**node) if validate else build(node)
+
+
+def edge_from_dict(edge: Dict[str, Any], validate: bool = True) -> Edge:
+    return Edge(**edge) if validate else _trusted_edge(edge)
+
+
+_JSON_FIELD_CONVERTERS = {
+    "type": NodeType,
+    "color": intern_color,
+    "fromSide": EdgesFromSideValue,
+    "fromEnd": EdgesFromEndValue,
+    "toSide": EdgesToSideValue,
+    "toEnd": EdgesToEndValue,
+    "backgroundStyle": GroupNodeBackgroundStyle,
+}
+
+
+def field_from_json(name: str, value: Any) -> Any:
+    """Convert a JSON value of the named field to its model representation."""
+    if value is None:
+        return None
+    convert = _JSON_FIELD_CONVERTERS.get(name)
+    return value if convert is None else convert(value)
+
+
+# Imported last: validate.py binds the classes above when it is first loaded,
+# and models only looks its functions up when objects are created.
+from . import validate as _validate  # noqa: E402
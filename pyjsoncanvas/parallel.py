@@ -0,0 +1,75 @@
+# parallel.py
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+from .jsoncanvas import Canvas
+
+# Files handed to the pool per worker at any time. Keeping a few queued
+# hides the round trip to the parent without submitting the whole corpus.
+_IN_FLIGHT_PER_WORKER = 4
+
+
+@dataclass
+class LoadResult:
+    path: str
+    canvas: Optional[Canvas] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _load_one(path: str, validate: bool) -> LoadResult:
+    try:
+        # The validating loader rejects exactly what Canvas.load rejects,
+        # such as unknown fields, which trusted building ignores; validate()
+        # then adds the checks across objects (duplicate IDs, orphan edges).
+        canvas = Canvas.load(path, validate=validate)
+        if validate:
+            canvas.validate()
+    except Exception as e:
+        return LoadResult(path, error=e)
+    return LoadResult(path, canvas)
+
+
+def load_many(
+    paths: Iterable[str], workers: Optional[int] = None, validate: bool = True
+) -> Iterator[LoadResult]:
+    """Load and validate canvas files in a pool of worker processes.
+
+    Results are yielded as files finish, not in the order of ``paths``. A
+    file that cannot be read, parsed or validated yields a result with the
+    exception in ``error`` and does not stop the others. ``workers``
+    defaults to the number of CPUs; with ``workers=1`` the files are loaded
+    in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for path in paths:
+            yield _load_one(path, validate)
+        return
+    paths = iter(paths)
+    with ProcessPoolExecutor(workers) as executor:
+        pending = {}
+
+        def submit() -> None:
+            path = next(paths, None)
+            if path is not None:
+                pending[executor.submit(_load_one, path, validate)] = path
+
+        for _ in range(workers * _IN_FLIGHT_PER_WORKER):
+            submit()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                submit()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker died or its result could not be sent back.
+                    result = LoadResult(path, error=e)
+                yield result
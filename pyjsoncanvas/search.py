@@ -0,0 +1,203 @@
+# search.py
+import re
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import Edge, FileNode, GroupNode, LinkNode, TextNode, model_class
+
+MATCHES = ("token", "prefix", "substring")
+
+# The searchable attribute of each class.
+SEARCH_FIELDS = {
+    TextNode: "text",
+    GroupNode: "label",
+    FileNode: "file",
+    LinkNode: "url",
+    Edge: "label",
+}
+FIELD_NAMES = frozenset(SEARCH_FIELDS.values())
+
+_TOKEN = re.compile(r"\w+")
+
+# Objects are keyed by kind and ID, since nodes and edges may share IDs.
+Key = Tuple[str, str]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased runs of letters, digits and underscores."""
+    return _TOKEN.findall(text.lower())
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _searchable(obj: Any) -> Optional[str]:
+    name = SEARCH_FIELDS.get(model_class(obj))
+    if name is None:
+        name = next(
+            (name for cls, name in SEARCH_FIELDS.items() if isinstance(obj, cls)), None
+        )
+    value = getattr(obj, name, None) if name is not None else None
+    return value if isinstance(value, str) and value else None
+
+
+class SearchIndex:
+    """Inverted index over the text of nodes and edges.
+
+    Indexed are ``TextNode.text``, ``GroupNode.label``, ``FileNode.file``,
+    ``LinkNode.url`` and ``Edge.label``, case-insensitively. Token and prefix
+    queries look up the tokens (see ``tokenize``) of every word in the query
+    and return the objects containing all of them. Substring queries match
+    the query anywhere in the text. Queries made of word characters only
+    scan the distinct tokens; others use a trigram index over the texts,
+    built on first use, or scan the texts if shorter than three characters.
+    """
+
+    # Fields whose changes the index has to be told about, besides ``id``.
+    field_names = FIELD_NAMES
+
+    def __init__(self, nodes: Iterable[Any] = (), edges: Iterable[Any] = ()):
+        self._objects: Dict[Key, Any] = {}
+        self._texts: Dict[Key, str] = {}
+        self._postings: Dict[str, Dict[Key, None]] = {}
+        self._vocabulary: Optional[List[str]] = None
+        self._trigrams: Optional[Dict[str, Dict[Key, None]]] = None
+        for node in nodes:
+            self.add("node", node)
+        for edge in edges:
+            self.add("edge", edge)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, kind: str, obj: Any) -> None:
+        text = _searchable(obj)
+        if text is None:
+            return
+        key = (kind, obj.id)
+        if key in self._texts:
+            self.remove(kind, obj.id)
+        text = text.lower()
+        self._objects[key] = obj
+        self._texts[key] = text
+        postings = self._postings
+        for token in _TOKEN.findall(text):
+            entries = postings.get(token)
+            if entries is None:
+                entries = postings[token] = {}
+                self._vocabulary = None
+            entries[key] = None
+        if self._trigrams is not None:
+            for gram in _trigrams(text):
+                self._trigrams.setdefault(gram, {})[key] = None
+
+    def remove(self, kind: str, obj_id: str) -> None:
+        key = (kind, obj_id)
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        del self._objects[key]
+        postings = self._postings
+        for token in _TOKEN.findall(text):
+            entries = postings.get(token)
+            if entries is not None:
+                entries.pop(key, None)
+                if not entries:
+                    del postings[token]
+                    self._vocabulary = None
+        if self._trigrams is not None:
+            for gram in _trigrams(text):
+                entries = self._trigrams.get(gram)
+                if entries is not None:
+                    entries.pop(key, None)
+                    if not entries:
+                        del self._trigrams[gram]
+
+    def update(self, kind: str, obj: Any, old_id: str) -> None:
+        """Re-index an object after its ID or searchable text changed."""
+        self.remove(kind, old_id)
+        self.add(kind, obj)
+
+    def _sorted_vocabulary(self) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        return self._vocabulary
+
+    def _prefixed(self, prefix: str) -> Dict[Key, None]:
+        vocabulary = self._sorted_vocabulary()
+        matches: Dict[Key, None] = {}
+        for i in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            token = vocabulary[i]
+            if not token.startswith(prefix):
+                break
+            matches.update(self._postings[token])
+        return matches
+
+    def _containing(self, text: str) -> List[Key]:
+        if _TOKEN.fullmatch(text):
+            # A run of word characters can only occur inside a single token,
+            # and there are far fewer distinct tokens than indexed texts.
+            postings = [
+                self._postings[token]
+                for token in self._sorted_vocabulary()
+                if text in token
+            ]
+            if sum(map(len, postings)) < len(self._texts):
+                matches: Dict[Key, None] = {}
+                for entries in postings:
+                    matches.update(entries)
+                return list(matches)
+            # Most texts match; scanning them beats merging the postings.
+        if len(text) < 3:
+            return [key for key, indexed in self._texts.items() if text in indexed]
+        if self._trigrams is None:
+            self._trigrams = {}
+            for key, indexed in self._texts.items():
+                for gram in _trigrams(indexed):
+                    self._trigrams.setdefault(gram, {})[key] = None
+        candidates = None
+        # Rarest trigrams first, so the candidate set shrinks quickly.
+        for gram in sorted(
+            _trigrams(text), key=lambda gram: len(self._trigrams.get(gram, ()))
+        ):
+            entries = self._trigrams.get(gram)
+            if not entries:
+                return []
+            if candidates is None:
+                candidates = set(entries)
+            else:
+                candidates.intersection_update(entries)
+            if len(candidates) <= 8:
+                break
+        return [key for key in candidates if text in self._texts[key]]
+
+    def search_keys(self, query: str, match: str = "token") -> List[Key]:
+        if match == "substring":
+            text = query.lower()
+            return self._containing(text) if text else []
+        if match not in MATCHES:
+            raise ValueError(f"match must be one of {', '.join(MATCHES)}.")
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        if match == "prefix":
+            postings = [self._prefixed(token) for token in set(tokens)]
+        else:
+            postings = [self._postings.get(token, {}) for token in set(tokens)]
+        # Intersect starting with the smallest posting list.
+        postings.sort(key=len)
+        result = set(postings[0])
+        for entries in postings[1:]:
+            if not result:
+                break
+            result.intersection_update(entries)
+        return list(result)
+
+    def search(self, query: str, match: str = "token") -> List[Any]:
+        """Nodes and edges whose text matches ``query``, in no particular
+        order. ``match`` is ``"token"`` (every word of the query appears as
+        a whole token), ``"prefix"`` (every word starts some token) or
+        ``"substring"`` (the query appears anywhere in the text)."""
+        objects = self._objects
+        return [objects[key] for key in self.search_keys(query, match)]
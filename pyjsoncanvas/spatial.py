@@ -0,0 +1,178 @@
+# spatial.py
+from heapq import nsmallest
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .models import GenericNode
+
+DEFAULT_CELL_SIZE = 512
+
+# Nodes spanning more cells than this (typically large groups) are kept in a
+# separate bucket that every query checks directly.
+MAX_CELLS_PER_NODE = 64
+
+Box = Tuple[int, int, int, int]
+
+
+def _distance(box: Box, x: float, y: float) -> float:
+    dx = max(box[0] - x, 0, x - box[2])
+    dy = max(box[1] - y, 0, y - box[3])
+    return (dx * dx + dy * dy) ** 0.5
+
+
+class SpatialIndex:
+    """Uniform grid over node bounding boxes.
+
+    A node is registered in every cell its box overlaps and remembers the box
+    it was inserted with, so it can be removed or re-inserted after moving.
+    Boxes are closed: nodes that merely touch a query rectangle match it.
+    """
+
+    def __init__(
+        self, nodes: Iterable[GenericNode] = (), cell_size: int = DEFAULT_CELL_SIZE
+    ):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Dict[str, GenericNode]] = {}
+        self._large: Dict[str, GenericNode] = {}
+        self._boxes: Dict[str, Box] = {}
+        # Cell range that has ever been occupied; only grows, which keeps it
+        # a valid limit for the nearest-neighbour ring search.
+        self._extent = None
+        for node in nodes:
+            self.insert(node)
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._boxes
+
+    def _cell_range(self, box: Box) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            int(box[0] // size),
+            int(box[1] // size),
+            int(box[2] // size),
+            int(box[3] // size),
+        )
+
+    def _cells_for(self, box: Box) -> Iterator[Tuple[int, int]]:
+        cx0, cy0, cx1, cy1 = self._cell_range(box)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                yield cx, cy
+
+    def _is_large(self, box: Box) -> bool:
+        cx0, cy0, cx1, cy1 = self._cell_range(box)
+        return (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > MAX_CELLS_PER_NODE
+
+    def insert(self, node: GenericNode) -> None:
+        if node.id in self._boxes:
+            self.remove(node.id)
+        box = (node.x, node.y, node.x + node.width, node.y + node.height)
+        self._boxes[node.id] = box
+        if self._is_large(box):
+            self._large[node.id] = node
+            return
+        cx0, cy0, cx1, cy1 = self._cell_range(box)
+        if self._extent is None:
+            self._extent = (cx0, cy0, cx1, cy1)
+        else:
+            ex0, ey0, ex1, ey1 = self._extent
+            self._extent = (min(ex0, cx0), min(ey0, cy0), max(ex1, cx1), max(ey1, cy1))
+        cells = self._cells
+        for cell in self._cells_for(box):
+            bucket = cells.get(cell)
+            if bucket is None:
+                bucket = cells[cell] = {}
+            bucket[node.id] = node
+
+    def remove(self, node_id: str) -> None:
+        box = self._boxes.pop(node_id, None)
+        if box is None:
+            return
+        if self._large.pop(node_id, None) is not None:
+            return
+        for cell in self._cells_for(box):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.pop(node_id, None)
+                if not bucket:
+                    del self._cells[cell]
+
+    def _candidates(self, box: Box) -> Dict[str, GenericNode]:
+        found = dict(self._large)
+        cx0, cy0, cx1, cy1 = self._cell_range(box)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._cells):
+            # Cheaper to walk the occupied cells than the whole query area.
+            for (cx, cy), bucket in self._cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    found.update(bucket)
+        else:
+            cells = self._cells
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket:
+                        found.update(bucket)
+        return found
+
+    def query_rect(self, x0: float, y0: float, x1: float, y1: float) -> List[GenericNode]:
+        """Nodes whose box intersects the rectangle ``(x0, y0)``-``(x1, y1)``."""
+        boxes = self._boxes
+        result = []
+        for node_id, node in self._candidates((x0, y0, x1, y1)).items():
+            box = boxes[node_id]
+            if box[0] <= x1 and x0 <= box[2] and box[1] <= y1 and y0 <= box[3]:
+                result.append(node)
+        return result
+
+    def query_within(
+        self, x0: float, y0: float, x1: float, y1: float
+    ) -> List[GenericNode]:
+        """Nodes whose box lies entirely inside the rectangle."""
+        boxes = self._boxes
+        result = []
+        for node_id, node in self._candidates((x0, y0, x1, y1)).items():
+            box = boxes[node_id]
+            if x0 <= box[0] and y0 <= box[1] and box[2] <= x1 and box[3] <= y1:
+                result.append(node)
+        return result
+
+    def query_point(self, x: float, y: float) -> List[GenericNode]:
+        return self.query_rect(x, y, x, y)
+
+    def nearest(self, x: float, y: float, count: int = 1) -> List[GenericNode]:
+        """The ``count`` nodes closest to the point, nearest first.
+
+        Distance is measured to the edge of each node's box, so nodes that
+        contain the point come first with distance zero.
+        """
+        if count <= 0 or not self._boxes:
+            return []
+        boxes = self._boxes
+        found = dict(self._large)
+        size = self.cell_size
+        px, py = int(x // size), int(y // size)
+        cx0, cy0, cx1, cy1 = self._extent or (px, py, px, py)
+        max_ring = max(px - cx0, cx1 - px, py - cy0, cy1 - py, 0)
+        ring = 0
+        while True:
+            for cx in range(px - ring, px + ring + 1):
+                for cy in (py - ring, py + ring) if ring else (py,):
+                    found.update(self._cells.get((cx, cy), ()))
+            for cy in range(py - ring + 1, py + ring):
+                for cx in (px - ring, px + ring) if ring else ():
+                    found.update(self._cells.get((cx, cy), ()))
+            if ring >= max_ring or len(found) == len(boxes):
+                break
+            # Anything in rings further out is at least ``ring * size`` away.
+            if len(found) >= count:
+                best = nsmallest(
+                    count, (_distance(boxes[i], x, y) for i in found)
+                )
+                if best[-1] <= ring * size:
+                    break
+            ring += 1
+        return nsmallest(
+            count, found.values(), key=lambda node: _distance(boxes[node.id], x, y)
+        )
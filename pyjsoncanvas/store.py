@@ -0,0 +1,309 @@
+# store.py
+"""A read-only, memory-mapped canvas file with ID indexes.
+
+Layout, all integers little-endian: the header (``_HEADER``) holds the magic
+bytes ``PJCS``, the format version, the node and edge counts, the number of
+slots in each ID hash table and the file offsets of the sections below.
+
+- records: every node and edge as compact JSON, nodes first;
+- record offsets: for nodes and for edges, ``count + 1`` u64 offsets of the
+  records, so record ``i`` spans ``offsets[i]:offsets[i + 1]``;
+- IDs: the UTF-8 ID of every node and edge, located the same way, so an
+  index lookup can compare IDs without decoding a record;
+- ID hash tables: open addressing with linear probing over ``crc32`` of the
+  UTF-8 ID; a slot holds the record number plus one, or 0 if empty;
+- connections: for every node, ``count + 1`` u64 offsets into a list of
+  edge numbers, its outgoing edges followed by its incoming ones.
+
+Opening a store reads only the header. Lookups read a few slots and one
+record from the mapping and build the node or edge from it on demand.
+"""
+import mmap
+import sys
+from array import array
+from json import JSONEncoder, loads
+from struct import Struct
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+from zlib import crc32
+
+from .exceptions import (
+    EdgeIDConflictError,
+    EdgeNotFoundError,
+    InvalidBinaryError,
+    NodeIDConflictError,
+    NodeNotFoundError,
+)
+from .jsoncanvas import Canvas, _replacing
+from .models import Edge, GenericNode, edge_from_dict, node_from_dict
+
+MAGIC = b"PJCS"
+VERSION = 1
+
+# magic, version, node count, edge count, node and edge hash table slots,
+# then the section offsets in the order of _SECTIONS.
+_SECTIONS = (
+    "node_records",
+    "edge_records",
+    "node_ids",
+    "edge_ids",
+    "node_hash",
+    "edge_hash",
+    "connection_offsets",
+    "connections",
+)
+_HEADER = Struct(f"<4sB3x4Q{len(_SECTIONS)}Q")
+_U64 = Struct("<Q")
+_U64_PAIR = Struct("<QQ")
+
+_encoder = JSONEncoder(separators=(",", ":"))
+
+
+def _id_bytes(object_id: str) -> bytes:
+    return object_id.encode("utf-8", "surrogatepass")
+
+
+def _pack(values: Iterable[int]) -> bytes:
+    packed = array("Q", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _slot_count(count: int) -> int:
+    # At most half full, so probe sequences stay short.
+    slots = 1
+    while slots < 2 * count:
+        slots *= 2
+    return slots
+
+
+def _hash_table(ids: List[bytes]) -> Tuple[int, bytes]:
+    slots = _slot_count(len(ids))
+    mask = slots - 1
+    table = [0] * slots
+    owners: List[Optional[bytes]] = [None] * slots
+    for number, key in enumerate(ids):
+        i = crc32(key) & mask
+        while table[i] and owners[i] != key:
+            i = (i + 1) & mask
+        if not table[i]:  # The first object with a duplicate ID wins.
+            table[i] = number + 1
+            owners[i] = key
+    return slots, _pack(table)
+
+
+class _Writer:
+    def __init__(self, f: IO, start: int):
+        self.f = f
+        self.pos = start
+
+    def write(self, data: bytes) -> int:
+        """Write ``data`` and return the offset it was written at."""
+        offset = self.pos
+        self.f.write(data)
+        self.pos += len(data)
+        return offset
+
+    def blobs(self, blobs: Iterable[bytes]) -> bytes:
+        """Write ``blobs`` back to back and return their packed offsets,
+        one more than there are blobs."""
+        offsets = [self.pos]
+        for blob in blobs:
+            self.f.write(blob)
+            self.pos += len(blob)
+            offsets.append(self.pos)
+        return _pack(offsets)
+
+
+class CanvasStore:
+    """Random access to the nodes and edges of a canvas file written by
+    ``CanvasStore.write``, without loading it.
+
+    The file is memory-mapped, so opening it is immediate whatever its size
+    and only the pages that lookups touch are read. Every call builds new
+    node and edge objects; changing them does not change the store.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # An empty file cannot be mapped.
+                raise InvalidBinaryError("Not a canvas store.") from e
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise InvalidBinaryError("Not a canvas store.")
+        (
+            magic,
+            version,
+            self.node_count,
+            self.edge_count,
+            self._node_slots,
+            self._edge_slots,
+            *sections,
+        ) = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self.close()
+            raise InvalidBinaryError("Not a canvas store.")
+        if version != VERSION:
+            self.close()
+            raise InvalidBinaryError(f"Unsupported canvas store version {version}.")
+        if max(sections) > len(self._map):
+            self.close()
+            raise InvalidBinaryError("Truncated canvas store.")
+        (
+            self._node_records,
+            self._edge_records,
+            self._node_ids,
+            self._edge_ids,
+            self._node_hash,
+            self._edge_hash,
+            self._connection_offsets,
+            self._connections,
+        ) = sections
+
+    @staticmethod
+    def write(canvas: Canvas, path: str) -> None:
+        """Write ``canvas`` as a store at ``path``, replacing the file only
+        once it is complete.
+
+        Every ID must name a single record, so a canvas with duplicate node
+        or edge IDs is rejected, as ``Canvas.validate`` rejects it.
+        """
+        nodes, edges = canvas.nodes, canvas.edges
+        node_ids = [_id_bytes(node.id) for node in nodes]
+        edge_ids = [_id_bytes(edge.id) for edge in edges]
+        positions = {}
+        for number, node in enumerate(nodes):
+            if positions.setdefault(node.id, number) != number:
+                raise NodeIDConflictError(
+                    f"Node with id {node.id} appears more than once."
+                )
+        if len(set(edge_ids)) != len(edge_ids):
+            seen = set()
+            for edge in edges:
+                if edge.id in seen:
+                    raise EdgeIDConflictError(
+                        f"Edge with id {edge.id} appears more than once."
+                    )
+                seen.add(edge.id)
+        outgoing: List[List[int]] = [[] for _ in nodes]
+        incoming: List[List[int]] = [[] for _ in nodes]
+        for number, edge in enumerate(edges):
+            source = positions.get(edge.fromNode)
+            if source is not None:
+                outgoing[source].append(number)
+            target = positions.get(edge.toNode)
+            # A loop is already listed among the outgoing edges.
+            if target is not None and edge.fromNode != edge.toNode:
+                incoming[target].append(number)
+
+        with _replacing(path, "xb") as f:
+            writer = _Writer(f, _HEADER.size)
+            f.write(bytes(_HEADER.size))
+            sections = {}
+            for name, objects in (("node_records", nodes), ("edge_records", edges)):
+                offsets = writer.blobs(
+                    _encoder.encode(obj.to_json_dict()).encode()
+                    for obj in objects
+                )
+                sections[name] = writer.write(offsets)
+            for name, ids in (("node_ids", node_ids), ("edge_ids", edge_ids)):
+                sections[name] = writer.write(writer.blobs(ids))
+            node_slots, table = _hash_table(node_ids)
+            sections["node_hash"] = writer.write(table)
+            edge_slots, table = _hash_table(edge_ids)
+            sections["edge_hash"] = writer.write(table)
+            connections = []
+            offsets = [0]
+            for out, into in zip(outgoing, incoming):
+                connections += out
+                connections += into
+                offsets.append(len(connections))
+            sections["connection_offsets"] = writer.write(_pack(offsets))
+            sections["connections"] = writer.write(_pack(connections))
+            f.seek(0)
+            f.write(
+                _HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    len(nodes),
+                    len(edges),
+                    node_slots,
+                    edge_slots,
+                    *(sections[name] for name in _SECTIONS),
+                )
+            )
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "CanvasStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _record(self, offsets: int, number: int) -> bytes:
+        start, end = _U64_PAIR.unpack_from(self._map, offsets + 8 * number)
+        return self._map[start:end]
+
+    def _find(self, object_id: str, table: int, slots: int, ids: int) -> int:
+        if not isinstance(object_id, str):
+            return -1
+        key = _id_bytes(object_id)
+        mask = slots - 1
+        i = crc32(key) & mask
+        while True:
+            (slot,) = _U64.unpack_from(self._map, table + 8 * i)
+            if not slot:
+                return -1
+            if self._record(ids, slot - 1) == key:
+                return slot - 1
+            i = (i + 1) & mask
+
+    def _node(self, number: int) -> GenericNode:
+        return node_from_dict(loads(self._record(self._node_records, number)), False)
+
+    def _edge(self, number: int) -> Edge:
+        return edge_from_dict(loads(self._record(self._edge_records, number)), False)
+
+    def __contains__(self, node_id: str) -> bool:
+        return self._find(node_id, self._node_hash, self._node_slots, self._node_ids) >= 0
+
+    def get_node(self, node_id: str) -> GenericNode:
+        number = self._find(node_id, self._node_hash, self._node_slots, self._node_ids)
+        if number < 0:
+            raise NodeNotFoundError("Node with id does not exist")
+        return self._node(number)
+
+    def get_edge(self, edge_id: str) -> Edge:
+        number = self._find(edge_id, self._edge_hash, self._edge_slots, self._edge_ids)
+        if number < 0:
+            raise EdgeNotFoundError("Edge with id does not exist")
+        return self._edge(number)
+
+    def get_connections(self, node_id: str) -> List[Edge]:
+        """The edges leaving or entering a node, outgoing ones first, or an
+        empty list if there is no such node."""
+        number = self._find(node_id, self._node_hash, self._node_slots, self._node_ids)
+        if number < 0:
+            return []
+        start, end = _U64_PAIR.unpack_from(
+            self._map, self._connection_offsets + 8 * number
+        )
+        edges = Struct(f"<{end - start}Q").unpack_from(
+            self._map, self._connections + 8 * start
+        )
+        return [self._edge(edge) for edge in edges]
+
+    def iter_nodes(self) -> Iterator[GenericNode]:
+        for number in range(self.node_count):
+            yield self._node(number)
+
+    def iter_edges(self) -> Iterator[Edge]:
+        for number in range(self.edge_count):
+            yield self._edge(number)
+
+    def to_canvas(self) -> Canvas:
+        return Canvas(nodes=list(self.iter_nodes()), edges=list(self.iter_edges()))
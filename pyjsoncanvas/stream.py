@@ -0,0 +1,312 @@
+# stream.py
+import codecs
+from time import perf_counter
+from json import JSONDecoder, JSONDecodeError, JSONEncoder
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from . import metrics as _metrics
+from .exceptions import InvalidJsonError
+from .lazy import json_dicts
+from .models import Edge, GenericNode, edge_from_dict, node_from_dict
+
+CHUNK_SIZE = 1 << 16
+
+Source = Union[str, IO]
+
+_decoder = JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """Incrementally decodes JSON values from a file object.
+
+    Only the unconsumed tail of the document is buffered, so memory stays
+    bounded by the chunk size plus the largest single value.
+    """
+
+    def __init__(self, fp: IO, chunk_size: int, timed: bool = False):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.text_decoder = None
+        # Time spent in fp.read and bytes read, kept only when timed.
+        self.timed = timed
+        self.read_seconds = 0.0
+        self.bytes_read = 0
+
+    def fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        if self.timed:
+            start = perf_counter()
+            data = self.fp.read(size)
+            self.read_seconds += perf_counter() - start
+            self.bytes_read += (
+                len(data) if isinstance(data, bytes) else len(data.encode("utf-8"))
+            )
+        else:
+            data = self.fp.read(size)
+        if isinstance(data, bytes):
+            if self.text_decoder is None:
+                self.text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+            data = self.text_decoder.decode(data, final=not data)
+        if not data:
+            self.eof = True
+        self.buffer = self.buffer[self.pos :] + data
+        self.pos = 0
+        return not self.eof
+
+    def peek(self) -> str:
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self.fill(self.chunk_size):
+                return ""
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise InvalidJsonError(
+                f"Invalid or malformed JSON: expected one of {chars!r}, got {char!r}."
+            )
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except JSONDecodeError as e:
+                if self.fill(size):
+                    size *= 2
+                    continue
+                raise InvalidJsonError("Invalid or malformed JSON.") from e
+            # A number running into the end of the buffer may be truncated.
+            if end == len(self.buffer) and self.fill(size):
+                continue
+            self.pos = end
+            return value
+
+
+def _open(source: Source) -> Tuple[IO, bool]:
+    if hasattr(source, "read"):
+        return source, False
+    return open(source, "r", encoding="utf-8-sig"), True
+
+
+def iter_dicts(
+    source: Source, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``("nodes", dict)`` and ``("edges", dict)`` pairs in document order."""
+    return _iter_dicts(source, chunk_size, None)
+
+
+def _iter_dicts(
+    source: Source, chunk_size: int, reader_out: Optional[List[_Reader]]
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    fp, owned = _open(source)
+    try:
+        reader = _Reader(fp, chunk_size, timed=reader_out is not None)
+        if reader_out is not None:
+            reader_out.append(reader)
+        reader.expect("{")
+        if reader.peek() == "}":
+            reader.expect("}")
+        else:
+            while True:
+                key = reader.value()
+                if not isinstance(key, str):
+                    raise InvalidJsonError("Invalid or malformed JSON: expected a key.")
+                reader.expect(":")
+                if key in ("nodes", "edges") and reader.peek() == "[":
+                    reader.expect("[")
+                    if reader.peek() == "]":
+                        reader.expect("]")
+                    else:
+                        while True:
+                            yield key, reader.value()
+                            if reader.expect(",]") == "]":
+                                break
+                else:
+                    reader.value()
+                if reader.expect(",}") == "}":
+                    break
+        # Like json.loads, reject anything but whitespace after the document.
+        if reader.peek():
+            raise InvalidJsonError("Invalid or malformed JSON: extra data.")
+    finally:
+        if owned:
+            fp.close()
+
+
+def iterload(
+    source: Source, chunk_size: int = CHUNK_SIZE, validate: bool = True
+) -> Iterator[Union[GenericNode, Edge]]:
+    """Yield model objects for each node and edge as they are parsed."""
+    metrics = _metrics.active
+    if metrics is not None:
+        yield from _iterload_measured(source, chunk_size, validate, metrics)
+        return
+    for key, obj in iter_dicts(source, chunk_size):
+        if key == "nodes":
+            yield node_from_dict(obj, validate)
+        else:
+            yield edge_from_dict(obj, validate)
+
+
+def _iterload_measured(
+    source: Source, chunk_size: int, validate: bool, metrics: "_metrics.Metrics"
+) -> Iterator[Union[GenericNode, Edge]]:
+    # Parsing and reading interleave, so time spent in the reader is taken
+    # out of the parse time. Totals are recorded once, when the document is
+    # done or abandoned, rather than per object.
+    readers: List[_Reader] = []
+    pairs = _iter_dicts(source, chunk_size, readers)
+    parse_seconds = construct_seconds = 0.0
+    constructed = 0
+    try:
+        while True:
+            start = perf_counter()
+            pair = next(pairs, None)
+            parsed = perf_counter()
+            parse_seconds += parsed - start
+            if pair is None:
+                break
+            key, obj = pair
+            if key == "nodes":
+                obj = node_from_dict(obj, validate)
+            else:
+                obj = edge_from_dict(obj, validate)
+            construct_seconds += perf_counter() - parsed
+            constructed += 1
+            yield obj
+    finally:
+        pairs.close()
+        if readers:
+            reader = readers[0]
+            metrics.add("read", reader.read_seconds, bytes_read=reader.bytes_read)
+            parse_seconds -= reader.read_seconds
+        metrics.add("parse", parse_seconds)
+        metrics.add(
+            "construct",
+            construct_seconds,
+            objects_constructed=constructed,
+            validations=constructed if validate else 0,
+        )
+
+
+def _iter_chunks(
+    nodes: Iterable[GenericNode],
+    edges: Iterable[Edge],
+    indent: Optional[int],
+    compact: bool,
+    counts: Optional[List[int]] = None,
+) -> Iterator[str]:
+    if indent is not None:
+        encoder = JSONEncoder(indent=indent)
+        newline = "\n" + " " * indent
+        item_newline = newline + " " * indent
+        item_separator = "," + item_newline
+        key_separator = ": "
+    else:
+        item_separator, key_separator = (",", ":") if compact else (", ", ": ")
+        encoder = JSONEncoder(separators=(item_separator, key_separator))
+        newline = item_newline = ""
+    yield "{"
+    for index, (key, objects) in enumerate((("nodes", nodes), ("edges", edges))):
+        if index:
+            yield item_separator if indent is None else ","
+        yield f'{newline}"{key}"{key_separator}['
+        first = True
+        count = 0
+        for count, data in enumerate(json_dicts(objects), 1):
+            encoded = encoder.encode(data)
+            if indent is not None:
+                encoded = encoded.replace("\n", item_newline)
+            yield (item_newline if first else item_separator) + encoded
+            first = False
+        if counts is not None:
+            counts.append(count)
+        yield "]" if first else newline + "]"
+    yield "\n}" if indent is not None else "}"
+
+
+def dump(
+    nodes: Iterable[GenericNode],
+    edges: Iterable[Edge],
+    fp: IO,
+    indent: Optional[int] = None,
+    compact: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> None:
+    """Write a canvas document to ``fp`` in chunks of roughly ``chunk_size``.
+
+    The output matches ``json.dumps`` with the same ``indent``, or with
+    ``separators=(",", ":")`` when ``compact`` is set.
+    """
+    metrics = _metrics.active
+    if metrics is not None:
+        _dump_measured(nodes, edges, fp, indent, compact, chunk_size, metrics)
+        return
+    buffer = []
+    buffered = 0
+    for chunk in _iter_chunks(nodes, edges, indent, compact):
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= chunk_size:
+            fp.write("".join(buffer))
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        fp.write("".join(buffer))
+
+
+def _dump_measured(
+    nodes: Iterable[GenericNode],
+    edges: Iterable[Edge],
+    fp: IO,
+    indent: Optional[int],
+    compact: bool,
+    chunk_size: int,
+    metrics: "_metrics.Metrics",
+) -> None:
+    start = perf_counter()
+    write_seconds = 0.0
+    written = 0
+    counts: List[int] = []
+
+    def write(text: str) -> None:
+        nonlocal write_seconds, written
+        data = text.encode("utf-8")
+        before = perf_counter()
+        fp.write(text)
+        write_seconds += perf_counter() - before
+        written += len(data)
+
+    buffer = []
+    buffered = 0
+    try:
+        for chunk in _iter_chunks(nodes, edges, indent, compact, counts):
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= chunk_size:
+                write("".join(buffer))
+                buffer.clear()
+                buffered = 0
+        if buffer:
+            write("".join(buffer))
+    finally:
+        metrics.add(
+            "encode",
+            perf_counter() - start - write_seconds,
+            objects_encoded=sum(counts),
+        )
+        metrics.add("write", write_seconds, bytes_written=written)
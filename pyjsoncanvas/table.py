@@ -0,0 +1,281 @@
+# table.py
+from array import array
+from dataclasses import dataclass, field
+from json import dumps, loads, JSONDecodeError
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .exceptions import InvalidJsonError, InvalidNodeTypeError, NodeNotFoundError
+from .jsoncanvas import Canvas
+from .models import (
+    EdgesFromEndValue,
+    EdgesFromSideValue,
+    GroupNodeBackgroundStyle,
+    NodeType,
+    edge_from_dict,
+    node_from_dict,
+)
+from .stream import CHUNK_SIZE, Source, iter_dicts
+
+# Small integer codes for enum columns; -1 stands for an unset value. The
+# "to" side/end enums share their values with the "from" ones.
+NODE_TYPES = tuple(member.value for member in NodeType)
+SIDES = tuple(member.value for member in EdgesFromSideValue)
+ENDS = tuple(member.value for member in EdgesFromEndValue)
+BACKGROUND_STYLES = tuple(member.value for member in GroupNodeBackgroundStyle)
+
+_NODE_TYPE_CODES = {value: code for code, value in enumerate(NODE_TYPES)}
+_SIDE_CODES = {value: code for code, value in enumerate(SIDES)}
+_END_CODES = {value: code for code, value in enumerate(ENDS)}
+_BACKGROUND_STYLE_CODES = {
+    value: code for code, value in enumerate(BACKGROUND_STYLES)
+}
+
+# Optional string fields kept as plain columns, by node type.
+NODE_STRING_FIELDS = ("text", "file", "subpath", "url", "label", "background")
+
+
+def _code(codes: Dict[str, int], value: Optional[str]) -> int:
+    return -1 if value is None else codes[value]
+
+
+def _value(values: Tuple[str, ...], code: int) -> Optional[str]:
+    return None if code < 0 else values[code]
+
+
+@dataclass
+class CanvasTable:
+    """Column-oriented storage for a canvas.
+
+    Geometry and enum-like attributes live in contiguous ``array`` columns
+    indexed by row, so bulk computations need no per-node objects; the arrays
+    support the buffer protocol and can be wrapped by NumPy without copying.
+    Edges refer to nodes by row. An endpoint that names no node in the table
+    is stored as ``-1 - k``, where ``k`` indexes ``missing_ids``, so nodes
+    must be appended before the edges that refer to them.
+    """
+
+    ids: List[str] = field(default_factory=list)
+    types: array = field(default_factory=lambda: array("b"))
+    x: array = field(default_factory=lambda: array("q"))
+    y: array = field(default_factory=lambda: array("q"))
+    width: array = field(default_factory=lambda: array("q"))
+    height: array = field(default_factory=lambda: array("q"))
+    colors: array = field(default_factory=lambda: array("h"))
+    palette: List[str] = field(default_factory=list)
+    strings: Dict[str, List[Optional[str]]] = field(
+        default_factory=lambda: {name: [] for name in NODE_STRING_FIELDS}
+    )
+    background_styles: array = field(default_factory=lambda: array("b"))
+
+    edge_ids: List[str] = field(default_factory=list)
+    edge_from: array = field(default_factory=lambda: array("q"))
+    edge_to: array = field(default_factory=lambda: array("q"))
+    edge_from_sides: array = field(default_factory=lambda: array("b"))
+    edge_from_ends: array = field(default_factory=lambda: array("b"))
+    edge_to_sides: array = field(default_factory=lambda: array("b"))
+    edge_to_ends: array = field(default_factory=lambda: array("b"))
+    edge_colors: array = field(default_factory=lambda: array("h"))
+    edge_labels: List[Optional[str]] = field(default_factory=list)
+    missing_ids: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._rows = {node_id: row for row, node_id in enumerate(self.ids)}
+        self._missing = {node_id: -1 - k for k, node_id in enumerate(self.missing_ids)}
+        self._palette_codes = {color: code for code, color in enumerate(self.palette)}
+
+    @property
+    def node_count(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_ids)
+
+    def row(self, node_id: str) -> int:
+        try:
+            return self._rows[node_id]
+        except KeyError:
+            raise NodeNotFoundError("Node with id does not exist") from None
+
+    def endpoint_id(self, row: int) -> str:
+        return self.ids[row] if row >= 0 else self.missing_ids[-1 - row]
+
+    def _color_code(self, color: Optional[str]) -> int:
+        if color is None:
+            return -1
+        code = self._palette_codes.get(color)
+        if code is None:
+            code = self._palette_codes[color] = len(self.palette)
+            self.palette.append(color)
+        return code
+
+    def _endpoint(self, node_id: str) -> int:
+        row = self._rows.get(node_id)
+        if row is None:
+            row = self._missing.get(node_id)
+            if row is None:
+                self.missing_ids.append(node_id)
+                row = self._missing[node_id] = -len(self.missing_ids)
+        return row
+
+    def append_node(self, node: Dict[str, Any]) -> None:
+        node_type = node["type"]
+        if node_type not in _NODE_TYPE_CODES:
+            raise InvalidNodeTypeError(
+                f"Invalid or unsupported node type.The node {node['id']} has an invalid or unsupported type {node_type}."
+            )
+        node_id = node["id"]
+        self._rows[node_id] = len(self.ids)
+        self.ids.append(node_id)
+        self.types.append(_NODE_TYPE_CODES[node_type])
+        self.x.append(node["x"])
+        self.y.append(node["y"])
+        self.width.append(node["width"])
+        self.height.append(node["height"])
+        self.colors.append(self._color_code(node.get("color")))
+        for name, column in self.strings.items():
+            column.append(node.get(name))
+        self.background_styles.append(
+            _code(_BACKGROUND_STYLE_CODES, node.get("backgroundStyle"))
+        )
+
+    def append_edge(self, edge: Dict[str, Any]) -> None:
+        self.edge_ids.append(edge["id"])
+        self.edge_from.append(self._endpoint(edge["fromNode"]))
+        self.edge_to.append(self._endpoint(edge["toNode"]))
+        self.edge_from_sides.append(_code(_SIDE_CODES, edge.get("fromSide")))
+        self.edge_from_ends.append(_code(_END_CODES, edge.get("fromEnd")))
+        self.edge_to_sides.append(_code(_SIDE_CODES, edge.get("toSide")))
+        self.edge_to_ends.append(_code(_END_CODES, edge.get("toEnd")))
+        self.edge_colors.append(self._color_code(edge.get("color")))
+        self.edge_labels.append(edge.get("label"))
+
+    @classmethod
+    def from_dicts(
+        cls,
+        nodes: Iterable[Dict[str, Any]],
+        edges: Iterable[Dict[str, Any]],
+    ) -> "CanvasTable":
+        table = cls()
+        for node in nodes:
+            table.append_node(node)
+        for edge in edges:
+            table.append_edge(edge)
+        return table
+
+    @classmethod
+    def from_canvas(cls, canvas) -> "CanvasTable":
+        return cls.from_dicts(
+            (node.to_json_dict() for node in canvas.nodes),
+            (edge.to_json_dict() for edge in canvas.edges),
+        )
+
+    @classmethod
+    def from_json(cls, json_str: str) -> "CanvasTable":
+        try:
+            canvas_dict = loads(json_str)
+        except JSONDecodeError as e:
+            raise InvalidJsonError("Invalid or malformed JSON.") from e
+        return cls.from_dicts(canvas_dict.get("nodes", ()), canvas_dict.get("edges", ()))
+
+    @classmethod
+    def load(cls, source: Source, chunk_size: int = CHUNK_SIZE) -> "CanvasTable":
+        """Build a table straight from a canvas file without model objects."""
+        table = cls()
+        edges = []
+        for key, obj in iter_dicts(source, chunk_size):
+            if key == "nodes":
+                table.append_node(obj)
+            else:
+                edges.append(obj)
+        # Edges may precede nodes in the file; resolve endpoints at the end.
+        for edge in edges:
+            table.append_edge(edge)
+        return table
+
+    def node_dict(self, row: int) -> Dict[str, Any]:
+        node = {
+            "type": NODE_TYPES[self.types[row]],
+            "id": self.ids[row],
+            "x": self.x[row],
+            "y": self.y[row],
+            "width": self.width[row],
+            "height": self.height[row],
+        }
+        if self.colors[row] >= 0:
+            node["color"] = self.palette[self.colors[row]]
+        for name, column in self.strings.items():
+            if column[row] is not None:
+                node[name] = column[row]
+        if self.background_styles[row] >= 0:
+            node["backgroundStyle"] = BACKGROUND_STYLES[self.background_styles[row]]
+        return node
+
+    def edge_dict(self, row: int) -> Dict[str, Any]:
+        edge = {
+            "id": self.edge_ids[row],
+            "fromNode": self.endpoint_id(self.edge_from[row]),
+        }
+        for key, column, values in (
+            ("fromSide", self.edge_from_sides, SIDES),
+            ("fromEnd", self.edge_from_ends, ENDS),
+        ):
+            if column[row] >= 0:
+                edge[key] = values[column[row]]
+        edge["toNode"] = self.endpoint_id(self.edge_to[row])
+        for key, column, values in (
+            ("toSide", self.edge_to_sides, SIDES),
+            ("toEnd", self.edge_to_ends, ENDS),
+        ):
+            if column[row] >= 0:
+                edge[key] = values[column[row]]
+        if self.edge_colors[row] >= 0:
+            edge["color"] = self.palette[self.edge_colors[row]]
+        if self.edge_labels[row] is not None:
+            edge["label"] = self.edge_labels[row]
+        return edge
+
+    def iter_node_dicts(self) -> Iterator[Dict[str, Any]]:
+        return map(self.node_dict, range(self.node_count))
+
+    def iter_edge_dicts(self) -> Iterator[Dict[str, Any]]:
+        return map(self.edge_dict, range(self.edge_count))
+
+    def degrees(self) -> array:
+        """Number of edge endpoints at each node row."""
+        degrees = array("q", bytes(8 * self.node_count))
+        for rows in (self.edge_from, self.edge_to):
+            for row in rows:
+                if row >= 0:
+                    degrees[row] += 1
+        return degrees
+
+    def bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        """The ``(min_x, min_y, max_x, max_y)`` box enclosing every node."""
+        if not self.ids:
+            return None
+        return (
+            min(self.x),
+            min(self.y),
+            max(map(sum, zip(self.x, self.width))),
+            max(map(sum, zip(self.y, self.height))),
+        )
+
+    def to_canvas(self, validate: bool = True) -> Canvas:
+        """Build model objects for every row.
+
+        The table stores whatever it was given, so rows are validated like
+        ``Canvas.from_json`` unless ``validate=False`` is passed.
+        """
+        return Canvas(
+            nodes=[node_from_dict(node, validate) for node in self.iter_node_dicts()],
+            edges=[edge_from_dict(edge, validate) for edge in self.iter_edge_dicts()],
+        )
+
+    def to_json(self) -> str:
+        return dumps(
+            {
+                "nodes": list(self.iter_node_dicts()),
+                "edges": list(self.iter_edge_dicts()),
+            }
+        )
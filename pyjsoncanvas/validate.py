@@ -1,115 +1,218 @@
 # validate.py
+from dataclasses import dataclass
+from typing import Iterator, Optional, Type
+
+from .exceptions import (
+    InvalidColorValueError,
+    InvalidEdgeAttributeError,
+    InvalidEdgeConnectionError,
+    InvalidNodeAttributeError,
+    InvalidNodeTypeError,
+)
+from .models import (
+    Color,
+    Edge,
+    EdgesFromEndValue,
+    EdgesFromSideValue,
+    EdgesToEndValue,
+    EdgesToSideValue,
+    FileNode,
+    GenericNode,
+    GroupNode,
+    GroupNodeBackgroundStyle,
+    LinkNode,
+    NodeType,
+    TextNode,
+    color_error,
+)
+
+
+@dataclass
+class ValidationIssue:
+    """A single problem found while validating a node, edge or canvas."""
+
+    error: Type[Exception]
+    object_id: Optional[str]
+    field: Optional[str]
+    message: str
+
+    def exception(self) -> Exception:
+        return self.error(self.message)
+
+
+def node_issues(node) -> Iterator[ValidationIssue]:
+    """Yields every problem with the node, including subclass-specific attributes."""
+    if not isinstance(node, GenericNode):
+        yield ValidationIssue(
+            InvalidNodeTypeError,
+            getattr(node, "id", None),
+            None,
+            "Node is not a valid instance of Node.",
+        )
+        return
 
+    node_id = node.id if isinstance(node.id, str) else None
 
-# second param for no exceptions only return bool
-def validate_node(node) -> bool:
-    from .models import (
-        GenericNode,
-        NodeType,
-        GroupNodeBackgroundStyle,
-        GroupNode,
-        TextNode,
-        FileNode,
-        LinkNode,
-        Color,
-    )
-    from .exceptions import InvalidNodeTypeError, InvalidNodeAttributeError
-
-    """Validates  the node, and if is a inherited class from Node, then checks those special attributes."""
-    if not isinstance(node, GenericNode):
-        raise InvalidNodeTypeError("Node is not a valid instance of Node.")
+    def issue(error, field, message):
+        return ValidationIssue(error, node_id, field, message)
 
-    if not isinstance(node.id, str):
-        raise InvalidNodeAttributeError("Node ID is invalid or missing.")
+    if node_id is None:
+        yield issue(InvalidNodeAttributeError, "id", "Node ID is invalid or missing.")
 
     if not isinstance(node.type, NodeType):
-        raise InvalidNodeTypeError("Node type is invalid or missing.")
+        yield issue(InvalidNodeTypeError, "type", "Node type is invalid or missing.")
 
     if not isinstance(node.x, int):
-        raise InvalidNodeAttributeError("Node x is invalid or missing.")
+        yield issue(InvalidNodeAttributeError, "x", "Node x is invalid or missing.")
 
     if not isinstance(node.y, int):
-        raise InvalidNodeAttributeError("Node y is invalid or missing.")
+        yield issue(InvalidNodeAttributeError, "y", "Node y is invalid or missing.")
 
     if not isinstance(node.width, int):
-        raise InvalidNodeAttributeError("Node width is invalid or missing.")
+        yield issue(
+            InvalidNodeAttributeError, "width", "Node width is invalid or missing."
+        )
 
     if not isinstance(node.height, int):
-        raise InvalidNodeAttributeError("Node height is invalid or missing.")
+        yield issue(
+            InvalidNodeAttributeError, "height", "Node height is invalid or missing."
+        )
 
     if node.color is not None and not isinstance(node.color, Color):
-        raise InvalidNodeAttributeError("Node color is invalid or missing.")
+        yield issue(
+            InvalidNodeAttributeError, "color", "Node color is invalid or missing."
+        )
+    elif node.color is not None:
+        message = color_error(node.color)
+        if message is not None:
+            yield issue(InvalidColorValueError, "color", message)
 
     if isinstance(node, TextNode) and not isinstance(node.text, str):
-        raise InvalidNodeAttributeError("TextNode text is invalid or missing.")
+        yield issue(
+            InvalidNodeAttributeError, "text", "TextNode text is invalid or missing."
+        )
 
     if isinstance(node, FileNode):
         if not isinstance(node.file, str):
-            raise InvalidNodeAttributeError("FileNode file is invalid or missing.")
+            yield issue(
+                InvalidNodeAttributeError,
+                "file",
+                "FileNode file is invalid or missing.",
+            )
         if node.subpath is not None and not isinstance(node.subpath, str):
-            raise InvalidNodeAttributeError("FileNode subpath is invalid or missing.")
+            yield issue(
+                InvalidNodeAttributeError,
+                "subpath",
+                "FileNode subpath is invalid or missing.",
+            )
 
     if isinstance(node, LinkNode) and not isinstance(node.url, str):
-        raise InvalidNodeAttributeError("LinkNode url is invalid or missing.")
+        yield issue(
+            InvalidNodeAttributeError, "url", "LinkNode url is invalid or missing."
+        )
 
     if isinstance(node, GroupNode):
         if node.label is not None and not isinstance(node.label, str):
-            raise InvalidNodeAttributeError("GroupNode label is invalid or missing.")
+            yield issue(
+                InvalidNodeAttributeError,
+                "label",
+                "GroupNode label is invalid or missing.",
+            )
 
         if node.background is not None and not isinstance(node.background, str):
-            raise InvalidNodeAttributeError(
-                "GroupNode background is invalid or missing."
+            yield issue(
+                InvalidNodeAttributeError,
+                "background",
+                "GroupNode background is invalid or missing.",
             )
 
         if node.backgroundStyle is not None and not isinstance(
             node.backgroundStyle, GroupNodeBackgroundStyle
         ):
-            raise InvalidNodeAttributeError(
-                "GroupNode backgroundStyle is invalid or missing."
+            yield issue(
+                InvalidNodeAttributeError,
+                "backgroundStyle",
+                "GroupNode backgroundStyle is invalid or missing.",
             )
 
-    return True
 
+def edge_issues(edge) -> Iterator[ValidationIssue]:
+    """Yields every problem with the edge's own attributes."""
+    if not isinstance(edge, Edge):
+        yield ValidationIssue(
+            InvalidEdgeAttributeError,
+            getattr(edge, "id", None),
+            None,
+            "Edge is not a valid instance of Edge.",
+        )
+        return
 
-def validate_edge(edge) -> bool:
-    from .models import (
-        Edge,
-        EdgesFromEndValue,
-        EdgesFromSideValue,
-        EdgesToEndValue,
-        EdgesToSideValue,
-        Color,
-    )
-    from .exceptions import InvalidEdgeAttributeError, InvalidEdgeConnectionError
+    edge_id = edge.id if isinstance(edge.id, str) else None
 
-    if not isinstance(edge, Edge):
-        raise InvalidEdgeAttributeError("Edge is not a valid instance of Edge.")
+    def issue(error, field, message):
+        return ValidationIssue(error, edge_id, field, message)
 
-    if not isinstance(edge.id, str):
-        raise InvalidEdgeAttributeError("Edge ID is invalid or missing.")
+    if edge_id is None:
+        yield issue(InvalidEdgeAttributeError, "id", "Edge ID is invalid or missing.")
 
     if not isinstance(edge.fromNode, str):
-        raise InvalidEdgeConnectionError("Edge fromNode is invalid or missing.")
+        yield issue(
+            InvalidEdgeConnectionError,
+            "fromNode",
+            "Edge fromNode is invalid or missing.",
+        )
 
     if edge.fromSide is not None and not isinstance(edge.fromSide, EdgesFromSideValue):
-        raise InvalidEdgeAttributeError("Edge fromSide is invalid or missing.")
+        yield issue(
+            InvalidEdgeAttributeError,
+            "fromSide",
+            "Edge fromSide is invalid or missing.",
+        )
 
     if edge.fromEnd is not None and not isinstance(edge.fromEnd, EdgesFromEndValue):
-        raise InvalidEdgeAttributeError("Edge fromEnd is invalid or missing.")
+        yield issue(
+            InvalidEdgeAttributeError, "fromEnd", "Edge fromEnd is invalid or missing."
+        )
 
     if not isinstance(edge.toNode, str):
-        raise InvalidEdgeConnectionError("Edge toNode is invalid or missing.")
+        yield issue(
+            InvalidEdgeConnectionError, "toNode", "Edge toNode is invalid or missing."
+        )
 
     if edge.toSide is not None and not isinstance(edge.toSide, EdgesToSideValue):
-        raise InvalidEdgeAttributeError("Edge toSide is invalid or missing.")
+        yield issue(
+            InvalidEdgeAttributeError, "toSide", "Edge toSide is invalid or missing."
+        )
 
     if edge.toEnd is not None and not isinstance(edge.toEnd, EdgesToEndValue):
-        raise InvalidEdgeAttributeError("Edge toEnd is invalid or missing.")
+        yield issue(
+            InvalidEdgeAttributeError, "toEnd", "Edge toEnd is invalid or missing."
+        )
 
     if edge.color is not None and not isinstance(edge.color, Color):
-        raise InvalidEdgeAttributeError("Edge color is invalid or missing.")
+        yield issue(
+            InvalidEdgeAttributeError, "color", "Edge color is invalid or missing."
+        )
+    elif edge.color is not None:
+        message = color_error(edge.color)
+        if message is not None:
+            yield issue(InvalidColorValueError, "color", message)
 
     if edge.label is not None and not isinstance(edge.label, str):
-        raise InvalidEdgeAttributeError("Edge label is invalid or missing.")
+        yield issue(
+            InvalidEdgeAttributeError, "label", "Edge label is invalid or missing."
+        )
+
+
+# second param for no exceptions only return bool
+def validate_node(node) -> bool:
+    """Validates  the node, and if is a inherited class from Node, then checks those special attributes."""
+    for issue in node_issues(node):
+        raise issue.exception()
+    return True
 
+
+def validate_edge(edge) -> bool:
+    for issue in edge_issues(edge):
+        raise issue.exception()
     return True
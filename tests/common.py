@@ -0,0 +1,224 @@
+# common.py
+"""Random canvases and brute-force reference implementations for the tests."""
+import random
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from pyjsoncanvas import (
+    Canvas,
+    Color,
+    Edge,
+    EdgesFromEndValue,
+    EdgesFromSideValue,
+    EdgesToEndValue,
+    EdgesToSideValue,
+    FileNode,
+    GenericNode,
+    GroupNode,
+    GroupNodeBackgroundStyle,
+    LinkNode,
+    TextNode,
+)
+
+WORDS = ["alpha", "beta", "gamma", "Delta", "naïve", "x_y", "foo-bar", "2024"]
+COLORS = [None, Color("1"), Color("#ff8800")]
+
+
+def random_text(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 3)))
+
+
+def random_node(rng: random.Random, node_id: str) -> GenericNode:
+    geometry = {
+        "x": rng.randint(-500, 500),
+        "y": rng.randint(-500, 500),
+        "width": rng.randint(1, 300),
+        "height": rng.randint(1, 300),
+        "color": rng.choice(COLORS),
+        "id": node_id,
+    }
+    kind = rng.random()
+    if kind < 0.25:
+        geometry["width"] *= 3
+        geometry["height"] *= 3
+        return GroupNode(
+            label=random_text(rng) or None,
+            backgroundStyle=rng.choice([None, *GroupNodeBackgroundStyle]),
+            **geometry,
+        )
+    if kind < 0.4:
+        return FileNode(file=f"notes/{random_text(rng)}.md", **geometry)
+    if kind < 0.5:
+        return LinkNode(url=f"https://example.com/{node_id}", **geometry)
+    return TextNode(text=random_text(rng), **geometry)
+
+
+def random_edge(rng: random.Random, node_ids: List[str], edge_id: str) -> Edge:
+    return Edge(
+        fromNode=rng.choice(node_ids),
+        toNode=rng.choice(node_ids),
+        fromSide=rng.choice([None, *EdgesFromSideValue]),
+        fromEnd=rng.choice([None, *EdgesFromEndValue]),
+        toSide=rng.choice([None, *EdgesToSideValue]),
+        toEnd=rng.choice([None, *EdgesToEndValue]),
+        color=rng.choice(COLORS),
+        label=random_text(rng) or None,
+        id=edge_id,
+    )
+
+
+def random_canvas(rng: random.Random, node_count: int, edge_count: int) -> Canvas:
+    nodes = [random_node(rng, f"n{i}") for i in range(node_count)]
+    node_ids = [node.id for node in nodes]
+    edges = [random_edge(rng, node_ids, f"e{i}") for i in range(edge_count)]
+    return Canvas(nodes=nodes, edges=edges)
+
+
+class Mutator:
+    """Applies random mutations through the public API."""
+
+    def __init__(self, canvas: Canvas, rng: random.Random):
+        self.canvas = canvas
+        self.rng = rng
+        self.count = 0
+
+    def new_id(self, prefix: str) -> str:
+        self.count += 1
+        return f"{prefix}{self.count}"
+
+    def step(self) -> None:
+        canvas, rng = self.canvas, self.rng
+        node_ids = [node.id for node in canvas.nodes]
+        edge_ids = [edge.id for edge in canvas.edges]
+        op = rng.random()
+        if op < 0.15 or not node_ids:
+            canvas.add_node(random_node(rng, self.new_id("a")))
+        elif op < 0.25:
+            canvas.remove_node(rng.choice(node_ids))
+        elif op < 0.35:
+            canvas.add_edge(random_edge(rng, node_ids, self.new_id("f")))
+        elif op < 0.42 and edge_ids:
+            canvas.remove_edge(rng.choice(edge_ids))
+        elif op < 0.57:
+            node = canvas.get_node(rng.choice(node_ids))
+            node.x += rng.randint(-200, 200)
+            node.y += rng.randint(-200, 200)
+        elif op < 0.64:
+            node = canvas.get_node(rng.choice(node_ids))
+            node.width = rng.randint(1, 900)
+        elif op < 0.72:
+            node = canvas.get_node(rng.choice(node_ids))
+            if isinstance(node, TextNode):
+                node.text = random_text(rng)
+            elif isinstance(node, GroupNode):
+                node.label = random_text(rng) or None
+        elif op < 0.78 and edge_ids:
+            edge = canvas.get_edge(rng.choice(edge_ids))
+            edge.label = random_text(rng) or None
+        elif op < 0.8:
+            canvas.rename_node(rng.choice(node_ids), self.new_id("r"))
+        elif op < 0.82 and edge_ids:
+            canvas.rename_edge(rng.choice(edge_ids), self.new_id("s"))
+        elif op < 0.85:
+            # Direct assignment; the edges are re-pointed by hand.
+            node = canvas.get_node(rng.choice(node_ids))
+            old_id, node.id = node.id, self.new_id("d")
+            for edge in list(canvas.edges):
+                if edge.fromNode == old_id:
+                    edge.fromNode = node.id
+                if edge.toNode == old_id:
+                    edge.toNode = node.id
+        elif op < 0.88 and edge_ids:
+            edge = canvas.get_edge(rng.choice(edge_ids))
+            if rng.random() < 0.5:
+                edge.fromNode = rng.choice(node_ids)
+            else:
+                edge.toNode = rng.choice(node_ids)
+        elif op < 0.94:
+            with canvas.batch():
+                for _ in range(rng.randint(1, 4)):
+                    if canvas.nodes and rng.random() < 0.5:
+                        canvas.remove_node(rng.choice(canvas.nodes).id)
+                    canvas.add_node(random_node(rng, self.new_id("b")))
+        else:
+            ids = rng.sample(node_ids, min(len(node_ids), 2))
+            canvas.remove_nodes(ids)
+
+
+def box(node: GenericNode) -> Tuple[int, int, int, int]:
+    return (node.x, node.y, node.x + node.width, node.y + node.height)
+
+
+def nodes_in_rect(canvas: Canvas, x0, y0, x1, y1) -> Set[str]:
+    return {
+        node.id
+        for node in canvas.nodes
+        if node.x <= x1 and x0 <= node.x + node.width
+        and node.y <= y1 and y0 <= node.y + node.height
+    }
+
+
+def distance(node: GenericNode, x: float, y: float) -> float:
+    dx = max(node.x - x, 0, x - node.x - node.width)
+    dy = max(node.y - y, 0, y - node.y - node.height)
+    return (dx * dx + dy * dy) ** 0.5
+
+
+def enclosing_groups(canvas: Canvas, node: GenericNode) -> List[GroupNode]:
+    """Every group enclosing ``node``, innermost first."""
+    x0, y0, x1, y1 = box(node)
+    groups = []
+    for group in canvas.nodes:
+        if group is node or not isinstance(group, GroupNode):
+            continue
+        gx0, gy0, gx1, gy1 = box(group)
+        if not (gx0 <= x0 and gy0 <= y0 and x1 <= gx1 and y1 <= gy1):
+            continue
+        if isinstance(node, GroupNode) and box(node) == box(group):
+            if group.id < node.id:
+                continue
+        groups.append(group)
+    return sorted(groups, key=lambda group: (group.width * group.height, group.id))
+
+
+SEARCH_FIELDS = {TextNode: "text", GroupNode: "label", FileNode: "file", LinkNode: "url"}
+
+
+def searchable(obj) -> Optional[str]:
+    if isinstance(obj, Edge):
+        return obj.label
+    for cls, name in SEARCH_FIELDS.items():
+        if isinstance(obj, cls):
+            return getattr(obj, name)
+    return None
+
+
+def search(canvas: Canvas, query: str, match: str) -> Set[Tuple[str, str]]:
+    words = re.findall(r"\w+", query.lower())
+    found = set()
+    for kind, objects in (("node", canvas.nodes), ("edge", canvas.edges)):
+        for obj in objects:
+            text = searchable(obj)
+            if not text:
+                continue
+            text = text.lower()
+            tokens = re.findall(r"\w+", text)
+            if match == "substring":
+                ok = bool(query) and query.lower() in text
+            elif match == "token":
+                ok = bool(words) and all(word in tokens for word in words)
+            else:
+                ok = bool(words) and all(
+                    any(token.startswith(word) for token in tokens) for word in words
+                )
+            if ok:
+                found.add((kind, obj.id))
+    return found
+
+
+def json_by_id(canvas: Canvas) -> Dict[str, Dict[str, dict]]:
+    """The JSON dicts of a canvas keyed by ID, ignoring order."""
+    return {
+        "nodes": {node.id: node.to_json_dict() for node in canvas.nodes},
+        "edges": {edge.id: edge.to_json_dict() for edge in canvas.edges},
+    }
@@ -0,0 +1,78 @@
+# test_adjacency.py
+"""The ID index and incoming/outgoing adjacency of Canvas against brute force."""
+import random
+
+import pytest
+
+from pyjsoncanvas import Canvas, Edge, TextNode
+
+from .common import Mutator, random_canvas
+
+
+def check_lists(canvas: Canvas) -> None:
+    nodes, edges = canvas.nodes, canvas.edges
+    assert len(canvas._node_index) == len(nodes)
+    assert len(canvas._edge_index) == len(edges)
+    for node in nodes:
+        assert canvas.get_node(node.id) is node
+    for edge in edges:
+        assert canvas.get_edge(edge.id) is edge
+    for node in nodes:
+        expected = {e.id for e in edges if node.id in (e.fromNode, e.toNode)}
+        connections = canvas.get_connections(node.id)
+        assert len(connections) == len(expected)
+        assert {edge.id for edge in connections} == expected
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_lists_and_adjacency_follow_random_mutations(seed):
+    rng = random.Random(seed)
+    canvas = random_canvas(rng, 30, 50)
+    mutator = Mutator(canvas, rng)
+    for _ in range(150):
+        mutator.step()
+        check_lists(canvas)
+    assert canvas.validate()
+
+
+def test_direct_endpoint_changes_are_followed():
+    nodes = [TextNode(x=0, y=0, width=1, height=1, id=node_id) for node_id in "abc"]
+    canvas = Canvas(nodes=nodes, edges=[Edge(fromNode="a", toNode="b", id="e")])
+    edge = canvas.get_edge("e")
+    edge.toNode = "c"
+    assert canvas.get_connections("b") == []
+    assert canvas.get_connections("c") == [edge]
+    assert canvas.get_adjacent_nodes("a") == [canvas.get_node("c")]
+    canvas.remove_node("c")
+    assert canvas.edges == []
+    assert canvas.validate()
+
+    canvas.add_edge(Edge(fromNode="a", toNode="b", id="f"))
+    canvas.get_edge("f").fromNode = "b"
+    canvas.remove_nodes(["b"])
+    assert canvas.edges == []
+    assert canvas.validate()
+
+
+def test_removals_keep_order_and_interleave_with_additions():
+    rng = random.Random(0)
+    canvas = random_canvas(rng, 50, 0)
+    expected = [node.id for node in canvas.nodes]
+    with canvas.batch():
+        for _ in range(40):
+            removed = expected.pop(rng.randrange(len(expected)))
+            canvas.remove_node(removed)
+            node = canvas.get_node(expected[0])
+            canvas.remove_node(node.id)
+            canvas.add_node(node)
+            expected.append(expected.pop(0))
+    assert [node.id for node in canvas.nodes] == expected
+
+
+def test_removed_edges_are_not_followed():
+    nodes = [TextNode(x=0, y=0, width=1, height=1, id=node_id) for node_id in "ab"]
+    canvas = Canvas(nodes=nodes, edges=[Edge(fromNode="a", toNode="b", id="e")])
+    edge = canvas.get_edge("e")
+    canvas.remove_edge("e")
+    edge.toNode = "a"
+    assert canvas.get_connections("a") == []
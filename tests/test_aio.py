@@ -0,0 +1,87 @@
+# test_aio.py
+"""aload and aexport under asyncio.run."""
+import asyncio
+import io
+import json
+import random
+import threading
+import time
+
+import pytest
+
+from pyjsoncanvas import Canvas
+from pyjsoncanvas import aio
+
+from .common import random_canvas
+
+
+@pytest.fixture
+def limit():
+    yield aio.set_max_concurrency
+    aio.set_max_concurrency(aio.DEFAULT_MAX_CONCURRENCY)
+
+
+class SlowSource(io.StringIO):
+    """A file object that records how many reads run at the same time."""
+
+    lock = threading.Lock()
+    running = 0
+    most = 0
+
+    def read(self, size=-1):
+        cls = type(self)
+        with cls.lock:
+            cls.running += 1
+            cls.most = max(cls.most, cls.running)
+        try:
+            time.sleep(0.01)
+            return super().read(size)
+        finally:
+            with cls.lock:
+                cls.running -= 1
+
+
+def test_aexport_and_aload_round_trip(tmp_path):
+    canvas = random_canvas(random.Random(0), 50, 80)
+    path = str(tmp_path / "out.canvas")
+
+    async def main():
+        await canvas.aexport(path, indent=2)
+        return await Canvas.aload(path)
+
+    loaded = asyncio.run(main())
+    assert loaded.to_json() == canvas.to_json()
+    with open(path, encoding="utf-8") as fp:
+        assert fp.read() == json.dumps(json.loads(canvas.to_json()), indent=2)
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 2, 3])
+def test_concurrent_loads_are_limited(limit, max_concurrency):
+    limit(max_concurrency)
+    text = random_canvas(random.Random(1), 6, 4).to_json()
+    SlowSource.most = 0
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0.001)
+
+    async def main():
+        beat = asyncio.ensure_future(ticker())
+        canvases = await asyncio.gather(
+            *(Canvas.aload(SlowSource(text), chunk_size=512) for _ in range(8))
+        )
+        beat.cancel()
+        return canvases
+
+    canvases = asyncio.run(main())
+    assert all(canvas.to_json() == text for canvas in canvases)
+    assert SlowSource.most == max_concurrency
+    # The event loop kept running while the loads were in progress.
+    assert len(ticks) > 10
+
+
+def test_invalid_limit():
+    with pytest.raises(ValueError):
+        aio.set_max_concurrency(0)
@@ -0,0 +1,114 @@
+# test_batch.py
+"""add_nodes/add_edges and batch() against one call per object."""
+import random
+
+import pytest
+
+from pyjsoncanvas import (
+    Canvas,
+    EdgeIDConflictError,
+    InvalidNodeAttributeError,
+    NodeIDConflictError,
+    TextNode,
+)
+
+from .common import random_canvas, random_edge, random_node
+
+
+def build(seed: int, lazy: bool = False):
+    """A canvas with every derived index built and objects to add to it."""
+    rng = random.Random(seed)
+    text = random_canvas(rng, 20, 20).to_json()
+    canvas = Canvas.from_json(text, lazy=lazy)
+    if not lazy:
+        canvas.spatial_index
+        canvas.group_hierarchy
+        canvas.search_index
+        canvas.track_changes()
+    nodes = [random_node(rng, f"new{i}") for i in range(30)]
+    node_ids = [f"n{i}" for i in range(20)] + [node.id for node in nodes]
+    edges = [random_edge(rng, node_ids, f"f{i}") for i in range(40)]
+    return canvas, nodes, edges
+
+
+def check_like(bulk: Canvas, single: Canvas) -> None:
+    assert bulk.to_json() == single.to_json()
+    for node in single.nodes:
+        assert bulk.get_node(node.id).to_json_dict() == node.to_json_dict()
+        assert {e.id for e in bulk.get_connections(node.id)} == {
+            e.id for e in single.get_connections(node.id)
+        }
+        assert [n.id for n in bulk.enclosing_groups(node.id)] == [
+            n.id for n in single.enclosing_groups(node.id)
+        ]
+        assert {n.id for n in bulk.nodes_at_point(node.x, node.y)} == {
+            n.id for n in single.nodes_at_point(node.x, node.y)
+        }
+    assert {o.id for o in bulk.search("alpha")} == {
+        o.id for o in single.search("alpha")
+    }
+    assert bulk.make_patch() == single.make_patch()
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("batched", [False, True])
+def test_bulk_additions_match_single_additions(seed, batched):
+    bulk, nodes, edges = build(seed)
+    single, single_nodes, single_edges = build(seed)
+    if batched:
+        with bulk.batch():
+            bulk.add_nodes(nodes)
+            bulk.add_edges(edges)
+    else:
+        bulk.add_nodes(nodes)
+        bulk.add_edges(edges)
+    for node in single_nodes:
+        single.add_node(node)
+    for edge in single_edges:
+        single.add_edge(edge)
+    check_like(bulk, single)
+    # Added objects are followed like any other member.
+    for node in nodes[:5]:
+        node.x += 1000
+        node.id = node.id + "-moved"
+    for node in single_nodes[:5]:
+        node.x += 1000
+        node.id = node.id + "-moved"
+    for edge, single_edge in zip(edges[:5], single_edges[:5]):
+        edge.toNode = single_edge.toNode = nodes[0].id
+    check_like(bulk, single)
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_bulk_additions_to_a_lazy_canvas(seed):
+    bulk, nodes, edges = build(seed, lazy=True)
+    single, single_nodes, single_edges = build(seed)
+    bulk.add_nodes(nodes)
+    bulk.add_edges(edges)
+    single.add_nodes(single_nodes)
+    for edge in single_edges:
+        single.add_edge(edge)
+    edges[0].fromNode = single_edges[0].fromNode = nodes[1].id
+    for node in single.nodes:
+        assert {e.id for e in bulk.get_connections(node.id)} == {
+            e.id for e in single.get_connections(node.id)
+        }
+    assert bulk.to_json() == single.to_json()
+
+
+def test_bulk_additions_are_all_or_nothing():
+    canvas, nodes, edges = build(0)
+    before = canvas.to_json()
+    bad = TextNode(x=0, y=0, width=1, height=1, text="", id="bad")
+    bad.x = "1"
+    with pytest.raises(InvalidNodeAttributeError):
+        canvas.add_nodes(nodes + [bad])
+    with pytest.raises(NodeIDConflictError):
+        canvas.add_nodes(nodes + [nodes[0]])
+    with pytest.raises(NodeIDConflictError):
+        canvas.add_nodes([nodes[0], random_node(random.Random(0), "n0")])
+    with pytest.raises(EdgeIDConflictError):
+        canvas.add_edges([random_edge(random.Random(0), ["n0"], "e0")])
+    assert canvas.to_json() == before
+    assert canvas.make_patch() == []
+    assert all(type(node) is node.__class__ for node in nodes)
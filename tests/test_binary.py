@@ -0,0 +1,114 @@
+# test_binary.py
+"""Round trips through the binary format and rejection of corrupt data."""
+import random
+
+import pytest
+
+from pyjsoncanvas import (
+    Canvas,
+    Edge,
+    FileNode,
+    GroupNode,
+    InvalidBinaryError,
+    InvalidNodeAttributeError,
+    LinkNode,
+    OrphanEdgeError,
+    TextNode,
+)
+from pyjsoncanvas.exceptions import CanvasValidationError
+
+from .common import random_canvas
+
+
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_binary_round_trip(seed, compress):
+    canvas = random_canvas(random.Random(seed), 60, 80)
+    data = canvas.to_binary(compress=compress)
+    restored = Canvas.from_binary(data)
+    assert restored.to_json() == canvas.to_json()
+    assert [obj.__class__ for obj in restored.nodes] == [
+        obj.__class__ for obj in canvas.nodes
+    ]
+    assert Canvas.from_binary(data, validate=False).to_binary(compress) == data
+
+
+def test_every_field_and_unusual_values():
+    canvas = Canvas(
+        nodes=[
+            TextNode(
+                id="t", x=-(2**63), y=2**63 - 1, width=0, height=1,
+                text="é\U0001f600", color="1",
+            ),
+            FileNode(id="f", x=0, y=0, width=1, height=1, file="a.md", subpath="#h"),
+            LinkNode(
+                id="l", x=0, y=0, width=1, height=1, url="https://x", color="#aBc123"
+            ),
+            GroupNode(
+                id="g", x=0, y=0, width=1, height=1, label="", background="b",
+                backgroundStyle="ratio",
+            ),
+            GroupNode(id="h", x=0, y=0, width=1, height=1),
+        ],
+        edges=[
+            Edge(id="e", fromNode="t", toNode="g", fromSide="left", fromEnd="arrow",
+                 toSide="bottom", toEnd="none", color="#aBc123", label="t"),
+            Edge(id="d", fromNode="g", toNode="g"),
+        ],
+    )
+    for compress in (False, True):
+        data = canvas.to_binary(compress)
+        assert Canvas.from_binary(data).to_json() == canvas.to_json()
+
+
+def test_empty_canvas():
+    canvas = Canvas(nodes=[], edges=[])
+    assert Canvas.from_binary(canvas.to_binary()).to_json() == canvas.to_json()
+
+
+def test_files(tmp_path):
+    canvas = random_canvas(random.Random(1), 20, 20)
+    path = str(tmp_path / "a.bin")
+    canvas.export_binary(path, compress=True)
+    assert Canvas.load_binary(path).to_json() == canvas.to_json()
+    with open(path, "rb") as fp:
+        assert Canvas.load_binary(fp).to_json() == canvas.to_json()
+
+
+def test_corrupt_data_is_rejected():
+    data = random_canvas(random.Random(2), 10, 10).to_binary()
+    for bad in (b"", b"nope", data[:-1], data + b"\0", data[:10], b"X" + data[1:]):
+        with pytest.raises(InvalidBinaryError):
+            Canvas.from_binary(bad)
+    compressed = random_canvas(random.Random(2), 10, 10).to_binary(compress=True)
+    with pytest.raises(InvalidBinaryError):
+        Canvas.from_binary(compressed[:-3])
+    # Flipping bytes either raises InvalidBinaryError or decodes to something.
+    rng = random.Random(3)
+    for _ in range(200):
+        flipped = bytearray(data)
+        flipped[rng.randrange(len(data))] ^= 1 << rng.randrange(8)
+        try:
+            Canvas.from_binary(bytes(flipped), validate=False)
+        except InvalidBinaryError:
+            pass
+
+
+def test_validation_after_decoding():
+    canvas = Canvas(
+        nodes=[TextNode(id="a", x=0, y=0, width=1, height=1, text="")],
+        edges=[Edge(id="e", fromNode="a", toNode="gone")],
+    )
+    data = canvas.to_binary()
+    with pytest.raises(CanvasValidationError) as info:
+        Canvas.from_binary(data)
+    assert isinstance(info.value.__cause__, OrphanEdgeError)
+    assert Canvas.from_binary(data, validate=False).edges[0].toNode == "gone"
+
+
+def test_unencodable_geometry():
+    node = TextNode(id="a", x=0, y=0, width=1, height=1, text="")
+    canvas = Canvas(nodes=[node], edges=[])
+    node.x = 2**63
+    with pytest.raises(InvalidNodeAttributeError):
+        canvas.to_binary()
@@ -0,0 +1,80 @@
+# test_changes.py
+"""Change tracking and patches."""
+import json
+import random
+
+import pytest
+
+from pyjsoncanvas import (
+    Canvas,
+    Edge,
+    InvalidEdgeAttributeError,
+    InvalidJsonError,
+    TextNode,
+)
+
+from .common import Mutator, json_by_id, random_canvas
+
+
+def copy_of(canvas: Canvas) -> Canvas:
+    return Canvas.from_json(canvas.to_json())
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_patch_replays_random_mutations(seed):
+    rng = random.Random(seed)
+    canvas = random_canvas(rng, 30, 40)
+    replica = copy_of(canvas)
+    canvas.track_changes()
+    mutator = Mutator(canvas, rng)
+    for _ in range(rng.randint(1, 80)):
+        mutator.step()
+    patch = json.loads(json.dumps(canvas.make_patch(clear=True)))
+    replica.apply_patch(patch)
+    assert json_by_id(replica) == json_by_id(canvas)
+    assert canvas.make_patch() == []
+
+
+def test_patch_folds_changes_per_object():
+    canvas = Canvas(nodes=[], edges=[])
+    canvas.track_changes()
+    node = TextNode(x=0, y=0, width=10, height=10, text="a", id="a")
+    canvas.add_node(node)
+    node.x = 5
+    canvas.add_node(TextNode(x=0, y=0, width=10, height=10, id="gone"))
+    canvas.remove_node("gone")
+    assert canvas.make_patch() == [{"op": "add_node", "value": node.to_json_dict()}]
+
+
+def test_updates_name_the_original_id():
+    canvas = Canvas(
+        nodes=[TextNode(x=0, y=0, width=1, height=1, text="", id="a")], edges=[]
+    )
+    canvas.track_changes()
+    node = canvas.get_node("a")
+    node.x = 3
+    node.id = "b"
+    node.x = 4
+    assert canvas.make_patch() == [
+        {"op": "update_node", "id": "a", "fields": {"x": 4, "id": "b"}}
+    ]
+
+
+def test_untracked_canvas_has_an_empty_patch():
+    canvas = random_canvas(random.Random(0), 5, 5)
+    canvas.nodes[0].x += 1
+    assert canvas.make_patch() == []
+
+
+def test_unknown_operation():
+    with pytest.raises(InvalidJsonError):
+        Canvas(nodes=[], edges=[]).apply_patch([{"op": "move_node", "id": "a"}])
+
+
+def test_invalid_patch_values_are_validated():
+    canvas = Canvas(nodes=[], edges=[])
+    edge = Edge(fromNode="a", toNode="b", id="e").to_json_dict()
+    edge["label"] = 3
+    with pytest.raises(InvalidEdgeAttributeError):
+        canvas.apply_patch([{"op": "add_edge", "value": edge}])
+    assert canvas.edges == []
@@ -0,0 +1,80 @@
+# test_color.py
+"""Interned colors."""
+import copy
+import json
+import pickle
+
+import pytest
+
+from pyjsoncanvas import Canvas, Color, Edge, TextNode
+from pyjsoncanvas.exceptions import InvalidColorValueError
+from pyjsoncanvas.models import PresetOrHex
+
+INVALID = ["", "0", "7", "12", "red", "#12345", "#1234567", "#gggggg", "ff8800"]
+
+
+def test_equal_colors_are_the_same_object():
+    for value, kind in (("1", PresetOrHex.PRESET), ("#Ff8800", PresetOrHex.HEX)):
+        color = Color(value)
+        assert Color(value) is color
+        assert color.color == value and color.preset_or_hex is kind
+        assert copy.copy(color) is color and copy.deepcopy(color) is color
+        assert pickle.loads(pickle.dumps(color)) is color
+        node = TextNode(x=0, y=0, width=1, height=1, text="", color=value)
+        edge = Edge(fromNode="a", toNode="b", color=value)
+        assert node.color is color and edge.color is color
+    # Different spellings are different values.
+    assert Color("#ff8800") is not Color("#FF8800")
+    assert {Color("2"): 1}[Color("2")] == 1
+
+
+def test_loaded_colors_are_interned():
+    text = json.dumps(
+        {
+            "nodes": [
+                {"type": "text", "id": i, "x": 0, "y": 0, "width": 1,
+                 "height": 1, "text": "", "color": "#00ff00"}
+                for i in "ab"
+            ],
+            "edges": [{"id": "e", "fromNode": "a", "toNode": "b", "color": "#00ff00"}],
+        }
+    )
+    for validate in (True, False):
+        canvas = Canvas.from_json(text, validate=validate)
+        colors = {id(obj.color) for obj in canvas.nodes + canvas.edges}
+        assert colors == {id(Color("#00ff00"))}
+
+
+def test_colors_are_immutable():
+    with pytest.raises(AttributeError):
+        Color("3").color = "4"
+
+
+@pytest.mark.parametrize("value", INVALID)
+def test_invalid_colors_raise_every_time(value):
+    for _ in range(2):
+        with pytest.raises(InvalidColorValueError):
+            Color(value)
+        with pytest.raises(InvalidColorValueError):
+            TextNode(x=0, y=0, width=1, height=1, text="", color=value)
+
+
+@pytest.mark.parametrize("value", INVALID)
+def test_trusted_invalid_colors_stay_invalid(value):
+    text = json.dumps(
+        {
+            "nodes": [{"type": "text", "id": "a", "x": 0, "y": 0, "width": 1,
+                       "height": 1, "text": "", "color": value}],
+            "edges": [],
+        }
+    )
+    first = Canvas.from_json(text, validate=False).nodes[0].color
+    # The unchecked value is shared between trusted loads, but never
+    # handed out by Color() itself.
+    assert Canvas.from_json(text, validate=False).nodes[0].color is first
+    with pytest.raises(InvalidColorValueError):
+        Color(value)
+    with pytest.raises(InvalidColorValueError):
+        Canvas.from_json(text)
+    with pytest.raises(InvalidColorValueError):
+        Canvas.from_json(text, validate=False).validate()
@@ -0,0 +1,88 @@
+# test_diff.py
+"""Diff and three-way merge against replayed random edits."""
+import random
+
+import pytest
+
+from pyjsoncanvas import Canvas, Edge, TextNode, diff, merge
+
+from .common import Mutator, json_by_id, random_canvas
+
+
+def copy_of(canvas: Canvas) -> Canvas:
+    return Canvas.from_json(canvas.to_json())
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_diff_patch_turns_one_canvas_into_the_other(seed):
+    rng = random.Random(seed)
+    before = random_canvas(rng, 30, 40)
+    after = copy_of(before)
+    mutator = Mutator(after, rng)
+    for _ in range(rng.randint(0, 40)):
+        mutator.step()
+    changes = diff(before, after)
+    assert bool(changes) == (json_by_id(before) != json_by_id(after))
+    before.apply_patch(changes.to_patch())
+    assert json_by_id(before) == json_by_id(after)
+    assert not diff(before, after)
+
+
+def test_merge_never_leaves_orphan_edges():
+    rng = random.Random(0)
+    for _ in range(200):
+        base = random_canvas(rng, rng.randint(1, 6), rng.randint(0, 6))
+        ours, theirs = copy_of(base), copy_of(base)
+        for side in (ours, theirs):
+            mutator = Mutator(side, rng)
+            for _ in range(rng.randint(0, 6)):
+                mutator.step()
+        result = merge(base, ours, theirs)
+        assert result.canvas.validate(collect=True) == []
+        if not diff(base, ours):
+            assert result.conflicts == []
+            assert json_by_id(result.canvas) == json_by_id(theirs)
+
+
+def _base() -> Canvas:
+    nodes = [TextNode(x=0, y=0, width=1, height=1, id=node_id) for node_id in "abc"]
+    return Canvas(nodes=nodes, edges=[Edge(fromNode="a", toNode="b", id="e1")])
+
+
+def test_merge_keeps_node_that_ours_attached_an_edge_to():
+    base = _base()
+    ours, theirs = copy_of(base), copy_of(base)
+    ours.add_edge(Edge(fromNode="c", toNode="b", id="e3"))
+    theirs.remove_node("b")
+    result = merge(base, ours, theirs)
+    assert [(c.kind, c.id, c.field) for c in result.conflicts] == [("node", "b", None)]
+    assert result.canvas.get_node("b")
+    assert result.canvas.validate()
+
+
+def test_merge_keeps_node_of_edge_kept_by_conflict():
+    base = _base()
+    ours, theirs = copy_of(base), copy_of(base)
+    ours.get_edge("e1").label = "edited"
+    theirs.remove_node("b")
+    result = merge(base, ours, theirs)
+    assert {(c.kind, c.id) for c in result.conflicts} == {("edge", "e1"), ("node", "b")}
+    assert result.canvas.get_edge("e1").label == "edited"
+    assert result.canvas.validate()
+
+
+def test_merge_drops_their_edge_to_node_ours_removed():
+    base = _base()
+    ours, theirs = copy_of(base), copy_of(base)
+    ours.remove_node("c")
+    theirs.add_edge(Edge(fromNode="a", toNode="c", id="e4"))
+    result = merge(base, ours, theirs)
+    assert [(c.kind, c.id) for c in result.conflicts] == [("edge", "e4")]
+    assert "e4" not in {edge.id for edge in result.canvas.edges}
+    assert result.canvas.validate()
+
+
+def test_identical_canvases_have_no_diff():
+    canvas = random_canvas(random.Random(3), 20, 30)
+    assert not diff(canvas, copy_of(canvas))
+    assert diff(canvas, copy_of(canvas)).to_patch() == []
@@ -0,0 +1,165 @@
+# test_graph.py
+"""CanvasGraph against brute force over the edge list."""
+import random
+from typing import Dict, List, Set
+
+import pytest
+
+from pyjsoncanvas import (
+    Canvas,
+    Edge,
+    EdgesFromEndValue,
+    EdgesToEndValue,
+    GraphCycleError,
+    NodeNotFoundError,
+    TextNode,
+)
+
+from .common import Mutator, random_canvas
+
+
+def arcs(canvas: Canvas, directed: bool) -> Dict[str, Set[str]]:
+    ids = {node.id for node in canvas.nodes}
+    succ = {node_id: set() for node_id in ids}
+    for edge in canvas.edges:
+        if edge.fromNode not in ids or edge.toNode not in ids:
+            continue
+        forward = not directed or edge.toEnd != EdgesToEndValue.NONE
+        backward = not directed or edge.fromEnd == EdgesFromEndValue.ARROW
+        if forward:
+            succ[edge.fromNode].add(edge.toNode)
+        if backward:
+            succ[edge.toNode].add(edge.fromNode)
+    return succ
+
+
+def distances(succ: Dict[str, Set[str]], start: str) -> Dict[str, int]:
+    found, frontier = {start: 0}, [start]
+    while frontier:
+        following = []
+        for i in frontier:
+            for j in succ[i]:
+                if j not in found:
+                    found[j] = found[i] + 1
+                    following.append(j)
+        frontier = following
+    return found
+
+
+def components(canvas: Canvas) -> Set[frozenset]:
+    ids = {node.id for node in canvas.nodes}
+    linked = {node_id: {node_id} for node_id in ids}
+    for edge in canvas.edges:
+        if edge.fromNode in ids and edge.toNode in ids:
+            linked[edge.fromNode].add(edge.toNode)
+            linked[edge.toNode].add(edge.fromNode)
+    return {frozenset(distances(linked, node_id)) for node_id in ids}
+
+
+def is_acyclic(succ: Dict[str, Set[str]]) -> bool:
+    return all(
+        i not in distances(succ, j) for i in succ for j in succ[i]
+    )
+
+
+def check_graph(canvas: Canvas, rng: random.Random) -> None:
+    for directed in (True, False):
+        graph = canvas.graph(directed)
+        succ = arcs(canvas, directed)
+        ids = sorted(succ)
+        assert sorted(graph.node_ids) == ids
+        for node_id in rng.sample(ids, min(len(ids), 5)):
+            assert set(graph.successors(node_id)) == succ[node_id]
+            reachable = distances(succ, node_id)
+            for traversal in (graph.bfs, graph.dfs):
+                order = list(traversal(node_id))
+                assert len(order) == len(set(order))
+                assert set(order) == set(reachable)
+            bfs_depths = [reachable[i] for i in graph.bfs(node_id)]
+            assert bfs_depths == sorted(bfs_depths)
+            target = rng.choice(ids)
+            path = graph.shortest_path(node_id, target)
+            if target not in reachable:
+                assert path is None
+            else:
+                assert path[0] == node_id and path[-1] == target
+                assert len(path) == reachable[target] + 1
+                assert all(b in succ[a] for a, b in zip(path, path[1:]))
+        assert {frozenset(c) for c in graph.connected_components()} == components(canvas)
+    graph = canvas.graph()
+    succ = arcs(canvas, True)
+    cycle = graph.find_cycle()
+    if is_acyclic(succ):
+        assert cycle is None and not graph.has_cycle()
+        order = {node_id: i for i, node_id in enumerate(graph.topological_sort())}
+        assert sorted(order) == sorted(succ)
+        assert all(order[i] < order[j] for i in succ for j in succ[i])
+    else:
+        assert graph.has_cycle()
+        assert all(b in succ[a] for a, b in zip(cycle, cycle[1:] + cycle[:1]))
+        with pytest.raises(GraphCycleError):
+            graph.topological_sort()
+
+
+def sparse_canvas(rng: random.Random) -> Canvas:
+    # Few edges, mostly arrows one way, so that both acyclic and cyclic
+    # canvases come up.
+    canvas = random_canvas(rng, 25, 0)
+    ids = [node.id for node in canvas.nodes]
+    for i in range(rng.randint(0, 30)):
+        a, b = sorted(rng.sample(ids, 2), key=ids.index)
+        if rng.random() < 0.3:
+            a, b = b, a
+        canvas.add_edge(
+            Edge(fromNode=a, toNode=b, id=f"t{i}", toEnd=rng.choice([None, None, "none"]))
+        )
+    return canvas
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_graph_against_brute_force(seed):
+    rng = random.Random(seed)
+    check_graph(random_canvas(rng, 30, 40), rng)
+    check_graph(sparse_canvas(rng), rng)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_graph_rebuilt_after_mutation(seed):
+    rng = random.Random(seed)
+    canvas = sparse_canvas(rng)
+    mutator = Mutator(canvas, rng)
+    for _ in range(10):
+        snapshot = canvas.graph()
+        node_ids, edge_ids = list(snapshot.node_ids), list(snapshot.edge_ids)
+        for _ in range(5):
+            mutator.step()
+        # The old snapshot is unchanged; a new one reflects the mutations.
+        assert snapshot.node_ids == node_ids and snapshot.edge_ids == edge_ids
+        check_graph(canvas, rng)
+
+
+def test_cycles_and_missing_nodes():
+    nodes = [TextNode(x=0, y=0, width=1, height=1, text="", id=i) for i in "abc"]
+    canvas = Canvas(
+        nodes=nodes,
+        edges=[
+            Edge(fromNode="a", toNode="b", id="1"),
+            Edge(fromNode="b", toNode="c", id="2"),
+            Edge(fromNode="c", toNode="missing", id="3"),
+        ],
+    )
+    graph = canvas.graph()
+    assert graph.topological_sort() == ["a", "b", "c"]
+    assert graph.edge_ids == ["1", "2"]
+    with pytest.raises(NodeNotFoundError):
+        graph.shortest_path("a", "missing")
+    # One undirected edge is not a cycle; a second one between the same
+    # nodes is.
+    assert canvas.graph(directed=False).find_cycle() is None
+    canvas.add_edge(Edge(fromNode="c", toNode="a", id="4"))
+    with pytest.raises(GraphCycleError):
+        canvas.graph().topological_sort()
+    canvas.remove_edge("4")
+    canvas.add_edge(Edge(fromNode="b", toNode="a", id="5", toEnd="none"))
+    assert canvas.graph().find_cycle() is None
+    assert sorted(canvas.graph(directed=False).find_cycle()) == ["a", "b"]
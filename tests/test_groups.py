@@ -0,0 +1,63 @@
+# test_groups.py
+"""Group containment queries of Canvas against brute force."""
+import random
+
+import pytest
+
+from pyjsoncanvas import Canvas, GroupNode, TextNode
+
+from .common import Mutator, enclosing_groups, random_canvas
+
+
+def check_groups(canvas: Canvas) -> None:
+    for node in canvas.nodes:
+        groups = enclosing_groups(canvas, node)
+        assert canvas.enclosing_groups(node.id) == groups
+        assert canvas.parent_group(node.id) is (groups[0] if groups else None)
+        children = [
+            other
+            for other in canvas.nodes
+            if (enclosing_groups(canvas, other) or [None])[0] is node
+        ]
+        assert {n.id for n in canvas.group_children(node.id)} == {
+            n.id for n in children
+        }
+        descendants = [
+            other for other in canvas.nodes if node in enclosing_groups(canvas, other)
+        ]
+        assert {n.id for n in canvas.group_descendants(node.id)} == {
+            n.id for n in descendants
+        }
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_group_queries(seed):
+    check_groups(random_canvas(random.Random(seed), 60, 0))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_group_hierarchy_follows_random_mutations(seed):
+    rng = random.Random(seed)
+    canvas = random_canvas(rng, 40, 60)
+    canvas.group_hierarchy
+    mutator = Mutator(canvas, rng)
+    for step in range(120):
+        mutator.step()
+        if step % 10 == 0:
+            check_groups(canvas)
+    check_groups(canvas)
+
+
+def test_nested_and_identical_groups():
+    outer = GroupNode(id="a", x=0, y=0, width=100, height=100)
+    same = GroupNode(id="b", x=0, y=0, width=100, height=100)
+    inner = GroupNode(id="c", x=10, y=10, width=50, height=50)
+    text = TextNode(id="t", x=20, y=20, width=5, height=5, text="")
+    canvas = Canvas(nodes=[text, inner, outer, same], edges=[])
+    # Of two groups with the same bounds, the larger ID is the outer one.
+    assert canvas.enclosing_groups("t") == [inner, outer, same]
+    assert canvas.group_children("b") == [outer]
+    assert canvas.parent_group("b") is None
+    text.x = 80
+    assert canvas.parent_group("t") is outer
+    assert {n.id for n in canvas.group_children("a")} == {"c", "t"}
@@ -0,0 +1,53 @@
+# test_import.py
+"""Importing the package only loads what is used."""
+import subprocess
+import sys
+
+FEATURE_MODULES = [
+    "aio",
+    "binary",
+    "changes",
+    "graph",
+    "groups",
+    "lazy",
+    "search",
+    "spatial",
+    "stream",
+]
+
+
+def loaded_after(code: str) -> set:
+    script = (
+        "import sys\n"
+        f"{code}\n"
+        "print(' '.join(sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    # Package modules by their short name, everything else by full name.
+    return {name.rsplit("pyjsoncanvas.", 1)[-1] for name in output.split()}
+
+
+def test_canvas_does_not_load_feature_modules():
+    loaded = loaded_after(
+        "from pyjsoncanvas import Canvas, TextNode\n"
+        "canvas = Canvas.from_json('{\"nodes\": [], \"edges\": []}')\n"
+        "canvas.add_node(TextNode(x=0, y=0, width=1, height=1, text=''))\n"
+        "canvas.validate()\n"
+        "canvas.to_json()"
+    )
+    assert loaded.isdisjoint(FEATURE_MODULES), loaded
+    assert "uuid" not in loaded
+
+
+def test_methods_load_their_modules():
+    loaded = loaded_after(
+        "from pyjsoncanvas import Canvas\n"
+        "canvas = Canvas.from_json('{\"nodes\": [], \"edges\": []}')\n"
+        "canvas.graph()\n"
+        "canvas.search('x')"
+    )
+    assert {"graph", "search"} <= loaded
+    assert "binary" not in loaded and "stream" not in loaded
+    assert "asyncio" not in loaded
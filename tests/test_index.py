@@ -0,0 +1,84 @@
+# test_index.py
+"""Looking nodes and edges up by ID after renames and direct assignments."""
+import random
+
+import pytest
+
+from pyjsoncanvas import (
+    Canvas,
+    Edge,
+    EdgeIDConflictError,
+    EdgeNotFoundError,
+    NodeIDConflictError,
+    NodeNotFoundError,
+    TextNode,
+)
+
+from .common import random_canvas
+
+
+def make_canvas() -> Canvas:
+    nodes = [TextNode(x=0, y=0, width=1, height=1, id=node_id) for node_id in "abc"]
+    edges = [Edge(fromNode="a", toNode="b", id="e"), Edge(fromNode="b", toNode="b", id="f")]
+    return Canvas(nodes=nodes, edges=edges)
+
+
+@pytest.mark.parametrize("derived", [None, "spatial_index", "search_index", "track_changes"])
+def test_direct_id_assignment_is_indexed(derived):
+    canvas = make_canvas()
+    if derived == "track_changes":
+        canvas.track_changes()
+    elif derived is not None:
+        getattr(canvas, derived)
+    node = canvas.get_node("a")
+    node.id = "x"
+    assert canvas.get_node("x") is node
+    with pytest.raises(NodeNotFoundError):
+        canvas.get_node("a")
+    edge = canvas.get_edge("e")
+    edge.id = "y"
+    assert canvas.get_edge("y") is edge
+    with pytest.raises(EdgeNotFoundError):
+        canvas.get_edge("e")
+    # The edge still names the old ID, which validate() reports.
+    assert [issue.object_id for issue in canvas.validate(collect=True)] == ["y"]
+
+
+def test_direct_assignment_of_taken_id():
+    canvas = make_canvas()
+    node = canvas.get_node("c")
+    node.id = "a"
+    assert canvas.get_node("a") is node
+    assert [issue.object_id for issue in canvas.validate(collect=True)] == ["a"]
+    # As with duplicates in a loaded document, removal takes both.
+    canvas.remove_node("a")
+    assert [n.id for n in canvas.nodes] == ["b"]
+    assert canvas.validate()
+
+
+def test_rename_updates_index_and_edges():
+    canvas = random_canvas(random.Random(1), 10, 30)
+    connected = {edge.id for edge in canvas.get_connections("n0")}
+    canvas.rename_node("n0", "renamed")
+    with pytest.raises(NodeNotFoundError):
+        canvas.get_node("n0")
+    assert canvas.get_node("renamed").id == "renamed"
+    assert {edge.id for edge in canvas.get_connections("renamed")} == connected
+    assert canvas.get_connections("n0") == []
+    assert canvas.validate()
+
+
+def test_rename_checks_conflicts():
+    canvas = make_canvas()
+    with pytest.raises(NodeIDConflictError):
+        canvas.rename_node("a", "b")
+    with pytest.raises(EdgeIDConflictError):
+        canvas.rename_edge("e", "f")
+    with pytest.raises(NodeNotFoundError):
+        canvas.rename_node("missing", "z")
+    canvas.rename_node("b", "b")
+    canvas.rename_node("b", "z")
+    assert [(e.fromNode, e.toNode) for e in canvas.edges] == [("a", "z"), ("z", "z")]
+    canvas.rename_edge("f", "g")
+    assert canvas.get_edge("g").id == "g"
+    assert canvas.validate()
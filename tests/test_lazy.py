@@ -0,0 +1,69 @@
+# test_lazy.py
+"""Lazy loading against eager loading of the same document."""
+import json
+import random
+
+import pytest
+
+from pyjsoncanvas import Canvas
+from pyjsoncanvas.exceptions import InvalidColorValueError
+
+from .common import random_canvas
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_lazy_to_json_matches_eager(seed):
+    rng = random.Random(seed)
+    text = random_canvas(rng, 40, 60).to_json()
+    assert json.loads(Canvas.from_json(text, lazy=True).to_json()) == json.loads(text)
+
+    lazy = Canvas.from_json(text, lazy=True)
+    eager = Canvas.from_json(text)
+    for canvas in (lazy, eager):
+        actions = random.Random(seed)
+        for _ in range(30):
+            action = actions.random()
+            if action < 0.4:
+                canvas.nodes[actions.randrange(len(canvas.nodes))].x += 1
+            elif action < 0.6:
+                canvas.edges[actions.randrange(len(canvas.edges))]
+            elif action < 0.8 and len(canvas.nodes) > 1:
+                canvas.remove_node(canvas.nodes[actions.randrange(len(canvas.nodes))].id)
+            elif canvas.edges:
+                canvas.remove_edge(canvas.edges[actions.randrange(len(canvas.edges))].id)
+    assert lazy.to_json() == eager.to_json()
+
+
+def test_lazy_builds_only_what_is_read():
+    text = random_canvas(random.Random(0), 40, 60).to_json()
+    canvas = Canvas.from_json(text, lazy=True)
+    assert (canvas.nodes.pending(), canvas.edges.pending()) == (40, 60)
+
+    node_id = json.loads(text)["nodes"][7]["id"]
+    node = canvas.get_node(node_id)
+    assert node == Canvas.from_json(text).get_node(node_id)
+    assert canvas.nodes.pending() == 39
+    assert list(canvas.nodes.built()) == [node]
+    # The list and the index hand out the same object.
+    assert canvas.nodes[7] is node
+    assert canvas.nodes.pending() == 39
+
+    canvas.to_json()
+    assert (canvas.nodes.pending(), canvas.edges.pending()) == (39, 60)
+
+
+def test_lazy_validates_on_read():
+    data = json.loads(random_canvas(random.Random(1), 5, 0).to_json())
+    data["nodes"][3]["color"] = "purple"
+    bad_id = data["nodes"][3]["id"]
+    canvas = Canvas.from_json(json.dumps(data), lazy=True)
+
+    # Loading and writing never build the invalid node.
+    assert json.loads(canvas.to_json()) == data
+    canvas.get_node(data["nodes"][0]["id"])
+    with pytest.raises(InvalidColorValueError):
+        canvas.get_node(bad_id)
+    assert canvas.nodes.pending() == 4
+
+    trusted = Canvas.from_json(json.dumps(data), validate=False, lazy=True)
+    assert trusted.get_node(bad_id).to_json_dict()["color"] == "purple"
@@ -0,0 +1,102 @@
+# test_metrics.py
+"""Operation metrics: off and free by default, exact counts when on."""
+import io
+import os
+import random
+
+import pytest
+
+import pyjsoncanvas.jsoncanvas
+import pyjsoncanvas.metrics
+import pyjsoncanvas.stream
+from pyjsoncanvas import Canvas, collect_metrics, disable_metrics, enable_metrics
+
+from .common import random_canvas
+
+NODES, EDGES = 30, 40
+
+
+@pytest.fixture
+def text():
+    return random_canvas(random.Random(0), NODES, EDGES).to_json()
+
+
+def everything(text: str, tmp_path) -> None:
+    canvas = Canvas.from_json(text)
+    Canvas.from_json(text, validate=False)
+    Canvas.load(io.StringIO(text))
+    list(Canvas.iterload(io.StringIO(text)))
+    canvas.validate()
+    canvas.to_json()
+    canvas.export(str(tmp_path / "a.canvas"))
+    canvas.export_binary(str(tmp_path / "a.bin"))
+    Canvas.load_binary(str(tmp_path / "a.bin"))
+
+
+def test_off_by_default_and_free(text, tmp_path, monkeypatch):
+    assert pyjsoncanvas.metrics.active is None
+
+    def clock():
+        raise AssertionError("timed while metrics are off")
+
+    for target in (pyjsoncanvas.jsoncanvas, pyjsoncanvas.stream):
+        monkeypatch.setattr(target, "perf_counter", clock)
+    everything(text, tmp_path)
+    assert pyjsoncanvas.metrics.active is None
+
+
+def test_counts_per_operation(text, tmp_path):
+    total = NODES + EDGES
+    with collect_metrics() as m:
+        Canvas.from_json(text)
+    assert set(m.seconds) == {"parse", "construct"}
+    assert m.counters == {"objects_constructed": total, "validations": total}
+
+    with collect_metrics() as m:
+        Canvas.from_json(text, validate=False)
+    assert m.counters == {"objects_constructed": total, "validations": 0}
+
+    with collect_metrics() as m:
+        canvas = Canvas.load(io.StringIO(text))
+    assert set(m.seconds) == {"read", "parse", "construct"}
+    assert m.counters == {
+        "bytes_read": len(text.encode("utf-8")),
+        "objects_constructed": total,
+        "validations": total,
+    }
+
+    with collect_metrics() as m:
+        canvas.validate()
+        canvas.to_json()
+    assert m.calls == {"validate": 1, "encode": 1}
+    assert m.counters == {"validations": total, "objects_encoded": total}
+
+    path = str(tmp_path / "a.canvas")
+    with collect_metrics() as m:
+        canvas.export(path)
+    assert set(m.seconds) == {"encode", "write"}
+    assert m.counters == {
+        "objects_encoded": total,
+        "bytes_written": os.path.getsize(path),
+    }
+    assert all(seconds >= 0 for seconds in m.seconds.values())
+
+
+def test_callback_and_nesting(text):
+    calls = []
+    outer = enable_metrics(lambda phase, seconds, counts: calls.append(phase))
+    try:
+        with collect_metrics() as inner:
+            Canvas.from_json(text)
+        # The inner block records on its own and restores the outer one.
+        assert pyjsoncanvas.metrics.active is outer
+        assert outer.calls == {} and calls == []
+        assert inner.calls == {"parse": 1, "construct": 1}
+        Canvas.from_json(text).validate()
+        assert calls == ["parse", "construct", "validate"]
+        assert outer.as_dict()["calls"] == {"parse": 1, "construct": 1, "validate": 1}
+    finally:
+        assert disable_metrics() is outer
+    assert disable_metrics() is None
+    outer.reset()
+    assert outer.as_dict() == {"seconds": {}, "calls": {}, "counters": {}}
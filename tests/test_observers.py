@@ -0,0 +1,92 @@
+# test_observers.py
+"""The change hook on canvas members and what it means for type(), copies and pickles."""
+import copy
+import gc
+import pickle
+import weakref
+
+from pyjsoncanvas import Canvas, Edge, TextNode
+
+
+def make_canvas() -> Canvas:
+    nodes = [
+        TextNode(x=0, y=0, width=10, height=10, text="a", id="a"),
+        TextNode(x=20, y=0, width=10, height=10, text="b", id="b"),
+    ]
+    return Canvas(nodes=nodes, edges=[Edge(fromNode="a", toNode="b", id="e")])
+
+
+def test_type_of_canvas_members():
+    canvas = make_canvas()
+    for obj, cls in ((canvas.nodes[0], TextNode), (canvas.edges[0], Edge)):
+        assert type(obj) is not cls
+        assert issubclass(type(obj), cls)
+        assert obj.__class__ is cls
+    assert type(TextNode(x=0, y=0, width=1, height=1, text="")) is TextNode
+
+
+def test_observed_objects_behave_like_model_objects():
+    canvas = make_canvas()
+    canvas.track_changes()
+    node = canvas.get_node("a")
+    plain = TextNode(x=0, y=0, width=10, height=10, text="a", id="a")
+    assert isinstance(node, TextNode)
+    assert node == plain and plain == node
+    assert repr(node) == repr(plain)
+    for duplicate in (
+        copy.copy(node),
+        copy.deepcopy(node),
+        pickle.loads(pickle.dumps(node)),
+        pickle.loads(pickle.dumps(node, protocol=0)),
+    ):
+        assert type(duplicate) is TextNode
+        assert duplicate == plain
+        duplicate.x = 99
+    assert node.x == 0
+    assert canvas.make_patch() == []
+    edge = pickle.loads(pickle.dumps(canvas.get_edge("e")))
+    assert type(edge) is Edge and edge == canvas.get_edge("e")
+
+
+def test_copies_can_join_another_canvas():
+    canvas = make_canvas()
+    other = Canvas(nodes=[copy.copy(node) for node in canvas.nodes], edges=[])
+    other.get_node("a").id = "c"
+    assert other.get_node("c").id == "c"
+    assert canvas.get_node("a").id == "a"
+
+
+def test_removed_objects_go_back_to_the_model_class():
+    canvas = make_canvas()
+    canvas.track_changes()
+    node = canvas.get_node("b")
+    edge = canvas.get_edge("e")
+    canvas.remove_node("b")
+    assert type(node) is TextNode and type(edge) is Edge
+    node.x = 5
+    edge.label = "gone"
+    assert [op["op"] for op in canvas.make_patch()] == ["remove_edge", "remove_node"]
+
+
+def test_replaced_lists_go_back_to_the_model_class():
+    canvas = make_canvas()
+    nodes = canvas.nodes
+    canvas.nodes = []
+    assert all(type(node) is TextNode for node in nodes)
+
+
+def test_canvas_is_freed_without_collection():
+    canvas = make_canvas()
+    canvas.track_changes()
+    canvas.nodes_in_rect(0, 0, 5, 5)
+    node = canvas.get_node("a")
+    ref = weakref.ref(canvas)
+    gc.disable()
+    try:
+        del canvas
+        assert ref() is None
+        node.x = 1
+        assert node.x == 1
+        assert type(node) is TextNode
+    finally:
+        gc.enable()
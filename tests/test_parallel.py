@@ -0,0 +1,60 @@
+# test_parallel.py
+"""load_many against Canvas.load, in this process and in a worker pool."""
+import copy
+import json
+import random
+
+import pytest
+
+from pyjsoncanvas import Canvas, load_many
+
+from .common import random_canvas
+
+
+@pytest.fixture
+def paths(tmp_path):
+    valid = json.loads(random_canvas(random.Random(0), 10, 10).to_json())
+    documents = {"valid": valid}
+    documents["color"] = copy.deepcopy(valid)
+    documents["color"]["nodes"][0]["color"] = "9"
+    documents["field"] = copy.deepcopy(valid)
+    documents["field"]["nodes"][0]["unknown"] = 1
+    documents["orphan"] = copy.deepcopy(valid)
+    documents["orphan"]["edges"][0]["toNode"] = "missing"
+    documents["duplicate"] = copy.deepcopy(valid)
+    documents["duplicate"]["nodes"][1]["id"] = valid["nodes"][0]["id"]
+    paths = []
+    for name, document in documents.items():
+        path = tmp_path / f"{name}.canvas"
+        path.write_text(json.dumps(document))
+        paths.append(str(path))
+    malformed = tmp_path / "malformed.canvas"
+    malformed.write_text('{"nodes": [')
+    paths.append(str(malformed))
+    paths.append(str(tmp_path / "absent.canvas"))
+    return paths
+
+
+def expected(path: str, validate: bool):
+    try:
+        canvas = Canvas.load(path, validate=validate)
+        if validate:
+            canvas.validate()
+    except Exception as e:
+        return type(e)
+    return canvas.to_json()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("validate", [True, False])
+def test_load_many_agrees_with_load(paths, workers, validate):
+    results = {}
+    for result in load_many(paths, workers=workers, validate=validate):
+        assert result.ok == (result.error is None)
+        assert (result.canvas is None) == (result.error is not None)
+        results[result.path] = (
+            result.canvas.to_json() if result.ok else type(result.error)
+        )
+    assert results == {path: expected(path, validate) for path in paths}
+    ok = sum(isinstance(value, str) for value in results.values())
+    assert ok == (1 if validate else 5)
@@ -0,0 +1,50 @@
+# test_search.py
+"""Canvas.search against a scan of every node and edge."""
+import random
+
+import pytest
+
+from pyjsoncanvas import Canvas, Edge, TextNode
+
+from .common import Mutator, random_canvas, search
+
+QUERIES = ["alpha", "ALPHA beta", "gam", "a", "naïve", "x_y", "foo-bar", "ta g", "zzz", ""]
+
+
+def check_search(canvas: Canvas) -> None:
+    for query in QUERIES:
+        for match in ("token", "prefix", "substring"):
+            found = {
+                ("edge" if isinstance(obj, Edge) else "node", obj.id)
+                for obj in canvas.search(query, match)
+            }
+            assert found == search(canvas, query, match), (query, match)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_search_matches_scan(seed):
+    check_search(random_canvas(random.Random(seed), 60, 80))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_search_follows_random_mutations(seed):
+    rng = random.Random(seed)
+    canvas = random_canvas(rng, 40, 60)
+    canvas.search_index
+    mutator = Mutator(canvas, rng)
+    for step in range(150):
+        mutator.step()
+        if step % 10 == 0:
+            check_search(canvas)
+    check_search(canvas)
+
+
+def test_search_sees_edits_and_rejects_unknown_match():
+    canvas = Canvas(nodes=[], edges=[])
+    canvas.add_node(TextNode(id="t1", x=0, y=0, width=10, height=10, text="alpha"))
+    assert [node.id for node in canvas.search("alpha")] == ["t1"]
+    canvas.get_node("t1").text = "beta"
+    assert canvas.search("alpha") == []
+    assert [node.id for node in canvas.search("bet", "prefix")] == ["t1"]
+    with pytest.raises(ValueError):
+        canvas.search("alpha", "fuzzy")
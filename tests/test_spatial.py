@@ -0,0 +1,60 @@
+# test_spatial.py
+"""Spatial queries of Canvas against brute force."""
+import random
+
+import pytest
+
+from pyjsoncanvas import Canvas, TextNode
+
+from .common import Mutator, distance, nodes_in_rect, random_canvas
+
+
+def check_spatial(canvas: Canvas, rng: random.Random) -> None:
+    for _ in range(5):
+        x0, y0 = rng.randint(-800, 800), rng.randint(-800, 800)
+        width, height = rng.randint(0, 600), rng.randint(0, 600)
+        found = canvas.nodes_in_rect(x0, y0, width, height)
+        assert {node.id for node in found} == nodes_in_rect(
+            canvas, x0, y0, x0 + width, y0 + height
+        )
+        x, y = rng.randint(-800, 800), rng.randint(-800, 800)
+        assert {node.id for node in canvas.nodes_at_point(x, y)} == nodes_in_rect(
+            canvas, x, y, x, y
+        )
+        nearest = canvas.nearest_nodes(x, y, 3)
+        expected = sorted(distance(node, x, y) for node in canvas.nodes)[:3]
+        assert [distance(node, x, y) for node in nearest] == expected
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_spatial_queries(seed):
+    rng = random.Random(seed)
+    check_spatial(random_canvas(rng, 60, 0), rng)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_spatial_index_follows_random_mutations(seed):
+    rng = random.Random(seed)
+    canvas = random_canvas(rng, 40, 60)
+    canvas.spatial_index
+    mutator = Mutator(canvas, rng)
+    for step in range(120):
+        mutator.step()
+        if step % 10 == 0:
+            check_spatial(canvas, rng)
+    check_spatial(canvas, rng)
+
+
+def test_edges_of_rectangles_and_empty_canvas():
+    canvas = Canvas(nodes=[], edges=[])
+    assert canvas.nodes_in_rect(0, 0, 10, 10) == []
+    assert canvas.nearest_nodes(0, 0, 3) == []
+    node = TextNode(id="a", x=0, y=0, width=10, height=10, text="")
+    canvas.add_node(node)
+    # Touching rectangles and points on the border count as overlapping.
+    assert canvas.nodes_in_rect(10, 10, 5, 5) == [node]
+    assert canvas.nodes_at_point(0, 10) == [node]
+    assert canvas.nodes_in_rect(11, 0, 5, 5) == []
+    node.x = 100
+    assert canvas.nodes_at_point(5, 5) == []
+    assert canvas.nodes_at_point(105, 5) == [node]
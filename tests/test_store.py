@@ -0,0 +1,69 @@
+# test_store.py
+"""CanvasStore lookups against the canvas it was written from."""
+import json
+import os
+import random
+
+import pytest
+
+from pyjsoncanvas import (
+    Canvas,
+    CanvasStore,
+    EdgeIDConflictError,
+    EdgeNotFoundError,
+    InvalidBinaryError,
+    NodeIDConflictError,
+    NodeNotFoundError,
+)
+
+from .common import random_canvas
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_store_matches_canvas(seed, tmp_path):
+    canvas = random_canvas(random.Random(seed), 60, 80)
+    path = str(tmp_path / "canvas.store")
+    CanvasStore.write(canvas, path)
+    with CanvasStore(path) as store:
+        assert (store.node_count, store.edge_count) == (60, 80)
+        assert [node.to_json_dict() for node in store.iter_nodes()] == [
+            node.to_json_dict() for node in canvas.nodes
+        ]
+        assert store.to_canvas().to_json() == canvas.to_json()
+        for node in canvas.nodes:
+            assert node.id in store
+            assert store.get_node(node.id) == node
+            assert store.get_connections(node.id) == canvas.get_connections(node.id)
+        for edge in canvas.edges:
+            assert store.get_edge(edge.id) == edge
+        assert "missing" not in store
+        assert store.get_connections("missing") == []
+        with pytest.raises(NodeNotFoundError):
+            store.get_node("missing")
+        with pytest.raises(EdgeNotFoundError):
+            store.get_edge("missing")
+
+
+def duplicated(kind: str) -> Canvas:
+    data = json.loads(random_canvas(random.Random(0), 5, 5).to_json())
+    data[kind][3]["id"] = data[kind][1]["id"]
+    return Canvas.from_json(json.dumps(data))
+
+
+@pytest.mark.parametrize(
+    "kind, error", [("nodes", NodeIDConflictError), ("edges", EdgeIDConflictError)]
+)
+def test_duplicate_ids_are_rejected_like_validate(kind, error, tmp_path):
+    canvas = duplicated(kind)
+    assert error in [issue.error for issue in canvas.validate(collect=True)]
+    path = str(tmp_path / "canvas.store")
+    with pytest.raises(error):
+        CanvasStore.write(canvas, path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_not_a_store(tmp_path):
+    path = tmp_path / "canvas.store"
+    path.write_bytes(b"PJCX" + bytes(200))
+    with pytest.raises(InvalidBinaryError):
+        CanvasStore(str(path))
@@ -0,0 +1,101 @@
+# test_stream.py
+"""Streaming load and export."""
+import codecs
+import io
+import json
+import random
+
+import pytest
+
+from pyjsoncanvas import Canvas, Edge, InvalidJsonError, TextNode
+from pyjsoncanvas.stream import dump
+
+from .common import random_canvas
+
+
+def document(seed: int) -> str:
+    return random_canvas(random.Random(seed), 40, 60).to_json()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+@pytest.mark.parametrize("seed", range(3))
+def test_load_matches_from_json(seed, chunk_size):
+    text = document(seed)
+    loaded = Canvas.load(io.StringIO(text), chunk_size)
+    assert loaded.to_json() == Canvas.from_json(text).to_json()
+
+
+def test_iterload_yields_in_document_order():
+    data = json.loads(document(0))
+    data = {"edges": data["edges"][:3], "extra": [1, {"a": "]"}], "nodes": data["nodes"]}
+    objects = list(Canvas.iterload(io.StringIO(json.dumps(data, indent=2)), 5))
+    assert [type(obj) is Edge for obj in objects] == [True] * 3 + [False] * 40
+    assert [obj.id for obj in objects] == [
+        obj["id"] for obj in data["edges"] + data["nodes"]
+    ]
+
+
+def test_load_skips_byte_order_mark(tmp_path):
+    text = document(1)
+    path = tmp_path / "bom.canvas"
+    path.write_bytes(codecs.BOM_UTF8 + text.encode())
+    assert Canvas.load(str(path)).to_json() == Canvas.from_json(text).to_json()
+    assert len(list(Canvas.iterload(str(path), 3))) == 100
+
+
+@pytest.mark.parametrize(
+    "text", ["", "[]", '{"nodes": [', '{"nodes": [}', '{"nodes": []} x', "{1: 2}"]
+)
+def test_load_rejects_malformed_json(text):
+    with pytest.raises(InvalidJsonError):
+        Canvas.load(io.StringIO(text))
+
+
+@pytest.mark.parametrize("options", [{}, {"indent": 2}, {"indent": 0}, {"compact": True}])
+def test_export_matches_json_dumps(tmp_path, options):
+    canvas = Canvas.from_json(document(2))
+    data = json.loads(canvas.to_json())
+    if options.get("compact"):
+        expected = json.dumps(data, separators=(",", ":"))
+    else:
+        expected = json.dumps(data, indent=options.get("indent"))
+    path = tmp_path / "out.canvas"
+    canvas.export(str(path), **options)
+    assert path.read_text(encoding="utf-8") == expected
+    if not options:
+        assert expected == canvas.to_json()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100, 1 << 16])
+def test_dump_writes_in_chunks(chunk_size):
+    canvas = Canvas.from_json(document(3))
+    fp = io.StringIO()
+    writes = []
+    write = fp.write
+    fp.write = lambda text: writes.append(len(text)) or write(text)
+    dump(canvas.nodes, canvas.edges, fp, indent=1, chunk_size=chunk_size)
+    assert fp.getvalue() == json.dumps(json.loads(canvas.to_json()), indent=1)
+    if chunk_size == 1 << 16:
+        assert len(writes) == 1
+    else:
+        assert len(writes) > 1
+        assert all(size >= chunk_size for size in writes[:-1])
+
+
+def test_empty_canvas_export(tmp_path):
+    path = tmp_path / "empty.canvas"
+    Canvas(nodes=[], edges=[]).export(str(path), indent=2)
+    assert json.loads(path.read_text()) == {"nodes": [], "edges": []}
+
+
+def test_failed_export_leaves_target_unchanged(tmp_path):
+    path = tmp_path / "out.canvas"
+    path.write_text("previous")
+    # Large enough that several chunks are written before the failure.
+    canvas = random_canvas(random.Random(4), 2000, 100)
+    text_nodes = [node for node in canvas.nodes if isinstance(node, TextNode)]
+    text_nodes[-1].text = object()  # Not JSON serializable.
+    with pytest.raises(TypeError):
+        canvas.export(str(path))
+    assert path.read_text() == "previous"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.canvas"]
@@ -0,0 +1,92 @@
+# test_table.py
+"""CanvasTable round trips against the model objects."""
+import io
+import json
+import random
+
+import pytest
+
+from pyjsoncanvas import (
+    Canvas,
+    CanvasTable,
+    Edge,
+    FileNode,
+    GroupNode,
+    InvalidNodeAttributeError,
+    LinkNode,
+    TextNode,
+)
+
+from .common import random_canvas
+
+
+def every_node_type() -> Canvas:
+    return Canvas(
+        nodes=[
+            TextNode(id="t", x=-5, y=2, width=10, height=20, text="hi", color="1"),
+            TextNode(id="u", x=0, y=0, width=1, height=1, text=""),
+            FileNode(id="f", x=1, y=2, width=3, height=4, file="a.md", subpath="#h"),
+            FileNode(id="h", x=1, y=2, width=3, height=4, file="b.png"),
+            LinkNode(id="l", x=7, y=8, width=9, height=10, url="https://x.y", color="#00ff00"),
+            GroupNode(
+                id="g", x=-100, y=-100, width=500, height=500, label="G",
+                background="bg.png", backgroundStyle="repeat",
+            ),
+            GroupNode(id="e", x=0, y=0, width=2, height=2),
+        ],
+        edges=[
+            Edge(
+                id="1", fromNode="t", fromSide="top", fromEnd="arrow", toNode="g",
+                toSide="left", toEnd="none", color="6", label="in",
+            ),
+            Edge(id="2", fromNode="f", toNode="f"),
+        ],
+    )
+
+
+def test_every_node_type_round_trips():
+    canvas = every_node_type()
+    table = CanvasTable.from_canvas(canvas)
+    assert table.node_count == 7 and table.edge_count == 2
+    assert table.to_canvas().to_json() == canvas.to_json()
+    assert [node.__class__ for node in table.to_canvas().nodes] == [
+        node.__class__ for node in canvas.nodes
+    ]
+    assert json.loads(table.to_json()) == json.loads(canvas.to_json())
+    for build in (CanvasTable.from_json, lambda text: CanvasTable.load(io.StringIO(text))):
+        assert build(canvas.to_json()).to_canvas().to_json() == canvas.to_json()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_canvases_round_trip(seed):
+    canvas = random_canvas(random.Random(seed), 50, 80)
+    table = CanvasTable.from_json(canvas.to_json())
+    assert table.to_canvas().to_json() == canvas.to_json()
+    assert table.to_canvas(validate=False).to_json() == canvas.to_json()
+
+
+def test_to_canvas_validates_by_default():
+    data = json.loads(every_node_type().to_json())
+    data["nodes"][0]["text"] = 5
+    table = CanvasTable.from_json(json.dumps(data))
+    with pytest.raises(InvalidNodeAttributeError):
+        table.to_canvas()
+    # Trusted conversion leaves the check to Canvas.validate().
+    canvas = table.to_canvas(validate=False)
+    assert canvas.nodes[0].text == 5
+    with pytest.raises(InvalidNodeAttributeError):
+        canvas.validate()
+
+
+def test_missing_endpoints_and_edges_before_nodes():
+    text = (
+        '{"edges": [{"id": "e", "fromNode": "a", "toNode": "gone"}],'
+        ' "nodes": [{"type": "text", "id": "a", "x": 0, "y": 0,'
+        ' "width": 1, "height": 1, "text": ""}]}'
+    )
+    table = CanvasTable.load(io.StringIO(text))
+    assert table.edge_from[0] == table.row("a") == 0
+    assert table.edge_to[0] < 0 and table.endpoint_id(table.edge_to[0]) == "gone"
+    assert table.missing_ids == ["gone"]
+    assert table.edge_dict(0) == {"id": "e", "fromNode": "a", "toNode": "gone"}
+    assert table.degrees().tolist() == [1]
@@ -0,0 +1,81 @@
+# test_trusted.py
+"""Trusted loading with validate=False, checked afterwards by validate()."""
+import io
+import json
+import random
+
+import pytest
+
+from pyjsoncanvas import Canvas
+from pyjsoncanvas.exceptions import InvalidColorValueError
+
+from .common import random_canvas
+
+
+def document() -> dict:
+    return {
+        "nodes": [
+            {"type": "text", "id": "a", "x": 0, "y": 0, "width": 1, "height": 1, "text": "t"},
+            {"type": "group", "id": "b", "x": 0, "y": 0, "width": 9, "height": 9},
+        ],
+        "edges": [{"id": "e", "fromNode": "a", "toNode": "b"}],
+    }
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_trusted_load_builds_the_same_objects(seed):
+    text = random_canvas(random.Random(seed), 40, 60).to_json()
+    validated = Canvas.from_json(text)
+    for trusted in (
+        Canvas.from_json(text, validate=False),
+        Canvas.load(io.StringIO(text), validate=False),
+    ):
+        assert trusted.to_json() == validated.to_json()
+        assert [obj.__class__ for obj in trusted.nodes + trusted.edges] == [
+            obj.__class__ for obj in validated.nodes + validated.edges
+        ]
+        assert trusted.validate()
+
+
+@pytest.mark.parametrize(
+    "kind, field, value",
+    [
+        ("nodes", "color", "#nothex"),
+        ("nodes", "color", "12"),
+        ("nodes", "color", "red"),
+        ("edges", "color", "#12345"),
+        ("nodes", "x", "1"),
+        ("nodes", "text", 5),
+        ("edges", "label", 3),
+    ],
+)
+def test_validate_finds_what_validated_loading_rejects(kind, field, value):
+    data = document()
+    data[kind][0][field] = value
+    text = json.dumps(data)
+    with pytest.raises(Exception) as rejected:
+        Canvas.from_json(text)
+    canvas = Canvas.from_json(text, validate=False)
+    issues = canvas.validate(collect=True)
+    assert issues[0].error is type(rejected.value)
+    assert (issues[0].object_id, issues[0].field) == (data[kind][0]["id"], field)
+    with pytest.raises(Exception):
+        canvas.validate()
+
+
+def test_invalid_trusted_colors_stay_invalid():
+    data = document()
+    data["nodes"][0]["color"] = "#nothex"
+    data["edges"][0]["color"] = "12"
+    canvas = Canvas.from_json(json.dumps(data), validate=False)
+    issues = canvas.validate(collect=True)
+    assert [(issue.error, issue.object_id) for issue in issues] == [
+        (InvalidColorValueError, "a"),
+        (InvalidColorValueError, "e"),
+    ]
+    with pytest.raises(InvalidColorValueError):
+        canvas.validate()
+    # Interning the invalid value for trusted loading does not make it valid.
+    with pytest.raises(InvalidColorValueError):
+        Canvas.from_json(json.dumps(data))
+    assert json.loads(canvas.to_json()) == data
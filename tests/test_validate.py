@@ -0,0 +1,132 @@
+# test_validate.py
+"""Canvas.validate: the issue report and the exceptions raised by default."""
+import pytest
+
+from pyjsoncanvas import (
+    Canvas,
+    CanvasValidationError,
+    Edge,
+    GroupNode,
+    InvalidEdgeAttributeError,
+    InvalidEdgeConnectionError,
+    InvalidNodeAttributeError,
+    InvalidNodeTypeError,
+    NodeIDConflictError,
+    OrphanEdgeError,
+    TextNode,
+)
+from pyjsoncanvas.exceptions import EdgeIDConflictError, InvalidColorValueError
+
+
+def canvas() -> Canvas:
+    return Canvas(
+        nodes=[
+            TextNode(id="a", x=0, y=0, width=1, height=1, text="t"),
+            GroupNode(id="g", x=0, y=0, width=9, height=9),
+        ],
+        edges=[Edge(id="e", fromNode="a", toNode="g")],
+    )
+
+
+def set_attr(kind, index, field, value):
+    def defect(canvas):
+        setattr(getattr(canvas, kind)[index], field, value)
+
+    return defect
+
+
+def append(kind, obj):
+    def defect(canvas):
+        getattr(canvas, kind).append(obj)
+
+    return defect
+
+
+# Each defect, the issue it is reported as, and what validate() raises by
+# default: (exception, cause), matching validate() before issues were
+# collected where that checked the same thing.
+DEFECTS = [
+    (set_attr("nodes", 0, "x", "1"), InvalidNodeAttributeError, "a", "x",
+     (InvalidNodeAttributeError, None)),
+    (set_attr("nodes", 0, "text", 5), InvalidNodeAttributeError, "a", "text",
+     (InvalidNodeAttributeError, None)),
+    (set_attr("nodes", 0, "type", "text"), InvalidNodeTypeError, "a", "type",
+     (CanvasValidationError, InvalidNodeTypeError)),
+    (set_attr("nodes", 1, "label", 3), InvalidNodeAttributeError, "g", "label",
+     (InvalidNodeAttributeError, None)),
+    (set_attr("nodes", 0, "color", "red"), InvalidNodeAttributeError, "a", "color",
+     (InvalidNodeAttributeError, None)),
+    (append("nodes", "not a node"), InvalidNodeTypeError, None, "type",
+     (CanvasValidationError, InvalidNodeTypeError)),
+    (set_attr("edges", 0, "fromSide", "top"), InvalidEdgeAttributeError, "e",
+     "fromSide", (CanvasValidationError, InvalidEdgeAttributeError)),
+    (set_attr("edges", 0, "label", 3), InvalidEdgeAttributeError, "e", "label",
+     (CanvasValidationError, InvalidEdgeAttributeError)),
+    (set_attr("edges", 0, "toNode", 3), InvalidEdgeConnectionError, "e", "toNode",
+     (InvalidEdgeConnectionError, None)),
+    (set_attr("edges", 0, "toNode", "missing"), OrphanEdgeError, "e", "toNode",
+     (CanvasValidationError, OrphanEdgeError)),
+    (append("nodes", TextNode(id="a", x=0, y=0, width=1, height=1, text="u")),
+     NodeIDConflictError, "a", "id", (CanvasValidationError, NodeIDConflictError)),
+    (append("edges", Edge(id="e", fromNode="g", toNode="a")), EdgeIDConflictError,
+     "e", "id", (CanvasValidationError, EdgeIDConflictError)),
+]
+
+
+def test_valid_canvas():
+    assert canvas().validate() is True
+    assert canvas().validate(collect=True) == []
+
+
+@pytest.mark.parametrize("defect, error, object_id, field, raised", DEFECTS)
+def test_each_issue_kind(defect, error, object_id, field, raised):
+    broken = canvas()
+    defect(broken)
+    issues = broken.validate(collect=True)
+    assert [(i.error, i.object_id, i.field) for i in issues] == [
+        (error, object_id, field)
+    ]
+    assert issues[0].message
+    exception, cause = raised
+    with pytest.raises(exception) as info:
+        broken.validate()
+    assert type(info.value) is exception
+    if cause is None:
+        assert info.value.__cause__ is None
+    else:
+        assert type(info.value.__cause__) is cause
+
+
+def test_invalid_color_value():
+    broken = Canvas.from_json(
+        '{"nodes": [{"type": "text", "id": "a", "x": 0, "y": 0, "width": 1,'
+        ' "height": 1, "text": "t", "color": "#xyz"}], "edges": []}',
+        validate=False,
+    )
+    issues = broken.validate(collect=True)
+    assert [(i.error, i.object_id, i.field) for i in issues] == [
+        (InvalidColorValueError, "a", "color")
+    ]
+    with pytest.raises(InvalidColorValueError):
+        broken.validate()
+
+
+def test_collect_returns_every_issue_in_order():
+    broken = canvas()
+    for defect, *_ in DEFECTS:
+        defect(broken)
+    issues = broken.validate(collect=True)
+    # Both toNode defects hit the same edge, so only the last one remains.
+    expected = [
+        (error, object_id, field)
+        for _, error, object_id, field, _ in DEFECTS
+        if error is not InvalidEdgeConnectionError
+    ]
+    assert sorted(map(repr, expected)) == sorted(
+        repr((i.error, i.object_id, i.field)) for i in issues
+    )
+    # The first issue is the one validate() raises.
+    assert issues[0].error is InvalidNodeTypeError
+    with pytest.raises(CanvasValidationError) as info:
+        broken.validate()
+    assert type(info.value.__cause__) is InvalidNodeTypeError